@@ -38,6 +38,34 @@ def init(args: typing.Optional[argparse.Namespace] = None) -> None:
         _ARGS.config = ""
     if not hasattr(_ARGS, "test"):
         _ARGS.test = False
+    if not hasattr(_ARGS, "check_config"):
+        _ARGS.check_config = []
+    if not hasattr(_ARGS, "target_root"):
+        _ARGS.target_root = "/mnt"
+    if not hasattr(_ARGS, "target_disk"):
+        _ARGS.target_disk = ""
+    if not hasattr(_ARGS, "targets"):
+        _ARGS.targets = ""
+    if not hasattr(_ARGS, "shared_cache"):
+        _ARGS.shared_cache = False
+    if not hasattr(_ARGS, "bundles_dir"):
+        _ARGS.bundles_dir = []
+    if not hasattr(_ARGS, "record"):
+        _ARGS.record = ""
+    if not hasattr(_ARGS, "replay"):
+        _ARGS.replay = ""
+    if not hasattr(_ARGS, "replay_timings"):
+        _ARGS.replay_timings = False
+    if not hasattr(_ARGS, "replay_allow_missing"):
+        _ARGS.replay_allow_missing = False
+    if not hasattr(_ARGS, "events"):
+        _ARGS.events = ""
+    if not hasattr(_ARGS, "events_source"):
+        _ARGS.events_source = ""
+    if not hasattr(_ARGS, "profile"):
+        _ARGS.profile = ""
+    if not hasattr(_ARGS, "pipelined"):
+        _ARGS.pipelined = False
 
 
 init()
@@ -47,7 +75,7 @@ def is_call_ok() -> bool:
     """
     Check if the installer is called correctly.
     """
-    return _ARGS and (install() or shell())
+    return _ARGS and (install() or shell() or bool(check_config()))
 
 
 def install() -> bool:
@@ -76,3 +104,103 @@ def test() -> bool:
     Check if the installer is in fake test mode.
     """
     return _ARGS and _ARGS.test
+
+
+def check_config() -> list[str]:
+    """
+    Get the config files paths to check.
+    """
+    return _ARGS.check_config or []
+
+
+def bundles_dirs() -> list[str]:
+    """
+    Get the user-supplied generic bundles directories.
+    """
+    return _ARGS.bundles_dir or []
+
+
+def target_root() -> str:
+    """
+    Get the directory where the new system is mounted.
+    """
+    return _ARGS.target_root or "/mnt"
+
+
+def target_disk() -> str:
+    """
+    Get the disk on which to install the config instead of its main disk.
+    """
+    return _ARGS.target_disk or ""
+
+
+def targets() -> list[str]:
+    """
+    Get the disks on which to install the config concurrently.
+    """
+    return list(
+        dict.fromkeys(disk for disk in (_ARGS.targets or "").split(",") if disk)
+    )
+
+
+def shared_cache() -> bool:
+    """
+    Check if the live environment package cache and mirrorlist are shared with other installations.
+    """
+    return _ARGS and _ARGS.shared_cache
+
+
+def record() -> str:
+    """
+    Get the fixture file path where to record the executions.
+    """
+    return _ARGS.record or ""
+
+
+def replay() -> str:
+    """
+    Get the fixture file path from which to replay the executions.
+    """
+    return _ARGS.replay or ""
+
+
+def replay_timings() -> bool:
+    """
+    Check if the replayed executions take their recorded durations.
+    """
+    return _ARGS and _ARGS.replay_timings
+
+
+def replay_allow_missing() -> bool:
+    """
+    Check if the commands absent from the replayed fixture succeed instead of failing.
+    """
+    return _ARGS and _ARGS.replay_allow_missing
+
+
+def events() -> str:
+    """
+    Get the install events target, a file path or a 'unix:' prefixed socket path.
+    """
+    return _ARGS.events or ""
+
+
+def events_source() -> str:
+    """
+    Get the name of this machine in the install events.
+    """
+    return _ARGS.events_source or ""
+
+
+def profile() -> str:
+    """
+    Get the collapsed stacks file path where to write the installer profile.
+    """
+    return _ARGS.profile or ""
+
+
+def pipelined() -> bool:
+    """
+    Check if the base installation starts while the system setup is asked.
+    """
+    return _ARGS and _ARGS.pipelined
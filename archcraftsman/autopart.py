@@ -17,6 +17,8 @@
 """
 The automatic partitioning system module
 """
+import typing
+
 import archcraftsman.base
 import archcraftsman.disk
 import archcraftsman.i18n
@@ -28,6 +30,216 @@ import archcraftsman.utils
 _ = archcraftsman.i18n.translate
 
 
+def build_auto_partitioning(
+    disk: archcraftsman.disk.Disk,
+    part_format_type: archcraftsman.options.FSFormats,
+    swap_type: archcraftsman.options.SwapTypes,
+    want_home: bool,
+    want_dual_boot: bool = False,
+    root_block_name: typing.Optional[str] = None,
+    home_block_name: typing.Optional[str] = None,
+    bios: bool = False,
+) -> tuple[str, list[archcraftsman.partition.Partition], str]:
+    """
+    The method to build the fdisk script, the partitions and the swapfile size of an automatic partitioning.
+    """
+    partitions: list[archcraftsman.partition.Partition] = []
+    if want_dual_boot:
+        root_size = archcraftsman.utils.to_iec(int(disk.free_space / 4))
+        swap_size = archcraftsman.utils.to_iec(int(disk.free_space / 32))
+    else:
+        root_size = archcraftsman.utils.to_iec(int(disk.total / 4))
+        swap_size = archcraftsman.utils.to_iec(int(disk.total / 32))
+    if swap_type == archcraftsman.options.SwapTypes.NONE:
+        swap_size = ""
+    auto_part_str = ""
+    index = 0
+    if bios:
+        # DOS LABEL
+        auto_part_str += "o\n"  # Create a new empty DOS partition table
+        # BOOT
+        auto_part_str += "n\n"  # Add a new partition
+        auto_part_str += (
+            "p\n"  # archcraftsman.disk.Partition primary (Accept default: primary)
+        )
+        auto_part_str += (
+            " \n"  # archcraftsman.disk.Partition number (Accept default: auto)
+        )
+        auto_part_str += " \n"  # First sector (Accept default: 1)
+        auto_part_str += "+2G\n"  # Last sector (Accept default: varies)
+        auto_part_str += "a\n"  # Toggle bootable flag
+        partitions.append(
+            archcraftsman.partition.Partition(
+                index=index,
+                part_type=archcraftsman.options.PartTypes.BOOT,
+                part_mount_point="/boot",
+                part_format=True,
+                part_format_type=part_format_type,
+            )
+        )
+        index += 1
+    else:
+        if not want_dual_boot:
+            # GPT LABEL
+            auto_part_str += "g\n"  # Create a new empty GPT partition table
+            # EFI
+            auto_part_str += "n\n"  # Add a new partition
+            auto_part_str += (
+                " \n"  # archcraftsman.disk.Partition number (Accept default: auto)
+            )
+            auto_part_str += " \n"  # First sector (Accept default: 1)
+            auto_part_str += "+512M\n"  # Last sector (Accept default: varies)
+            auto_part_str += "t\n"  # Change partition type
+            auto_part_str += (
+                " \n"  # archcraftsman.disk.Partition number (Accept default: auto)
+            )
+            auto_part_str += "1\n"  # Type EFI System
+            partitions.append(
+                archcraftsman.partition.Partition(
+                    index=index,
+                    part_type=archcraftsman.options.PartTypes.EFI,
+                    part_mount_point="/boot/efi",
+                    part_format=True,
+                    part_format_type=archcraftsman.options.FSFormats.VFAT,
+                )
+            )
+            index += 1
+        else:
+            partitions.append(
+                archcraftsman.partition.Partition(
+                    index=index,
+                    part_type=archcraftsman.options.PartTypes.EFI,
+                    part_mount_point="/boot/efi",
+                    part_format=False,
+                )
+            )
+            index += len(disk.partitions)
+    if swap_type == archcraftsman.options.SwapTypes.PARTITION:
+        # SWAP
+        auto_part_str += "n\n"  # Add a new partition
+        if bios:
+            auto_part_str += (
+                "p\n"  # archcraftsman.disk.Partition primary (Accept default: primary)
+            )
+        auto_part_str += (
+            " \n"  # archcraftsman.disk.Partition number (Accept default: auto)
+        )
+        auto_part_str += " \n"  # First sector (Accept default: 1)
+        auto_part_str += f"+{swap_size}\n"  # Last sector (Accept default: varies)
+        auto_part_str += "t\n"  # Change partition type
+        auto_part_str += (
+            " \n"  # archcraftsman.disk.Partition number (Accept default: auto)
+        )
+        if bios:
+            auto_part_str += "82\n"  # Type Linux Swap
+        else:
+            auto_part_str += "19\n"  # Type Linux Swap
+        partitions.append(
+            archcraftsman.partition.Partition(
+                index=index, part_type=archcraftsman.options.PartTypes.SWAP
+            )
+        )
+        index += 1
+    if want_home:
+        # ROOT
+        auto_part_str += "n\n"  # Add a new partition
+        if bios:
+            auto_part_str += (
+                "p\n"  # archcraftsman.disk.Partition primary (Accept default: primary)
+            )
+        auto_part_str += (
+            " \n"  # archcraftsman.disk.Partition number (Accept default: auto)
+        )
+        auto_part_str += " \n"  # First sector (Accept default: 1)
+        auto_part_str += f"+{root_size}\n"  # Last sector (Accept default: varies)
+        partitions.append(
+            archcraftsman.partition.Partition(
+                index=index,
+                part_type=archcraftsman.options.PartTypes.ROOT,
+                part_mount_point="/",
+                part_format=True,
+                part_format_type=part_format_type,
+            )
+        )
+        index += 1
+        # HOME
+        auto_part_str += "n\n"  # Add a new partition
+        if bios:
+            auto_part_str += (
+                "p\n"  # archcraftsman.disk.Partition primary (Accept default: primary)
+            )
+        auto_part_str += (
+            " \n"  # archcraftsman.disk.Partition number (Accept default: auto)
+        )
+        auto_part_str += " \n"  # First sector (Accept default: 1)
+        auto_part_str += " \n"  # Last sector (Accept default: varies)
+        partitions.append(
+            archcraftsman.partition.Partition(
+                index=index,
+                part_type=archcraftsman.options.PartTypes.HOME,
+                part_mount_point="/home",
+                part_format=True,
+                part_format_type=part_format_type,
+            )
+        )
+        index += 1
+    else:
+        # ROOT
+        auto_part_str += "n\n"  # Add a new partition
+        if bios:
+            auto_part_str += (
+                "p\n"  # archcraftsman.disk.Partition primary (Accept default: primary)
+            )
+        auto_part_str += (
+            " \n"  # archcraftsman.disk.Partition number (Accept default: auto)
+        )
+        auto_part_str += " \n"  # First sector (Accept default: 1)
+        auto_part_str += " \n"  # Last sector (Accept default: varies)
+        partitions.append(
+            archcraftsman.partition.Partition(
+                index=index,
+                part_type=archcraftsman.options.PartTypes.ROOT,
+                part_mount_point="/",
+                part_format=True,
+                part_format_type=part_format_type,
+            )
+        )
+        index += 1
+    # WRITE
+    auto_part_str += "w\n"
+
+    for partition in partitions:
+        if (
+            partition.part_type == archcraftsman.options.PartTypes.ROOT
+            and root_block_name is not None
+        ):
+            partition.encrypted = True
+            partition.block_name = root_block_name
+        if (
+            partition.part_type == archcraftsman.options.PartTypes.HOME
+            and home_block_name is not None
+        ):
+            partition.encrypted = True
+            partition.block_name = home_block_name
+
+    return auto_part_str, partitions, swap_size
+
+
+def apply_auto_partitioning(
+    target_disk: str,
+    auto_part_str: str,
+    partitions: list[archcraftsman.partition.Partition],
+):
+    """
+    The method to write an automatic partitioning on a disk and resolve the partitions paths.
+    """
+    archcraftsman.base.execute(
+        f'echo -e "{auto_part_str}" | fdisk "{target_disk}" &>/dev/null'
+    )
+    for partition in partitions:
+        partition.build_partition_name(target_disk)
+
+
 def auto_partitioning() -> bool:
     """
     The method to proceed to the automatic partitioning.
@@ -71,176 +283,22 @@ def auto_partitioning() -> bool:
             ):
                 home_block_name = "home"
 
-        if want_dual_boot:
-            root_size = archcraftsman.utils.to_iec(int(disk.free_space / 4))
-            swap_size = archcraftsman.utils.to_iec(int(disk.free_space / 32))
-        else:
-            root_size = archcraftsman.utils.to_iec(int(disk.total / 4))
-            swap_size = archcraftsman.utils.to_iec(int(disk.total / 32))
-        if swap_type == archcraftsman.options.SwapTypes.NONE:
-            swap_size = ""
+        (
+            auto_part_str,
+            partitions,
+            swap_size,
+        ) = build_auto_partitioning(
+            disk,
+            part_format_type,
+            swap_type,
+            want_home,
+            want_dual_boot=want_dual_boot,
+            root_block_name=root_block_name,
+            home_block_name=home_block_name,
+            bios=archcraftsman.base.is_bios(),
+        )
+        archcraftsman.info.ai.partitioning_info.partitions.extend(partitions)
         archcraftsman.info.ai.partitioning_info.swapfile_size = swap_size
-        auto_part_str = ""
-        index = 0
-        if archcraftsman.base.is_bios():
-            # DOS LABEL
-            auto_part_str += "o\n"  # Create a new empty DOS partition table
-            # BOOT
-            auto_part_str += "n\n"  # Add a new partition
-            auto_part_str += (
-                "p\n"  # archcraftsman.disk.Partition primary (Accept default: primary)
-            )
-            auto_part_str += (
-                " \n"  # archcraftsman.disk.Partition number (Accept default: auto)
-            )
-            auto_part_str += " \n"  # First sector (Accept default: 1)
-            auto_part_str += "+2G\n"  # Last sector (Accept default: varies)
-            auto_part_str += "a\n"  # Toggle bootable flag
-            archcraftsman.info.ai.partitioning_info.partitions.append(
-                archcraftsman.partition.Partition(
-                    index=index,
-                    part_type=archcraftsman.options.PartTypes.BOOT,
-                    part_mount_point="/boot",
-                    part_format=True,
-                    part_format_type=part_format_type,
-                )
-            )
-            index += 1
-        else:
-            if not want_dual_boot:
-                # GPT LABEL
-                auto_part_str += "g\n"  # Create a new empty GPT partition table
-                # EFI
-                auto_part_str += "n\n"  # Add a new partition
-                auto_part_str += (
-                    " \n"  # archcraftsman.disk.Partition number (Accept default: auto)
-                )
-                auto_part_str += " \n"  # First sector (Accept default: 1)
-                auto_part_str += "+512M\n"  # Last sector (Accept default: varies)
-                auto_part_str += "t\n"  # Change partition type
-                auto_part_str += (
-                    " \n"  # archcraftsman.disk.Partition number (Accept default: auto)
-                )
-                auto_part_str += "1\n"  # Type EFI System
-                archcraftsman.info.ai.partitioning_info.partitions.append(
-                    archcraftsman.partition.Partition(
-                        index=index,
-                        part_type=archcraftsman.options.PartTypes.EFI,
-                        part_mount_point="/boot/efi",
-                        part_format=True,
-                        part_format_type=archcraftsman.options.FSFormats.VFAT,
-                    )
-                )
-                index += 1
-            else:
-                archcraftsman.info.ai.partitioning_info.partitions.append(
-                    archcraftsman.partition.Partition(
-                        index=index,
-                        part_type=archcraftsman.options.PartTypes.EFI,
-                        part_mount_point="/boot/efi",
-                        part_format=False,
-                    )
-                )
-                index += len(disk.partitions)
-        if swap_type == archcraftsman.options.SwapTypes.PARTITION:
-            # SWAP
-            auto_part_str += "n\n"  # Add a new partition
-            if archcraftsman.base.is_bios():
-                auto_part_str += "p\n"  # archcraftsman.disk.Partition primary (Accept default: primary)
-            auto_part_str += (
-                " \n"  # archcraftsman.disk.Partition number (Accept default: auto)
-            )
-            auto_part_str += " \n"  # First sector (Accept default: 1)
-            auto_part_str += f"+{swap_size}\n"  # Last sector (Accept default: varies)
-            auto_part_str += "t\n"  # Change partition type
-            auto_part_str += (
-                " \n"  # archcraftsman.disk.Partition number (Accept default: auto)
-            )
-            if archcraftsman.base.is_bios():
-                auto_part_str += "82\n"  # Type Linux Swap
-            else:
-                auto_part_str += "19\n"  # Type Linux Swap
-            archcraftsman.info.ai.partitioning_info.partitions.append(
-                archcraftsman.partition.Partition(
-                    index=index, part_type=archcraftsman.options.PartTypes.SWAP
-                )
-            )
-            index += 1
-        if want_home:
-            # ROOT
-            auto_part_str += "n\n"  # Add a new partition
-            if archcraftsman.base.is_bios():
-                auto_part_str += "p\n"  # archcraftsman.disk.Partition primary (Accept default: primary)
-            auto_part_str += (
-                " \n"  # archcraftsman.disk.Partition number (Accept default: auto)
-            )
-            auto_part_str += " \n"  # First sector (Accept default: 1)
-            auto_part_str += f"+{root_size}\n"  # Last sector (Accept default: varies)
-            archcraftsman.info.ai.partitioning_info.partitions.append(
-                archcraftsman.partition.Partition(
-                    index=index,
-                    part_type=archcraftsman.options.PartTypes.ROOT,
-                    part_mount_point="/",
-                    part_format=True,
-                    part_format_type=part_format_type,
-                )
-            )
-            index += 1
-            # HOME
-            auto_part_str += "n\n"  # Add a new partition
-            if archcraftsman.base.is_bios():
-                auto_part_str += "p\n"  # archcraftsman.disk.Partition primary (Accept default: primary)
-            auto_part_str += (
-                " \n"  # archcraftsman.disk.Partition number (Accept default: auto)
-            )
-            auto_part_str += " \n"  # First sector (Accept default: 1)
-            auto_part_str += " \n"  # Last sector (Accept default: varies)
-            archcraftsman.info.ai.partitioning_info.partitions.append(
-                archcraftsman.partition.Partition(
-                    index=index,
-                    part_type=archcraftsman.options.PartTypes.HOME,
-                    part_mount_point="/home",
-                    part_format=True,
-                    part_format_type=part_format_type,
-                )
-            )
-            index += 1
-        else:
-            # ROOT
-            auto_part_str += "n\n"  # Add a new partition
-            if archcraftsman.base.is_bios():
-                auto_part_str += "p\n"  # archcraftsman.disk.Partition primary (Accept default: primary)
-            auto_part_str += (
-                " \n"  # archcraftsman.disk.Partition number (Accept default: auto)
-            )
-            auto_part_str += " \n"  # First sector (Accept default: 1)
-            auto_part_str += " \n"  # Last sector (Accept default: varies)
-            archcraftsman.info.ai.partitioning_info.partitions.append(
-                archcraftsman.partition.Partition(
-                    index=index,
-                    part_type=archcraftsman.options.PartTypes.ROOT,
-                    part_mount_point="/",
-                    part_format=True,
-                    part_format_type=part_format_type,
-                )
-            )
-            index += 1
-        # WRITE
-        auto_part_str += "w\n"
-
-        for partition in archcraftsman.info.ai.partitioning_info.partitions:
-            if (
-                partition.part_type == archcraftsman.options.PartTypes.ROOT
-                and root_block_name is not None
-            ):
-                partition.encrypted = True
-                partition.block_name = root_block_name
-            if (
-                partition.part_type == archcraftsman.options.PartTypes.HOME
-                and home_block_name is not None
-            ):
-                partition.encrypted = True
-                partition.block_name = home_block_name
 
         archcraftsman.base.print_step(_("Summary of choices :"))
         for partition in archcraftsman.info.ai.partitioning_info.partitions:
@@ -258,14 +316,10 @@ def auto_partitioning() -> bool:
             if want_to_change:
                 return False
         else:
-            archcraftsman.base.execute(
-                f'echo -e "{auto_part_str}" | fdisk "{target_disk}" &>/dev/null'
+            apply_auto_partitioning(
+                target_disk,
+                auto_part_str,
+                archcraftsman.info.ai.partitioning_info.partitions,
             )
 
-            for partition in archcraftsman.info.ai.partitioning_info.partitions:
-                partition.build_partition_name(target_disk)
-
-                if partition not in archcraftsman.info.ai.partitioning_info.partitions:
-                    archcraftsman.info.ai.partitioning_info.partitions.append(partition)
-
     return True
@@ -17,18 +17,22 @@
 """
 The base utility module.
 """
+import collections
 import encodings
 import getpass
-import glob
 import os
+import re
+import selectors
 import subprocess
 import sys
-import termios
-import tty
+import threading
+import time
 import typing
 
 import archcraftsman.arguments
+import archcraftsman.completion
 import archcraftsman.i18n
+import archcraftsman.terminal
 
 _ = archcraftsman.i18n.translate
 
@@ -43,14 +47,17 @@ PROMPT = "\033[1m"
 LOG = "\033[2m"
 RESET = "\033[0m"
 
+OUTPUT_TAIL_LINES = 200
+MAX_PARTIAL_LINE = 65536
+
+CACHE_SYSTEM = "system"
+CACHE_BLOCK = "block"
+CACHE_MOUNTS = "mounts"
+CACHE_PACMAN_DB = "pacman-db"
 
-def glob_completer(text, state) -> str:
-    """
-    The glob completer for readline completions.
-    """
-    return [
-        path + "/" if os.path.isdir(path) else path for path in glob.glob(text + "*")
-    ][state]
+
+# The glob completer for readline completions.
+glob_completer = archcraftsman.completion.GlobCompleter()
 
 
 def is_bios() -> bool:
@@ -64,20 +71,49 @@ def elevate() -> bool:
     """
     A method to elevate the current user to root.
     """
-    if is_root():
+    root, has_sudo = privileges()
+    if root:
         return True
-    if sudo_exist():
+    if has_sudo:
         execute("sudo -v", force=True)
         return True
     return False
 
 
+_PRIVILEGES: typing.Optional[tuple[bool, bool]] = None
+
+
+def privileges() -> tuple[bool, bool]:
+    """
+    A method to resolve once if the user is root and if sudo is installed.
+    """
+    global _PRIVILEGES
+    if _PRIVILEGES is None:
+        root = is_root()
+        _PRIVILEGES = (root, not root and sudo_exist())
+    return _PRIVILEGES
+
+
+def reset_privileges():
+    """
+    A method to forget the resolved privileges.
+    """
+    global _PRIVILEGES
+    _PRIVILEGES = None
+
+
 def sudo_exist() -> bool:
     """
     A method to check if sudo is installed.
     """
     return (
-        execute("which sudo", check=False, force=True, capture_output=True).returncode
+        execute(
+            "which sudo",
+            check=False,
+            force=True,
+            capture_output=True,
+            cache={CACHE_SYSTEM},
+        ).returncode
         == 0
     )
 
@@ -86,7 +122,9 @@ def is_root() -> bool:
     """
     A method to check if the user is root.
     """
-    user = execute("whoami", force=True, capture_output=True).output
+    user = execute(
+        "whoami", force=True, capture_output=True, cache={CACHE_SYSTEM}
+    ).output
     return user.strip() == "root"
 
 
@@ -95,7 +133,17 @@ class ExecutionResult:
     A class to manage the result of an execution.
     """
 
-    def __init__(self, command: str, result: subprocess.CompletedProcess):
+    def __init__(
+        self,
+        command: str,
+        result: subprocess.CompletedProcess,
+        plain_command: str = "",
+        chroot: bool = False,
+        sudo: bool = False,
+        fake: bool = False,
+        duration: float = 0.0,
+        cached: bool = False,
+    ):
         self.command = command
         self.output = (
             ""
@@ -103,6 +151,13 @@ class ExecutionResult:
             else result.stdout.decode(encodings.utf_8.getregentry().name)
         )
         self.returncode = result.returncode
+        self.stderr = result.stderr
+        self.plain_command = plain_command or command
+        self.chroot = chroot
+        self.sudo = sudo
+        self.fake = fake
+        self.duration = duration
+        self.cached = cached
 
     def __bool__(self):
         return self.returncode == 0
@@ -131,6 +186,312 @@ class ExecutionResult:
         return hash(self.command) ^ hash(self.returncode) ^ hash(self.output)
 
 
+_EXECUTION_LISTENERS: list[typing.Callable[[ExecutionResult], None]] = []
+_MESSAGE_LISTENERS: list[typing.Callable[[str, str], None]] = []
+
+
+def add_execution_listener(listener: typing.Callable[[ExecutionResult], None]):
+    """
+    A method to register a listener called after each real or fake execution.
+    """
+    _EXECUTION_LISTENERS.append(listener)
+
+
+def remove_execution_listener(listener: typing.Callable[[ExecutionResult], None]):
+    """
+    A method to unregister an execution listener.
+    """
+    if listener in _EXECUTION_LISTENERS:
+        _EXECUTION_LISTENERS.remove(listener)
+
+
+def _notify_execution(result: ExecutionResult):
+    """
+    A method to notify all execution listeners.
+    """
+    for listener in list(_EXECUTION_LISTENERS):
+        listener(result)
+
+
+def add_message_listener(listener: typing.Callable[[str, str], None]):
+    """
+    A method to register a listener called with the kind and the text of each printed message,
+    and with each command about to be executed.
+    """
+    _MESSAGE_LISTENERS.append(listener)
+
+
+def remove_message_listener(listener: typing.Callable[[str, str], None]):
+    """
+    A method to unregister a message listener.
+    """
+    if listener in _MESSAGE_LISTENERS:
+        _MESSAGE_LISTENERS.remove(listener)
+
+
+def _notify_message(kind: str, message: str):
+    """
+    A method to notify all message listeners.
+    """
+    for listener in list(_MESSAGE_LISTENERS):
+        listener(kind, message)
+
+
+class ExecutionCache:
+    """
+    A LRU cache of read-only executions, tagged by the system state they depend on.
+    """
+
+    # The system state tags changed by mutating commands.
+    INVALIDATIONS: list[tuple[re.Pattern, set[str]]] = [
+        (
+            re.compile(
+                r"\b(c?fdisk(?!\s+-l)|sfdisk|[cs]?gdisk|parted|wipefs|partprobe|losetup|mkswap|mkfs(\.\w+)?)\b"
+            ),
+            {CACHE_BLOCK},
+        ),
+        (re.compile(r"\bcryptsetup\s+(?!isLuks)"), {CACHE_BLOCK, CACHE_MOUNTS}),
+        (re.compile(r"\b(u?mount|swapon|swapoff)\b"), {CACHE_MOUNTS}),
+        (
+            re.compile(r"\b(pacman\s+-(S(?![gils]\b)|R|U)|pacstrap|pacman-key)"),
+            {CACHE_PACMAN_DB},
+        ),
+    ]
+
+    def __init__(self, max_size: int = 256) -> None:
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._entries: collections.OrderedDict[
+            tuple[str, bool], tuple[ExecutionResult, set[str]]
+        ] = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(
+        self, command: str, capture_output: bool
+    ) -> typing.Optional[ExecutionResult]:
+        """
+        Get the cached result of a command, if any.
+        """
+        with self._lock:
+            entry = self._entries.get((command, capture_output))
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end((command, capture_output))
+            self.hits += 1
+            return entry[0]
+
+    def put(self, result: ExecutionResult, capture_output: bool, tags: set[str]):
+        """
+        Cache the result of a command.
+        """
+        with self._lock:
+            self._entries[(result.command, capture_output)] = (result, tags)
+            self._entries.move_to_end((result.command, capture_output))
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, command: str):
+        """
+        Drop all cached results depending on a system state the command may change.
+        """
+        tags = set().union(
+            *(tags for pattern, tags in self.INVALIDATIONS if pattern.search(command))
+        )
+        if not tags:
+            return
+        with self._lock:
+            for key, (_, entry_tags) in list(self._entries.items()):
+                if entry_tags & tags:
+                    del self._entries[key]
+                    self.invalidations += 1
+
+    def clear(self):
+        """
+        Drop all cached results and reset the counters.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.invalidations = 0
+
+    def stats(self) -> dict[str, int]:
+        """
+        The cache counters.
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "invalidations": self.invalidations,
+            }
+
+
+EXECUTION_CACHE = ExecutionCache()
+
+
+def run_process(command: str, capture_output: bool) -> subprocess.CompletedProcess:
+    """
+    The default executor, running a shell command in a subprocess.
+    Uncaptured outputs go to the diversion of the current thread, if any.
+    """
+    diversion = archcraftsman.terminal.RENDERER.diversion()
+    if diversion is not None and not capture_output:
+        return subprocess.run(
+            command,
+            shell=True,
+            check=False,
+            stdout=diversion,
+            stderr=subprocess.STDOUT,
+        )
+    return subprocess.run(
+        command, shell=True, check=False, capture_output=capture_output
+    )
+
+
+def _split_lines(buffer: bytes, final: bool) -> tuple[list[bytes], bytes]:
+    """
+    Split complete lines, ended by a new line or a carriage return, from the rest of a buffer.
+    A trailing carriage return stays in the rest, in case a new line follows it in the next read,
+    and a rest reaching MAX_PARTIAL_LINE bytes is split as a line so it doesn't grow forever.
+    """
+    carried = b""
+    if not final and buffer.endswith(b"\r"):
+        buffer, carried = buffer[:-1], b"\r"
+    lines = buffer.replace(b"\r\n", b"\n").replace(b"\r", b"\n").split(b"\n")
+    rest = lines.pop()
+    if rest and (final or len(rest) >= MAX_PARTIAL_LINE):
+        lines.append(rest)
+        rest = b""
+    return lines, rest + carried
+
+
+def _handle_line(
+    line: bytes,
+    tail: collections.deque,
+    echo: typing.Optional[typing.BinaryIO],
+    line_handler: typing.Callable[[str], None],
+):
+    """
+    Keep a line in the bounded tail, echo it if needed and pass it decoded to the line handler.
+    """
+    tail.append(line)
+    if echo:
+        echo.write(line + b"\n")
+        echo.flush()
+    line_handler(line.decode(encodings.utf_8.getregentry().name, errors="replace"))
+
+
+def stream_process(
+    command: str,
+    capture_output: bool,
+    line_handler: typing.Callable[[str], None],
+) -> subprocess.CompletedProcess:
+    """
+    Run a shell command in a subprocess, reading its outputs incrementally and passing each line to the handler.
+    Only the last lines of each output are kept in the result, they are echoed to the terminal unless captured.
+    """
+    tails: dict[int, collections.deque] = {}
+    diversion = archcraftsman.terminal.RENDERER.diversion()
+    with subprocess.Popen(
+        command, shell=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+    ) as process, selectors.DefaultSelector() as selector:
+        for pipe, echo in (
+            (process.stdout, sys.stdout),
+            (process.stderr, sys.stderr),
+        ):
+            assert pipe is not None
+            tails[pipe.fileno()] = collections.deque(maxlen=OUTPUT_TAIL_LINES)
+            selector.register(
+                pipe,
+                selectors.EVENT_READ,
+                [
+                    b"",
+                    None
+                    if capture_output
+                    else diversion or getattr(echo, "buffer", None),
+                ],
+            )
+        while selector.get_map():
+            for key, _ in selector.select():
+                data = os.read(key.fd, 65536)
+                lines, key.data[0] = _split_lines(key.data[0] + data, not data)
+                for line in lines:
+                    _handle_line(line, tails[key.fd], key.data[1], line_handler)
+                if not data:
+                    selector.unregister(key.fileobj)
+        returncode = process.wait()
+        assert process.stdout is not None and process.stderr is not None
+        stdout, stderr = (
+            b"\n".join(tails[pipe.fileno()])
+            for pipe in (process.stdout, process.stderr)
+        )
+    return subprocess.CompletedProcess(
+        command,
+        returncode,
+        stdout if capture_output else None,
+        stderr if capture_output else None,
+    )
+
+
+def _feed_lines(
+    process: subprocess.CompletedProcess,
+    capture_output: bool,
+    line_handler: typing.Callable[[str], None],
+) -> subprocess.CompletedProcess:
+    """
+    Pass the outputs of an already completed process to a line handler, as stream_process would.
+    """
+    outputs = []
+    diversion = archcraftsman.terminal.RENDERER.diversion()
+    for output, echo in ((process.stdout, sys.stdout), (process.stderr, sys.stderr)):
+        tail: collections.deque = collections.deque(maxlen=OUTPUT_TAIL_LINES)
+        for line in _split_lines(output or b"", True)[0]:
+            _handle_line(
+                line,
+                tail,
+                None if capture_output else diversion or getattr(echo, "buffer", None),
+                line_handler,
+            )
+        outputs.append(b"\n".join(tail) if capture_output else None)
+    return subprocess.CompletedProcess(process.args, process.returncode, *outputs)
+
+
+_EXECUTOR: typing.Callable[[str, bool], subprocess.CompletedProcess] = run_process
+
+
+def set_executor(
+    executor: typing.Optional[
+        typing.Callable[[str, bool], subprocess.CompletedProcess]
+    ] = None
+):
+    """
+    A method to replace the executor running the real executions, or restore the default one.
+    """
+    global _EXECUTOR
+    _EXECUTOR = executor or run_process
+
+
+_SUDO_EXECUTOR: typing.Optional[
+    typing.Callable[[str, bool], subprocess.CompletedProcess]
+] = None
+
+
+def set_sudo_executor(
+    executor: typing.Optional[
+        typing.Callable[[str, bool], subprocess.CompletedProcess]
+    ] = None
+):
+    """
+    A method to set the executor running the sudo executions as root, or go back to prefixing them with sudo.
+    """
+    global _SUDO_EXECUTOR
+    _SUDO_EXECUTOR = executor
+
+
 def execute(
     command: str,
     check: bool = True,
@@ -140,15 +501,32 @@ def execute(
     chroot: bool = False,
     sudo: bool = False,
     user: str = "",
+    cache: typing.Optional[set[str]] = None,
+    line_handler: typing.Optional[typing.Callable[[str], None]] = None,
 ) -> ExecutionResult:
     """
     A method to exec a command.
+    A read-only command can be cached with the tags of the system state it depends on, see ExecutionCache.
+    With a line handler, the outputs are streamed to it line by line and only their tail is kept, see stream_process.
     """
+    plain_command = command
+    _notify_message("command", plain_command)
     if force or not archcraftsman.arguments.test():
-        if sudo and not sudo_exist() and not is_root():
-            raise PermissionError("This script must be run as root.")
-        if sudo and sudo_exist() and not is_root():
-            command = f"sudo {command}"
+        executor = _EXECUTOR
+        if sudo:
+            root, has_sudo = privileges()
+            if not root and not has_sudo:
+                raise PermissionError("This script must be run as root.")
+            # Interactive commands need the terminal itself, they are run with sudo in-process.
+            if (
+                not root
+                and _SUDO_EXECUTOR
+                and _EXECUTOR is run_process
+                and not interactive
+            ):
+                executor = _SUDO_EXECUTOR
+            elif not root:
+                command = f"sudo {command}"
 
         if chroot:
             if not interactive:
@@ -156,26 +534,79 @@ def execute(
             else:
                 command = '/bin/bash -c "' + command.strip().replace('"', '\\"') + '"'
             if user:
+                command = f"HOME=/home/{user} arch-chroot -u {user}:{user} {archcraftsman.arguments.target_root()} {command}"
+            else:
                 command = (
-                    f"HOME=/home/{user} arch-chroot -u {user}:{user} /mnt {command}"
+                    f"arch-chroot {archcraftsman.arguments.target_root()} {command}"
                 )
-            else:
-                command = f"arch-chroot /mnt {command}"
 
-        return ExecutionResult(
+        if cache is not None:
+            cached_result = EXECUTION_CACHE.get(command, capture_output)
+            if cached_result is not None:
+                result = ExecutionResult(
+                    command,
+                    subprocess.CompletedProcess(
+                        command,
+                        cached_result.returncode,
+                        cached_result.output.encode(encodings.utf_8.getregentry().name),
+                        cached_result.stderr,
+                    ),
+                    plain_command=plain_command,
+                    chroot=chroot,
+                    sudo=sudo,
+                    cached=True,
+                )
+                _notify_execution(result)
+                # A failure cached by a probe without check still fails a checked execution.
+                if check and result.returncode != 0:
+                    raise subprocess.CalledProcessError(
+                        result.returncode,
+                        command,
+                        result.output.encode(encodings.utf_8.getregentry().name),
+                        result.stderr,
+                    )
+                return result
+
+        archcraftsman.terminal.RENDERER.flush()
+        start = time.monotonic()
+        if line_handler is None:
+            process = executor(command, capture_output)
+        elif executor is run_process:
+            process = stream_process(command, capture_output, line_handler)
+        else:
+            process = _feed_lines(executor(command, True), capture_output, line_handler)
+        result = ExecutionResult(
             command,
-            subprocess.run(
-                command, shell=True, check=check, capture_output=capture_output
-            ),
+            process,
+            plain_command=plain_command,
+            chroot=chroot,
+            sudo=sudo,
+            duration=time.monotonic() - start,
         )
+        if cache is not None and not (check and process.returncode != 0):
+            EXECUTION_CACHE.put(result, capture_output, cache)
+        else:
+            EXECUTION_CACHE.invalidate(plain_command)
+        _notify_execution(result)
+        if check and process.returncode != 0:
+            raise subprocess.CalledProcessError(
+                process.returncode, command, process.stdout, process.stderr
+            )
+        return result
     log(
         f"{'(chroot) ' if chroot else ''}"
         f"{'(sudo) ' if sudo else ''}"
         f"Fake execution of: {command}"
     )
-    return ExecutionResult(
-        command, subprocess.CompletedProcess(args=command, returncode=0, stdout=b"")
+    result = ExecutionResult(
+        command,
+        subprocess.CompletedProcess(args=command, returncode=0, stdout=b""),
+        chroot=chroot,
+        sudo=sudo,
+        fake=True,
     )
+    _notify_execution(result)
+    return result
 
 
 def pause(start_newline: bool = False, end_newline: bool = False):
@@ -184,18 +615,19 @@ def pause(start_newline: bool = False, end_newline: bool = False):
     """
     message = _("Press any key to continue...")
     if start_newline:
-        print("")
-    print(f"{PROMPT}{message}{RESET}")
-    execute("read -n 1 -sr", force=True)
+        archcraftsman.terminal.RENDERER.line()
+    archcraftsman.terminal.RENDERER.line(f"{PROMPT}{message}{RESET}")
+    archcraftsman.terminal.read_key()
     if end_newline:
-        print("")
+        archcraftsman.terminal.RENDERER.line()
 
 
 def print_error(message: str, do_pause: bool = True):
     """
     A method to print an error.
     """
-    print(f"\n{ERROR}:: {message}{RESET}\n")
+    _notify_message("error", message)
+    archcraftsman.terminal.RENDERER.line(f"\n{ERROR}:: {message}{RESET}\n")
     if do_pause:
         pause(end_newline=True)
 
@@ -204,7 +636,8 @@ def print_success(message: str, do_pause: bool = True):
     """
     A method to print a success message.
     """
-    print(f"\n{SUCCESS}:: {message}{RESET}\n")
+    _notify_message("success", message)
+    archcraftsman.terminal.RENDERER.line(f"\n{SUCCESS}:: {message}{RESET}\n")
     if do_pause:
         pause(end_newline=True)
 
@@ -213,7 +646,8 @@ def print_warning(message: str, do_pause: bool = True):
     """
     A method to print a warning message.
     """
-    print(f"\n{WARNING}:: {message}{RESET}\n")
+    _notify_message("warning", message)
+    archcraftsman.terminal.RENDERER.line(f"\n{WARNING}:: {message}{RESET}\n")
     if do_pause:
         pause(end_newline=True)
 
@@ -222,16 +656,18 @@ def print_step(message: str, clear: bool = True):
     """
     A method to print a step message.
     """
+    _notify_message("step", message)
     if clear:
-        execute("clear", force=True)
-    print(f"\n{STEP}{message}{RESET}")
+        archcraftsman.terminal.RENDERER.clear()
+    archcraftsman.terminal.RENDERER.line(f"\n{STEP}{message}{RESET}")
 
 
 def print_sub_step(message: str):
     """
     A method to print a sub step message.
     """
-    print(f"{SUBSTEP}+ {message}{RESET}")
+    _notify_message("sub_step", message)
+    archcraftsman.terminal.RENDERER.line(f"{SUBSTEP}+ {message}{RESET}")
 
 
 def log(message: str):
@@ -239,7 +675,7 @@ def log(message: str):
     A method to print a log message.
     """
     if archcraftsman.arguments.test():
-        print(f"{LOG}# {message}{RESET}")
+        archcraftsman.terminal.RENDERER.line(f"{LOG}# {message}{RESET}")
 
 
 def print_help(message: str, do_pause: bool = False):
@@ -256,6 +692,7 @@ def input_str(message: str, password: bool = False) -> str:
     """
     A method to ask to input something.
     """
+    archcraftsman.terminal.RENDERER.flush()
     if password:
         return getpass.getpass(prompt=f"{PROMPT}{message}{RESET}")
     return input(f"{PROMPT}{message}{RESET}")
@@ -265,15 +702,9 @@ def input_char(message: str):
     """
     A method to ask to input a single char.
     """
-    print(f"{PROMPT}{message}{RESET}", end="", flush=True)
-    fd = sys.stdin.fileno()
-    old_settings = termios.tcgetattr(fd)
-    try:
-        tty.setcbreak(fd)
-        answer = sys.stdin.read(1)
-    finally:
-        termios.tcsetattr(fd, termios.TCSADRAIN, old_settings)
-    print(answer)
+    archcraftsman.terminal.RENDERER.write(f"{PROMPT}{message}{RESET}")
+    answer = archcraftsman.terminal.read_key()
+    archcraftsman.terminal.RENDERER.line(answer)
     return answer
 
 
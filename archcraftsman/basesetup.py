@@ -20,30 +20,55 @@ The system setup module
 import re
 import subprocess
 import sys
+import typing
 
 import archcraftsman.arguments
 import archcraftsman.base
 import archcraftsman.bundles.bundle
 import archcraftsman.bundles.genericbundle
-import archcraftsman.bundles.grub
-import archcraftsman.bundles.microcodes
-import archcraftsman.bundles.simple.copyacm
-import archcraftsman.bundles.simple.grmlzsh
-import archcraftsman.bundles.simple.nvidia
-import archcraftsman.bundles.simple.terminus
-import archcraftsman.bundles.simple.zram
+import archcraftsman.bundles.genericcatalog
 import archcraftsman.bundles.utils
 import archcraftsman.config
+import archcraftsman.geolocation
 import archcraftsman.i18n
 import archcraftsman.info
+import archcraftsman.keymaps
 import archcraftsman.options
 import archcraftsman.packages
+import archcraftsman.pipeline
 import archcraftsman.prelaunchinfo
+import archcraftsman.privileges
+import archcraftsman.recorder
+import archcraftsman.timezones
 import archcraftsman.utils
+import archcraftsman.warmup
 
 _ = archcraftsman.i18n.translate
 
 
+def sync_packages() -> archcraftsman.packages.Packages:
+    """
+    The method to get the packages of the sync databases, loaded in the background.
+    """
+    packages = archcraftsman.warmup.result(
+        "packages", archcraftsman.packages.synchronise
+    )
+    packages.warn_unreadable()
+    return packages
+
+
+def missing_packages() -> list[str]:
+    """
+    The method to get the selected packages that are not available in the sync databases.
+    """
+    return sync_packages().missing(
+        archcraftsman.bundles.utils.bundles_packages(
+            archcraftsman.info.ai.system_info.bundles
+        )
+        | set(archcraftsman.info.ai.system_info.more_pkgs)
+    )
+
+
 def initial_setup_summary(ask: bool = True) -> bool:
     """
     The method to print a summary of the pre-launch steps.
@@ -106,6 +131,21 @@ def initial_setup(shell_mode: bool = False):
         archcraftsman.info.ai.pre_launch_info.setup_locale()
 
 
+def warm_up(shell_mode: bool = False):
+    """
+    The method to start the expensive lookups in the background, the prompts waiting for them only if needed.
+    """
+    archcraftsman.geolocation.start_lookup()
+    archcraftsman.warmup.submit("keymaps", archcraftsman.keymaps.index)
+    archcraftsman.warmup.submit("catalog", archcraftsman.bundles.genericcatalog.catalog)
+    if not shell_mode:
+        if not archcraftsman.arguments.shared_cache():
+            archcraftsman.warmup.submit("packages", archcraftsman.packages.synchronise)
+        archcraftsman.warmup.submit("timezones", archcraftsman.timezones.index)
+        if not archcraftsman.arguments.config():
+            archcraftsman.warmup.submit("drives", archcraftsman.utils.list_drives)
+
+
 def pre_launch(shell_mode: bool = False):
     """
     A pre-launch steps method.
@@ -116,21 +156,37 @@ def pre_launch(shell_mode: bool = False):
                 _("This script must be run as root."), do_pause=False
             )
             sys.exit(1)
+        archcraftsman.privileges.start_broker()
+        warm_up(shell_mode)
 
         if archcraftsman.arguments.config():
             archcraftsman.config.deserialize(archcraftsman.arguments.config())
+        if archcraftsman.arguments.target_disk():
+            archcraftsman.info.ai.partitioning_info.move_to_disk(
+                archcraftsman.arguments.target_disk()
+            )
 
         archcraftsman.base.print_step(_("Running pre-launch steps : "), clear=False)
 
-        if not shell_mode:
+        # With a shared cache, the live environment is prepared once for all the installations.
+        if not shell_mode and not archcraftsman.arguments.shared_cache():
             archcraftsman.base.execute('sed -i "s|#Color|Color|g" /etc/pacman.conf')
             archcraftsman.base.execute(
                 'sed -i "s|#ParallelDownloads = 5|ParallelDownloads = 5\\nDisableDownloadTimeout|g" /etc/pacman.conf'
             )
 
             archcraftsman.base.print_sub_step(_("Synchronising repositories..."))
-            archcraftsman.base.execute("pacman -Sy &>/dev/null")
-            archcraftsman.packages.Packages()
+
+        if not shell_mode and not archcraftsman.arguments.shared_cache():
+            if archcraftsman.arguments.config():
+                unavailable_packages = missing_packages()
+                if unavailable_packages:
+                    archcraftsman.base.print_error(
+                        _("The following packages are not available : %s")
+                        % " ".join(unavailable_packages),
+                        do_pause=False,
+                    )
+                    sys.exit(1)
 
         initial_setup(shell_mode)
     except KeyboardInterrupt:
@@ -145,6 +201,15 @@ def pre_launch(shell_mode: bool = False):
             do_pause=False,
         )
         sys.exit(1)
+    except archcraftsman.recorder.ReplayError as exception:
+        archcraftsman.base.print_error(
+            _("The replayed fixture doesn't match the installation: %s") % exception,
+            do_pause=False,
+        )
+        sys.exit(1)
+    except ValueError as exception:
+        archcraftsman.base.print_error(str(exception), do_pause=False)
+        sys.exit(1)
     except EOFError:
         sys.exit(1)
 
@@ -179,6 +244,13 @@ def setup_system_summary(ask: bool = True) -> bool:
             _("More packages to install : %s")
             % " ".join(archcraftsman.info.ai.system_info.more_pkgs)
         )
+    unavailable_packages = missing_packages()
+    if unavailable_packages:
+        archcraftsman.base.print_warning(
+            _("The following packages are not available : %s")
+            % " ".join(unavailable_packages),
+            do_pause=False,
+        )
     if ask:
         return archcraftsman.utils.prompt_bool(
             _("Is the information correct ?"), default=False
@@ -186,12 +258,24 @@ def setup_system_summary(ask: bool = True) -> bool:
     return True
 
 
-def setup_system():
+def abort_if_failed(scheduler: typing.Optional[archcraftsman.pipeline.StepScheduler]):
+    """
+    Raise the error of the failed background step, if any, so the user doesn't answer the remaining questions for nothing.
+    """
+    if scheduler is not None and scheduler.failed():
+        scheduler.wait()
+
+
+def setup_system(
+    scheduler: typing.Optional[archcraftsman.pipeline.StepScheduler] = None,
+):
     """
     The method to get system configurations from the user.
+    The background steps of the scheduler, if any, are checked between the prompts.
     """
     user_answer = False
     while not user_answer:
+        abort_if_failed(scheduler)
         archcraftsman.base.print_step(_("System configuration : "))
         archcraftsman.info.ai.system_info.hostname = archcraftsman.base.prompt_ln(
             _("What will be your hostname (archlinux) : "), default="archlinux"
@@ -244,10 +328,9 @@ def setup_system():
             ):
                 archcraftsman.info.ai.system_info.bundles.append(generic_bundle)
 
-        default_timezone_file = archcraftsman.info.ai.pre_launch_info.timezone_file()
-        archcraftsman.info.ai.system_info.timezone = archcraftsman.base.prompt_ln(
-            _("Your timezone (%s) : ") % default_timezone_file,
-            default=default_timezone_file,
+        abort_if_failed(scheduler)
+        archcraftsman.info.ai.system_info.timezone = archcraftsman.utils.ask_timezone(
+            archcraftsman.info.ai.pre_launch_info.timezone_file()
         )
         user_name_pattern = re.compile("^[a-z][-a-z\\d_]*$")
         user_name_ok = False
@@ -276,9 +359,8 @@ def setup_system():
                 % archcraftsman.info.ai.system_info.user_name
             )
 
-        archcraftsman.info.ai.system_info.more_pkgs = (
-            archcraftsman.packages.Packages().ask_packages()
-        )
+        abort_if_failed(scheduler)
+        archcraftsman.info.ai.system_info.more_pkgs = sync_packages().ask_packages()
 
         archcraftsman.base.print_sub_step(_("%s password configuration : ") % "root")
         archcraftsman.info.ai.system_info.root_password = (
@@ -297,10 +379,15 @@ def setup_system():
             )
 
         archcraftsman.info.ai.system_info.bundles.append(
-            archcraftsman.bundles.grub.Grub()
+            archcraftsman.bundles.utils.get_bundle_type_by_name(
+                archcraftsman.options.BootLoaders.GRUB
+            )()
         )
         archcraftsman.info.ai.system_info.bundles.append(
-            archcraftsman.bundles.microcodes.Microcodes()
+            archcraftsman.bundles.utils.get_bundle_type_by_name(
+                archcraftsman.options.Bundles.MICROCODES
+            )()
         )
 
+        abort_if_failed(scheduler)
         user_answer = setup_system_summary()
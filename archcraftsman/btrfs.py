@@ -18,6 +18,7 @@
 All BTRFS related functions
 """
 
+import archcraftsman.arguments
 import archcraftsman.base
 
 
@@ -34,7 +35,9 @@ class Subvolume:
         """
         A method to create a subvolume.
         """
-        archcraftsman.base.execute(f"btrfs subvolume create -p /mnt/@{self.path}")
+        archcraftsman.base.execute(
+            f"btrfs subvolume create -p {archcraftsman.arguments.target_root()}/@{self.path}"
+        )
 
     def mount(self, partition: str):
         """
@@ -42,7 +45,7 @@ class Subvolume:
         """
         compression = f"compress={self.compression}," if self.compression else ""
         archcraftsman.base.execute(
-            f"mount --mkdir -o {compression}subvol=@{self.path} {partition} /mnt{self.path}"
+            f"mount --mkdir -o {compression}subvol=@{self.path} {partition} {archcraftsman.arguments.target_root()}{self.path}"
         )
 
 
@@ -89,7 +92,7 @@ def _mount(path: str, mount_point: str):
     A function to mount a partition.
     """
     archcraftsman.base.execute(
-        f"mount --mkdir -o compress=zstd {path} /mnt{mount_point}"
+        f"mount --mkdir -o compress=zstd {path} {archcraftsman.arguments.target_root()}{mount_point}"
     )
 
 
@@ -100,14 +103,16 @@ def formatting(path: str, mount_point: str, part_mount_points: list[str]):
     _formatting(path)
     if mount_point == "/":
         _mount(path, "/")
-        archcraftsman.base.execute("btrfs subvolume create /mnt/@")
+        archcraftsman.base.execute(
+            f"btrfs subvolume create {archcraftsman.arguments.target_root()}/@"
+        )
         for subvolume in subvolumes:
             if subvolume.path not in part_mount_points:
                 subvolume.create()
         archcraftsman.base.execute(
-            f"btrfs subvolume set-default /mnt/@{ROOT_SUBVOLUME.path}"
+            f"btrfs subvolume set-default {archcraftsman.arguments.target_root()}/@{ROOT_SUBVOLUME.path}"
         )
-        archcraftsman.base.execute("umount -R /mnt")
+        archcraftsman.base.execute(f"umount -R {archcraftsman.arguments.target_root()}")
 
 
 def mount(path: str, mount_point: str, part_mount_points: list[str]):
@@ -126,5 +131,5 @@ def create_swapfile(size: str):
     A function to create a BTRFS swapfile.
     """
     archcraftsman.base.execute(
-        f"btrfs filesystem mkswapfile --size {size} --uuid clear /mnt/swap/swapfile"
+        f"btrfs filesystem mkswapfile --size {size} --uuid clear {archcraftsman.arguments.target_root()}/swap/swapfile"
     )
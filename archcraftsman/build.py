@@ -0,0 +1,117 @@
+# ArchCraftsman, The careful yet very fast Arch Linux Craftsman.
+# Copyright (C) 2023 Rawleenc
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+The build module, producing a self-contained zipapp of the installer.
+Modules are shipped as precompiled bytecode, along with the static bundles manifest,
+the compiled generic bundles catalog and the compiled locale catalogs.
+
+Usage : python -m archcraftsman.build [OUTPUT]
+"""
+import importlib.resources
+import importlib.util
+import os
+import pathlib
+import py_compile
+import shutil
+import sys
+import tempfile
+import zipapp
+
+import archcraftsman.bundles.genericcatalog
+import archcraftsman.bundles.utils
+import archcraftsman.i18n
+
+DEFAULT_OUTPUT = "archcraftsman.pyz"
+INTERPRETER = "/usr/bin/env python"
+EXCLUDED = {"__pycache__", "test"}
+# The magic number of the shipped bytecode, checked by the launcher before running the zipapp.
+MAGIC_FILE = "archcraftsman/bytecode.magic"
+
+
+def copy_sources(staging: str) -> str:
+    """
+    Copy the package sources into the staging directory, tests excepted.
+    """
+    source = pathlib.Path(str(importlib.resources.files("archcraftsman")))
+    package = os.path.join(staging, "archcraftsman")
+    shutil.copytree(
+        source,
+        package,
+        ignore=lambda directory, names: [
+            name
+            for name in names
+            if name in EXCLUDED or name.endswith((".pyc", ".pyo", ".json"))
+        ],
+    )
+    return package
+
+
+def compile_resources(package: str):
+    """
+    Generate the bundles manifest, the generic bundles catalog and the locale catalogs of the staged package.
+    """
+    archcraftsman.bundles.utils.generate_manifest(
+        os.path.join(package, "bundles", "manifest.py")
+    )
+    generic = pathlib.Path(package, "bundles", "generic")
+    archcraftsman.bundles.genericcatalog.compile_catalog(
+        generic, str(generic / archcraftsman.bundles.genericcatalog.CATALOG_FILE)
+    )
+    locales = pathlib.Path(package, "locales")
+    for po_file in locales.glob("*.po"):
+        po_file.with_suffix(".mo").write_bytes(
+            archcraftsman.i18n.compile_po(po_file.read_text(encoding="UTF-8"))
+        )
+        po_file.unlink()
+
+
+def compile_modules(package: str):
+    """
+    Replace all the staged modules by their bytecode, which zipimport loads without any compile step.
+    """
+    for source in pathlib.Path(package).rglob("*.py"):
+        py_compile.compile(
+            str(source),
+            cfile=str(source.with_suffix(".pyc")),
+            dfile=str(source.relative_to(pathlib.Path(package).parent)),
+            doraise=True,
+            invalidation_mode=py_compile.PycInvalidationMode.UNCHECKED_HASH,
+        )
+        source.unlink()
+
+
+def build(output: str = DEFAULT_OUTPUT, interpreter: str = INTERPRETER) -> str:
+    """
+    Build the installer zipapp. It only runs on the Python version used to build it, whose bytecode magic number it holds.
+    """
+    with tempfile.TemporaryDirectory() as staging:
+        package = copy_sources(staging)
+        compile_resources(package)
+        compile_modules(package)
+        pathlib.Path(staging, MAGIC_FILE).write_bytes(importlib.util.MAGIC_NUMBER)
+        zipapp.create_archive(
+            staging,
+            output,
+            interpreter=interpreter,
+            main="archcraftsman.installer:main",
+            compressed=True,
+        )
+    return output
+
+
+if __name__ == "__main__":
+    print(build(sys.argv[1] if len(sys.argv) > 1 else DEFAULT_OUTPUT))
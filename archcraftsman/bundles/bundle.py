@@ -24,8 +24,11 @@ class Bundle:
     A class to represent a bootloader.
     """
 
+    # The name of the bundle type, read by the bundles manifest without instantiating it.
+    NAME = ""
+
     def __init__(self, name: str = "") -> None:
-        self.name = name
+        self.name = name or self.NAME
 
     def prompt(self) -> str:
         """
@@ -18,12 +18,9 @@
 The TOML valued generic bundle module
 """
 
-import importlib.resources
-import tomllib
-import typing
-
 import archcraftsman.base
 import archcraftsman.bundles.bundle
+import archcraftsman.bundles.genericcatalog
 import archcraftsman.i18n
 
 _t = archcraftsman.i18n.translate
@@ -35,28 +32,13 @@ class GenericBundle(archcraftsman.bundles.bundle.Bundle):
     GenericBundle class.
     """
 
-    _prompt: str
-    _resume: str
-    _help: typing.Optional[str]
-    _packages: list[str]
-    _commands: list[str]
+    _info: archcraftsman.bundles.genericcatalog.GenericBundleInfo
 
     def __init__(self, name: str = ""):
         super().__init__(name)
-        generic_bundle_config = importlib.resources.files(
-            "archcraftsman.bundles.generic"
-        ).joinpath(f"{name}.toml")
-        if not generic_bundle_config.is_file():
-            data = None
-        else:
-            with open(str(generic_bundle_config), "rb") as config_file:
-                data = tomllib.load(config_file)
-        if data:
-            self._prompt = data.get("prompt", f"Do you want to install {name} ?")
-            self._resume = data.get("resume", f"Install {name}.")
-            self._help = data.get("help", None)
-            self._packages = data.get("packages", [])
-            self._commands = data.get("commands", [])
+        self._info = archcraftsman.bundles.genericcatalog.catalog().get(
+            name, archcraftsman.bundles.genericcatalog.GenericBundleInfo(name)
+        )
 
     def format_str(self, string: str) -> str:
         """
@@ -66,19 +48,17 @@ class GenericBundle(archcraftsman.bundles.bundle.Bundle):
         return string
 
     def prompt(self) -> str:
-        return self.format_str(_t(self._prompt))
+        return self.format_str(_t(self._info.prompt))
 
     def help(self) -> str:
-        return self.format_str(_t(self._help)) if self._help else ""
+        return self.format_str(_t(self._info.help_msg)) if self._info.help_msg else ""
 
     def packages(self) -> list[str]:
-        return [] if self._packages is None else self._packages
+        return list(self._info.packages)
 
     def print_resume(self):
-        archcraftsman.base.print_sub_step(self.format_str(_t(self._resume)))
+        archcraftsman.base.print_sub_step(self.format_str(_t(self._info.resume)))
 
     def configure(self):
-        if self._commands is None:
-            return
-        for command in self._commands:
+        for command in self._info.commands:
             archcraftsman.base.execute(command, chroot=True)
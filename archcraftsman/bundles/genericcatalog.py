@@ -0,0 +1,243 @@
+# ArchCraftsman, The careful yet very fast Arch Linux Craftsman.
+# Copyright (C) 2023 Rawleenc
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+The generic bundles catalog module, compiling all TOML generic bundles into a single shared catalog
+"""
+import hashlib
+import importlib.resources
+import importlib.resources.abc
+import json
+import os
+import pathlib
+import sys
+import threading
+import tomllib
+import typing
+
+import archcraftsman.arguments
+import archcraftsman.base
+
+GENERIC_BUNDLES_PACKAGE = "archcraftsman.bundles.generic"
+CATALOG_FILE = "catalog.json"
+
+
+class GenericBundleInfo:
+    """
+    The compiled information of a generic bundle.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        prompt: str = "",
+        resume: str = "",
+        help_msg: typing.Optional[str] = None,
+        packages: typing.Optional[list[str]] = None,
+        commands: typing.Optional[list[str]] = None,
+    ) -> None:
+        self.name = name
+        self.prompt = prompt or f"Do you want to install {name} ?"
+        self.resume = resume or f"Install {name}."
+        self.help_msg = help_msg
+        self.packages = packages or []
+        self.commands = commands or []
+
+    def to_dict(self) -> dict:
+        """
+        Convert the generic bundle information to a serializable dict.
+        """
+        return {
+            "prompt": self.prompt,
+            "resume": self.resume,
+            "help": self.help_msg,
+            "packages": self.packages,
+            "commands": self.commands,
+        }
+
+    @staticmethod
+    def from_dict(name: str, data: dict) -> "GenericBundleInfo":
+        """
+        Build a generic bundle information from a TOML or catalog dict.
+        """
+        return GenericBundleInfo(
+            name,
+            prompt=data.get("prompt", ""),
+            resume=data.get("resume", ""),
+            help_msg=data.get("help", None),
+            packages=list(data.get("packages", [])),
+            commands=list(data.get("commands", [])),
+        )
+
+
+def parse_directory(
+    directory: importlib.resources.abc.Traversable,
+) -> dict[str, GenericBundleInfo]:
+    """
+    Parse all the TOML generic bundles of a directory.
+    """
+    bundles = {}
+    for resource in sorted(directory.iterdir(), key=lambda res: res.name):
+        if not resource.is_file() or not resource.name.endswith(".toml"):
+            continue
+        name = resource.name.removesuffix(".toml")
+        with resource.open("rb") as toml_file:
+            bundles[name] = GenericBundleInfo.from_dict(name, tomllib.load(toml_file))
+    return bundles
+
+
+def directory_signature(directory: pathlib.Path) -> list[list]:
+    """
+    Compute the signature of a directory of TOML generic bundles from their names, sizes and mtimes.
+    """
+    return sorted(
+        [entry.name, entry.stat().st_mtime_ns, entry.stat().st_size]
+        for entry in os.scandir(directory)
+        if entry.is_file() and entry.name.endswith(".toml")
+    )
+
+
+def cache_file(directory: pathlib.Path) -> str:
+    """
+    Get the catalog cache file path of a directory.
+    """
+    cache_dir = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    directory_hash = hashlib.sha1(
+        str(directory.resolve()).encode("UTF-8"), usedforsecurity=False
+    ).hexdigest()
+    return os.path.join(cache_dir, "archcraftsman", f"generic-{directory_hash}.json")
+
+
+def read_catalog_file(
+    file_path: typing.Union[str, importlib.resources.abc.Traversable],
+    signature: typing.Optional[list[list]] = None,
+) -> typing.Optional[dict[str, GenericBundleInfo]]:
+    """
+    Read a compiled catalog file, if it exists and matches the given signature.
+    """
+    try:
+        if isinstance(file_path, str):
+            with open(file_path, "r", encoding="UTF-8") as catalog_file:
+                data = json.load(catalog_file)
+        else:
+            data = json.loads(file_path.read_text(encoding="UTF-8"))
+    except (OSError, ValueError):
+        return None
+    if signature is not None and data.get("signature") != signature:
+        return None
+    return {
+        name: GenericBundleInfo.from_dict(name, bundle)
+        for name, bundle in dict(data.get("bundles", {})).items()
+    }
+
+
+def write_catalog_file(
+    file_path: str,
+    bundles: dict[str, GenericBundleInfo],
+    signature: typing.Optional[list[list]] = None,
+):
+    """
+    Write a compiled catalog file.
+    """
+    os.makedirs(os.path.dirname(file_path) or ".", exist_ok=True)
+    with open(file_path, "w", encoding="UTF-8") as catalog_file:
+        json.dump(
+            {
+                "signature": signature,
+                "bundles": {name: info.to_dict() for name, info in bundles.items()},
+            },
+            catalog_file,
+        )
+
+
+def load_directory(
+    directory: importlib.resources.abc.Traversable,
+) -> dict[str, GenericBundleInfo]:
+    """
+    Load the generic bundles of a directory, using its precompiled or cached catalog when up to date.
+    """
+    if not isinstance(directory, pathlib.Path):
+        bundles = read_catalog_file(directory.joinpath(CATALOG_FILE))
+        return bundles if bundles is not None else parse_directory(directory)
+    try:
+        signature = directory_signature(directory)
+    except OSError as exception:
+        archcraftsman.base.log(f"Unable to read {directory}: {exception}")
+        return {}
+    bundles = read_catalog_file(str(directory / CATALOG_FILE), signature)
+    if bundles is not None:
+        return bundles
+    directory_cache_file = cache_file(directory)
+    bundles = read_catalog_file(directory_cache_file, signature)
+    if bundles is not None:
+        return bundles
+    bundles = parse_directory(directory)
+    try:
+        write_catalog_file(directory_cache_file, bundles, signature)
+    except OSError as exception:
+        archcraftsman.base.log(f"Unable to cache the {directory} catalog: {exception}")
+    return bundles
+
+
+_CATALOG: typing.Optional[dict[str, GenericBundleInfo]] = None
+_CATALOG_LOCK = threading.Lock()
+
+
+def catalog() -> dict[str, GenericBundleInfo]:
+    """
+    Get the shared generic bundles catalog, loaded on the first call.
+    Bundles of the user-supplied directories override the built-in ones with the same name.
+    """
+    global _CATALOG
+    with _CATALOG_LOCK:
+        if _CATALOG is None:
+            bundles = load_directory(importlib.resources.files(GENERIC_BUNDLES_PACKAGE))
+            for directory in archcraftsman.arguments.bundles_dirs():
+                bundles.update(load_directory(pathlib.Path(directory)))
+            _CATALOG = bundles
+        return _CATALOG
+
+
+def reset():
+    """
+    Reset the shared generic bundles catalog so it is reloaded on the next call.
+    """
+    global _CATALOG
+    with _CATALOG_LOCK:
+        _CATALOG = None
+
+
+def compile_catalog(
+    directory: importlib.resources.abc.Traversable, file_path: str
+) -> dict[str, GenericBundleInfo]:
+    """
+    Compile all the TOML generic bundles of a directory into a catalog file.
+    """
+    bundles = parse_directory(directory)
+    write_catalog_file(
+        file_path,
+        bundles,
+        directory_signature(directory) if isinstance(directory, pathlib.Path) else None,
+    )
+    return bundles
+
+
+if __name__ == "__main__":
+    _DIRECTORY = importlib.resources.files(GENERIC_BUNDLES_PACKAGE)
+    compile_catalog(
+        _DIRECTORY,
+        sys.argv[1] if len(sys.argv) > 1 else str(_DIRECTORY.joinpath(CATALOG_FILE)),
+    )
@@ -33,8 +33,10 @@ class Gnome(archcraftsman.bundles.bundle.Bundle):
     Bundle class.
     """
 
+    NAME = archcraftsman.options.Desktops.GNOME
+
     def __init__(self):
-        super().__init__(archcraftsman.options.Desktops.GNOME)
+        super().__init__()
         self.minimal = False
 
     def packages(self) -> list[str]:
@@ -19,6 +19,7 @@ The grub bundle module
 """
 import re
 
+import archcraftsman.arguments
 import archcraftsman.base
 import archcraftsman.bundles.bundle
 import archcraftsman.info
@@ -30,8 +31,7 @@ class Grub(archcraftsman.bundles.bundle.Bundle):
     The Grub Bootloader class.
     """
 
-    def __init__(self):
-        super().__init__(archcraftsman.options.BootLoaders.GRUB)
+    NAME = archcraftsman.options.BootLoaders.GRUB
 
     def packages(self) -> list[str]:
         return ["grub"]
@@ -51,12 +51,12 @@ class Grub(archcraftsman.bundles.bundle.Bundle):
                 chroot=True,
             )
         archcraftsman.base.execute(
-            'sed -i "/^GRUB_CMDLINE_LINUX=.*/a GRUB_DISABLE_OS_PROBER=false" /mnt/etc/default/grub'
+            f'sed -i "/^GRUB_CMDLINE_LINUX=.*/a GRUB_DISABLE_OS_PROBER=false" {archcraftsman.arguments.target_root()}/etc/default/grub'
         )
 
         if archcraftsman.info.ai.partitioning_info.root_partition().encrypted:
             hooks = archcraftsman.base.execute(
-                "grep -e '^HOOKS' /mnt/etc/mkinitcpio.conf",
+                f"grep -e '^HOOKS' {archcraftsman.arguments.target_root()}/etc/mkinitcpio.conf",
                 check=False,
                 capture_output=True,
             ).output.strip()
@@ -69,12 +69,12 @@ class Grub(archcraftsman.bundles.bundle.Bundle):
                 extracted_hooks = ["encrypt"]
             processed_hooks = f"HOOKS=({' '.join(extracted_hooks)})"
             archcraftsman.base.execute(
-                f"sed -i 's|{hooks}|{processed_hooks}|g' /mnt/etc/mkinitcpio.conf"
+                f"sed -i 's|{hooks}|{processed_hooks}|g' {archcraftsman.arguments.target_root()}/etc/mkinitcpio.conf"
             )
             archcraftsman.base.execute("mkinitcpio -P", chroot=True)
 
             grub_cmdline = archcraftsman.base.execute(
-                "grep -e '^GRUB_CMDLINE_LINUX_DEFAULT' /mnt/etc/default/grub",
+                f"grep -e '^GRUB_CMDLINE_LINUX_DEFAULT' {archcraftsman.arguments.target_root()}/etc/default/grub",
                 check=False,
                 capture_output=True,
             ).output.strip()
@@ -91,7 +91,7 @@ class Grub(archcraftsman.bundles.bundle.Bundle):
                 f"GRUB_CMDLINE_LINUX_DEFAULT=\"{' '.join(extracted_grub_cmdline)}\""
             )
             archcraftsman.base.execute(
-                f"sed -i 's|{grub_cmdline}|{processed_grub_cmdline}|g' /mnt/etc/default/grub"
+                f"sed -i 's|{grub_cmdline}|{processed_grub_cmdline}|g' {archcraftsman.arguments.target_root()}/etc/default/grub"
             )
 
         for partition in [
@@ -100,7 +100,7 @@ class Grub(archcraftsman.bundles.bundle.Bundle):
             if part.encrypted and part.part_type != archcraftsman.options.PartTypes.ROOT
         ]:
             archcraftsman.base.execute(
-                f'echo "{partition.block_name} UUID={partition.uuid()} none" >> /mnt/etc/crypttab'
+                f'echo "{partition.block_name} UUID={partition.uuid()} none" >> {archcraftsman.arguments.target_root()}/etc/crypttab'
             )
 
         if (
@@ -108,9 +108,9 @@ class Grub(archcraftsman.bundles.bundle.Bundle):
             == archcraftsman.options.FSFormats.EXT4
         ):
             archcraftsman.base.execute(
-                'sed -i "s|GRUB_DEFAULT=.*|GRUB_DEFAULT=saved|g" /mnt/etc/default/grub'
+                f'sed -i "s|GRUB_DEFAULT=.*|GRUB_DEFAULT=saved|g" {archcraftsman.arguments.target_root()}/etc/default/grub'
             )
             archcraftsman.base.execute(
-                'sed -i "/^GRUB_DEFAULT=.*/a GRUB_SAVEDEFAULT=true" /mnt/etc/default/grub'
+                f'sed -i "/^GRUB_DEFAULT=.*/a GRUB_SAVEDEFAULT=true" {archcraftsman.arguments.target_root()}/etc/default/grub'
             )
         archcraftsman.base.execute("grub-mkconfig -o /boot/grub/grub.cfg", chroot=True)
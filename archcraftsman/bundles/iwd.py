@@ -32,8 +32,7 @@ class Iwd(archcraftsman.bundles.bundle.Bundle):
     Iwd config class.
     """
 
-    def __init__(self):
-        super().__init__(archcraftsman.options.Network.IWD)
+    NAME = archcraftsman.options.Network.IWD
 
     def packages(self) -> list[str]:
         packages = ["iwd"]
@@ -30,8 +30,7 @@ class LinuxCurrent(archcraftsman.bundles.bundle.Bundle):
     The Linux current kernel class.
     """
 
-    def __init__(self):
-        super().__init__(archcraftsman.options.Kernels.CURRENT)
+    NAME = archcraftsman.options.Kernels.CURRENT
 
     def packages(self) -> list[str]:
         return ["linux", "linux-headers"]
@@ -45,8 +44,7 @@ class LinuxHardened(archcraftsman.bundles.bundle.Bundle):
     The Linux hardened kernel class.
     """
 
-    def __init__(self):
-        super().__init__(archcraftsman.options.Kernels.HARDENED)
+    NAME = archcraftsman.options.Kernels.HARDENED
 
     def packages(self) -> list[str]:
         return ["linux-hardened", "linux-hardened-headers"]
@@ -60,8 +58,7 @@ class LinuxLts(archcraftsman.bundles.bundle.Bundle):
     The Linux LTS kernel class.
     """
 
-    def __init__(self):
-        super().__init__(archcraftsman.options.Kernels.LTS)
+    NAME = archcraftsman.options.Kernels.LTS
 
     def packages(self) -> list[str]:
         return ["linux-lts", "linux-lts-headers"]
@@ -75,8 +72,7 @@ class LinuxZen(archcraftsman.bundles.bundle.Bundle):
     The Linux zen kernel class.
     """
 
-    def __init__(self):
-        super().__init__(archcraftsman.options.Kernels.ZEN)
+    NAME = archcraftsman.options.Kernels.ZEN
 
     def packages(self) -> list[str]:
         return ["linux-zen", "linux-zen-headers"]
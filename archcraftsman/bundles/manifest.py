@@ -0,0 +1,43 @@
+# ArchCraftsman, The careful yet very fast Arch Linux Craftsman.
+# Copyright (C) 2023 Rawleenc
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+The static bundles manifest module, mapping each bundle name to its 'module:class' path.
+Generated with 'python -m archcraftsman.bundles.utils', do not edit manually.
+"""
+
+BUNDLES: dict[str, str] = {
+    "gnome": "archcraftsman.bundles.gnome:Gnome",
+    "grub": "archcraftsman.bundles.grub:Grub",
+    "iwd": "archcraftsman.bundles.iwd:Iwd",
+    "current": "archcraftsman.bundles.linux:LinuxCurrent",
+    "hardened": "archcraftsman.bundles.linux:LinuxHardened",
+    "lts": "archcraftsman.bundles.linux:LinuxLts",
+    "zen": "archcraftsman.bundles.linux:LinuxZen",
+    "microcodes": "archcraftsman.bundles.microcodes:Microcodes",
+    "networkmanager": "archcraftsman.bundles.networkmanager:NetworkManager",
+    "plasma": "archcraftsman.bundles.plasma:Plasma",
+    "generateconfig": "archcraftsman.bundles.shell.generateconfig:GenerateConfig",
+    "yay": "archcraftsman.bundles.shell.yay:Yay",
+    "architect": "archcraftsman.bundles.simple.architect:CopyACM",
+    "copyacm": "archcraftsman.bundles.simple.copyacm:CopyACM",
+    "grml": "archcraftsman.bundles.simple.grmlzsh:GrmlZsh",
+    "nvidia": "archcraftsman.bundles.simple.nvidia:NvidiaDriver",
+    "terminus": "archcraftsman.bundles.simple.terminus:TerminusFont",
+    "zram": "archcraftsman.bundles.simple.zram:Zram",
+    "systemd": "archcraftsman.bundles.systemdnet:SystemdNet",
+    "xfce": "archcraftsman.bundles.xfce:Xfce",
+}
@@ -33,10 +33,15 @@ class Microcodes(archcraftsman.bundles.bundle.Bundle):
     The Microcodes class.
     """
 
+    NAME = archcraftsman.options.Bundles.MICROCODES
+
     def __init__(self):
-        super().__init__(archcraftsman.options.Bundles.MICROCODES)
+        super().__init__()
         self._cpu_info_vendor = archcraftsman.base.execute(
-            'grep </proc/cpuinfo "vendor" | uniq', force=True, capture_output=True
+            'grep </proc/cpuinfo "vendor" | uniq',
+            force=True,
+            capture_output=True,
+            cache={archcraftsman.base.CACHE_SYSTEM},
         ).output
         self._microcode_name = (
             re.sub("\\s+", "", self._cpu_info_vendor).split(":")[1]
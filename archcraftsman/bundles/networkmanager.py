@@ -32,8 +32,7 @@ class NetworkManager(archcraftsman.bundles.bundle.Bundle):
     Grml ZSH config class.
     """
 
-    def __init__(self):
-        super().__init__(archcraftsman.options.Network.NETWORK_MANAGER)
+    NAME = archcraftsman.options.Network.NETWORK_MANAGER
 
     def packages(self) -> list[str]:
         packages = ["networkmanager"]
@@ -33,8 +33,10 @@ class Plasma(archcraftsman.bundles.bundle.Bundle):
     Bundle class.
     """
 
+    NAME = archcraftsman.options.Desktops.PLASMA
+
     def __init__(self):
-        super().__init__(archcraftsman.options.Desktops.PLASMA)
+        super().__init__()
         self.minimal = False
 
     def packages(self) -> list[str]:
@@ -31,8 +31,7 @@ class GenerateConfig(archcraftsman.bundles.bundle.Bundle):
     The generate configuration shell bundle.
     """
 
-    def __init__(self):
-        super().__init__(archcraftsman.options.ShellBundles.GENERATE_CONFIG)
+    NAME = archcraftsman.options.ShellBundles.GENERATE_CONFIG
 
     def print_resume(self):
         archcraftsman.base.print_sub_step(_("Generate configuration."))
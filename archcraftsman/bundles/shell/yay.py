@@ -31,8 +31,7 @@ class Yay(archcraftsman.bundles.bundle.Bundle):
     The Yay class.
     """
 
-    def __init__(self):
-        super().__init__(archcraftsman.options.ShellBundles.YAY)
+    NAME = archcraftsman.options.ShellBundles.YAY
 
     def packages(self) -> list[str]:
         return ["yay"]
@@ -31,8 +31,7 @@ class CopyACM(archcraftsman.bundles.bundle.Bundle):
     The CopyACM class.
     """
 
-    def __init__(self):
-        super().__init__(archcraftsman.options.Bundles.ARCHITECT)
+    NAME = archcraftsman.options.Bundles.ARCHITECT
 
     def prompt(self) -> str:
         return _("Execute GLF's Architect post-installation script ?")
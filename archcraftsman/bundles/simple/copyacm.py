@@ -17,6 +17,7 @@
 """
 The copy ArchCraftsman bundle module
 """
+import archcraftsman.arguments
 import archcraftsman.base
 import archcraftsman.bundles.bundle
 import archcraftsman.i18n
@@ -31,8 +32,7 @@ class CopyACM(archcraftsman.bundles.bundle.Bundle):
     The CopyACM class.
     """
 
-    def __init__(self):
-        super().__init__(archcraftsman.options.Bundles.COPY_ACM)
+    NAME = archcraftsman.options.Bundles.COPY_ACM
 
     def prompt(self) -> str:
         return _("Copy ArchCraftsman to the new system ?")
@@ -43,8 +43,12 @@ class CopyACM(archcraftsman.bundles.bundle.Bundle):
     def configure(self):
         if archcraftsman.info.ai.system_info.user_name:
             path = f"/home/{archcraftsman.info.ai.system_info.user_name}"
-            archcraftsman.base.execute(f"mkdir -p /mnt{path}")
-            archcraftsman.base.execute(f"cp -r ~/archcraftsman /mnt{path}")
+            archcraftsman.base.execute(
+                f"mkdir -p {archcraftsman.arguments.target_root()}{path}"
+            )
+            archcraftsman.base.execute(
+                f"cp -r ~/archcraftsman {archcraftsman.arguments.target_root()}{path}"
+            )
             archcraftsman.base.execute(
                 f"chown -R {archcraftsman.info.ai.system_info.user_name}:"
                 f"{archcraftsman.info.ai.system_info.user_name} {path}",
@@ -52,5 +56,9 @@ class CopyACM(archcraftsman.bundles.bundle.Bundle):
             )
         else:
             path = "/root"
-            archcraftsman.base.execute(f"mkdir -p /mnt{path}")
-            archcraftsman.base.execute(f"cp -r ~/archcraftsman /mnt{path}")
+            archcraftsman.base.execute(
+                f"mkdir -p {archcraftsman.arguments.target_root()}{path}"
+            )
+            archcraftsman.base.execute(
+                f"cp -r ~/archcraftsman {archcraftsman.arguments.target_root()}{path}"
+            )
@@ -32,8 +32,7 @@ class GrmlZsh(archcraftsman.bundles.bundle.Bundle):
     Grml ZSH config class.
     """
 
-    def __init__(self):
-        super().__init__(archcraftsman.options.Bundles.GRML)
+    NAME = archcraftsman.options.Bundles.GRML
 
     def packages(self) -> list[str]:
         return ["zsh", "zsh-completions", "grml-zsh-config"]
@@ -31,8 +31,7 @@ class NvidiaDriver(archcraftsman.bundles.bundle.Bundle):
     The Nvidia driver class.
     """
 
-    def __init__(self):
-        super().__init__(archcraftsman.options.Bundles.NVIDIA)
+    NAME = archcraftsman.options.Bundles.NVIDIA
 
     def packages(self) -> list[str]:
         if (
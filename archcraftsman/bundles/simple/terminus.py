@@ -18,6 +18,7 @@
 The terminus console font bundle module
 """
 
+import archcraftsman.arguments
 import archcraftsman.base
 import archcraftsman.bundles.bundle
 import archcraftsman.i18n
@@ -32,8 +33,7 @@ class TerminusFont(archcraftsman.bundles.bundle.Bundle):
     The Terminus console font class.
     """
 
-    def __init__(self):
-        super().__init__(archcraftsman.options.Bundles.TERMINUS)
+    NAME = archcraftsman.options.Bundles.TERMINUS
 
     def packages(self) -> list[str]:
         return ["terminus-font"]
@@ -46,5 +46,5 @@ class TerminusFont(archcraftsman.bundles.bundle.Bundle):
 
     def configure(self):
         archcraftsman.base.execute(
-            f'echo "FONT={archcraftsman.info.ai.pre_launch_info.live_console_font}" >>/mnt/etc/vconsole.conf'
+            f'echo "FONT={archcraftsman.info.ai.pre_launch_info.live_console_font}" >>{archcraftsman.arguments.target_root()}/etc/vconsole.conf'
         )
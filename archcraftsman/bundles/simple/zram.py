@@ -17,6 +17,7 @@
 """
 The zram bundle module
 """
+import archcraftsman.arguments
 import archcraftsman.base
 import archcraftsman.bundles.bundle
 import archcraftsman.i18n
@@ -30,8 +31,7 @@ class Zram(archcraftsman.bundles.bundle.Bundle):
     The ZRAM class.
     """
 
-    def __init__(self):
-        super().__init__(archcraftsman.options.Bundles.ZRAM)
+    NAME = archcraftsman.options.Bundles.ZRAM
 
     def packages(self) -> list[str]:
         return ["zram-generator"]
@@ -54,7 +54,9 @@ class Zram(archcraftsman.bundles.bundle.Bundle):
         content = ["[zram0]\n", "zram-size = ram / 2\n"]
         try:
             with open(
-                "/mnt/etc/systemd/zram-generator.conf", "w", encoding="UTF-8"
+                f"{archcraftsman.arguments.target_root()}/etc/systemd/zram-generator.conf",
+                "w",
+                encoding="UTF-8",
             ) as zram_config_file:
                 zram_config_file.writelines(content)
         except FileNotFoundError as exception:
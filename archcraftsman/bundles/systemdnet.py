@@ -18,6 +18,7 @@
 The systemd network bundle module
 """
 
+import archcraftsman.arguments
 import archcraftsman.base
 import archcraftsman.bundles.bundle
 import archcraftsman.i18n
@@ -31,8 +32,7 @@ class SystemdNet(archcraftsman.bundles.bundle.Bundle):
     Grml ZSH config class.
     """
 
-    def __init__(self):
-        super().__init__(archcraftsman.options.Network.SYSTEMD)
+    NAME = archcraftsman.options.Network.SYSTEMD
 
     def packages(self) -> list[str]:
         return ["systemd-resolvconf"]
@@ -42,8 +42,10 @@ class SystemdNet(archcraftsman.bundles.bundle.Bundle):
 
     def configure(self):
         archcraftsman.base.execute(
-            "ln -sf /run/systemd/resolve/stub-resolv.conf /mnt/etc/resolv.conf"
+            f"ln -sf /run/systemd/resolve/stub-resolv.conf {archcraftsman.arguments.target_root()}/etc/resolv.conf"
+        )
+        archcraftsman.base.execute(
+            f"cp -r /etc/systemd/network {archcraftsman.arguments.target_root()}/etc/systemd/"
         )
-        archcraftsman.base.execute("cp -r /etc/systemd/network /mnt/etc/systemd/")
         archcraftsman.base.execute("systemctl enable systemd-networkd", chroot=True)
         archcraftsman.base.execute("systemctl enable systemd-resolved", chroot=True)
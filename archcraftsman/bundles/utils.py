@@ -17,16 +17,25 @@
 """
 The bundles related utility methods and tools module
 """
+import functools
 import importlib
+import importlib.metadata
 import importlib.resources
+import sys
 import typing
 
 import archcraftsman.base
 import archcraftsman.bundles.bundle
+import archcraftsman.bundles.genericcatalog
 import archcraftsman.options
 import archcraftsman.utils
 
 
+MANIFEST_MODULE = "archcraftsman.bundles.manifest"
+ENTRY_POINTS_GROUP = "archcraftsman.bundles"
+SIMPLE_BUNDLES_PACKAGE = "archcraftsman.bundles.simple"
+
+
 def get_bundle_files(base_package: str) -> list[str]:
     """
     A function to get all available bundle python files inside a package using importlib.resources.
@@ -36,26 +45,83 @@ def get_bundle_files(base_package: str) -> list[str]:
         for resource in importlib.resources.files(base_package).iterdir()
         if resource.is_file()
         and resource.name.endswith(".py")
-        and resource.name != "__init__.py"
+        and resource.name not in {"__init__.py", "manifest.py"}
     )
 
 
-def get_all_bundle_types() -> list[type[archcraftsman.bundles.bundle.Bundle]]:
+def scan_bundle_types() -> list[type[archcraftsman.bundles.bundle.Bundle]]:
     """
-    A function to get all available bundles.
+    A function to import all bundles modules and get all available bundle types.
+    Only used to generate the static bundles manifest.
     """
     for name in get_bundle_files("archcraftsman.bundles"):
         importlib.import_module(name)
-    for name in get_bundle_files("archcraftsman.bundles.simple"):
+    for name in get_bundle_files(SIMPLE_BUNDLES_PACKAGE):
         importlib.import_module(name)
     for name in get_bundle_files("archcraftsman.bundles.shell"):
         importlib.import_module(name)
     return archcraftsman.bundles.bundle.Bundle.__subclasses__()
 
 
-_BUNDLES_MAP: dict[str, type[archcraftsman.bundles.bundle.Bundle]] = {
-    bundle().name: bundle for bundle in get_all_bundle_types()
-}
+def scan_manifest() -> dict[str, str]:
+    """
+    A function to build the bundles manifest, mapping each bundle name to its 'module:class' path.
+    The names are read from the bundle types, which are not instantiated.
+    """
+    manifest = {}
+    for bundle_type in scan_bundle_types():
+        name = str(bundle_type.NAME)
+        if name:
+            manifest[name] = f"{bundle_type.__module__}:{bundle_type.__qualname__}"
+    return dict(sorted(manifest.items(), key=lambda item: (item[1], item[0])))
+
+
+def generate_manifest(file_path: str):
+    """
+    A function to generate the static bundles manifest module.
+    """
+    header = importlib.resources.files("archcraftsman.bundles").joinpath("__init__.py")
+    lines = [header.read_text(encoding="UTF-8").rstrip("\n"), ""]
+    lines.append('"""')
+    lines.append(
+        "The static bundles manifest module, mapping each bundle name to its 'module:class' path."
+    )
+    lines.append(
+        "Generated with 'python -m archcraftsman.bundles.utils', do not edit manually."
+    )
+    lines.append('"""')
+    lines.append("")
+    lines.append("BUNDLES: dict[str, str] = {")
+    for name, target in scan_manifest().items():
+        lines.append(f'    "{name}": "{target}",')
+    lines.append("}")
+    with open(file_path, "w", encoding="UTF-8") as manifest_file:
+        manifest_file.write("\n".join(lines) + "\n")
+
+
+@functools.cache
+def bundles_manifest() -> dict[str, str]:
+    """
+    A function to get the bundles shipped with ArchCraftsman, from the static manifest.
+    """
+    try:
+        return dict(importlib.import_module(MANIFEST_MODULE).BUNDLES)
+    except ImportError:
+        return scan_manifest()
+
+
+@functools.cache
+def entry_points_manifest() -> dict[str, str]:
+    """
+    A function to get the third-party bundles from their entry points, only read when a name is missing from the static manifest.
+    """
+    return {
+        entry_point.name: entry_point.value
+        for entry_point in importlib.metadata.entry_points(group=ENTRY_POINTS_GROUP)
+    }
+
+
+_BUNDLES_MAP: dict[str, type[archcraftsman.bundles.bundle.Bundle]] = {}
 
 
 def get_opt_bundle_type_by_name(
@@ -63,8 +129,17 @@ def get_opt_bundle_type_by_name(
 ) -> typing.Optional[type[archcraftsman.bundles.bundle.Bundle]]:
     """
     A function to get the bundle type by its name.
-    """
-    return _BUNDLES_MAP[name] if name in _BUNDLES_MAP else None
+    The bundle module is only imported on the first lookup.
+    """
+    if name in _BUNDLES_MAP:
+        return _BUNDLES_MAP[name]
+    target = bundles_manifest().get(name) or entry_points_manifest().get(name)
+    if target is None:
+        return None
+    module_name, _, class_name = target.partition(":")
+    bundle_type = getattr(importlib.import_module(module_name), class_name)
+    _BUNDLES_MAP[name] = bundle_type
+    return bundle_type
 
 
 def get_bundle_type_by_name(name: str) -> type[archcraftsman.bundles.bundle.Bundle]:
@@ -82,9 +157,9 @@ def list_simple_bundles() -> list[type[archcraftsman.bundles.bundle.Bundle]]:
     List all available simple bundles.
     """
     return [
-        bundle_type
-        for bundle_type in _BUNDLES_MAP.values()
-        if "archcraftsman.bundles.simple" in str(bundle_type)
+        get_bundle_type_by_name(name)
+        for name, target in bundles_manifest().items()
+        if target.startswith(f"{SIMPLE_BUNDLES_PACKAGE}.")
     ]
 
 
@@ -92,13 +167,21 @@ def list_generic_bundles() -> list[str]:
     """
     List all available generic bundles.
     """
-    return list(
-        resource.name.replace(".toml", "")
-        for resource in importlib.resources.files(
-            "archcraftsman.bundles.generic"
-        ).iterdir()
-        if resource.is_file() and resource.name.endswith(".toml")
-    )
+    return list(archcraftsman.bundles.genericcatalog.catalog())
+
+
+def bundles_packages(
+    bundles: typing.Iterable[archcraftsman.bundles.bundle.Bundle],
+) -> set[str]:
+    """
+    Get all the repositories packages of the given bundles, AUR based bundles excluded.
+    """
+    return {
+        package
+        for bundle in bundles
+        if bundle is not None and not bundle.is_aur()
+        for package in bundle.packages()
+    }
 
 
 def process_bundle(
@@ -142,3 +225,13 @@ def prompt_bundle(
     bundle = process_bundle(option)
     bundle.prompt_extra()
     return bundle
+
+
+if __name__ == "__main__":
+    generate_manifest(
+        sys.argv[1]
+        if len(sys.argv) > 1
+        else str(
+            importlib.resources.files("archcraftsman.bundles").joinpath("manifest.py")
+        )
+    )
@@ -18,6 +18,7 @@
 The xfce bundle module
 """
 
+import archcraftsman.arguments
 import archcraftsman.base
 import archcraftsman.bundles.bundle
 import archcraftsman.i18n
@@ -33,8 +34,10 @@ class Xfce(archcraftsman.bundles.bundle.Bundle):
     Bundle class.
     """
 
+    NAME = archcraftsman.options.Desktops.XFCE
+
     def __init__(self):
-        super().__init__(archcraftsman.options.Desktops.XFCE)
+        super().__init__()
         self.display_manager = True
         self.minimal = False
 
@@ -82,6 +85,6 @@ class Xfce(archcraftsman.bundles.bundle.Bundle):
         if self.display_manager:
             archcraftsman.base.execute("systemctl enable lightdm", chroot=True)
         archcraftsman.base.execute(
-            'sed -i "s|#logind-check-graphical=false|logind-check-graphical=true|g" /mnt/etc/lightdm/lightdm.conf'
+            f'sed -i "s|#logind-check-graphical=false|logind-check-graphical=true|g" {archcraftsman.arguments.target_root()}/etc/lightdm/lightdm.conf'
         )
         archcraftsman.info.ai.pre_launch_info.setup_chroot_keyboard()
@@ -0,0 +1,117 @@
+# ArchCraftsman, The careful yet very fast Arch Linux Craftsman.
+# Copyright (C) 2023 Rawleenc
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+The completion module, a readline completion engine over pre-sorted candidates.
+"""
+import bisect
+import glob
+import os
+import typing
+
+# Greater than any character, to find the end of a prefix range.
+_PREFIX_END = "\U0010ffff"
+
+
+class Candidates:
+    """
+    Completion candidates, sorted once with their case-insensitive keys precomputed if needed.
+    """
+
+    def __init__(self, candidates: typing.Iterable[str], ignore_case: bool = False):
+        self.ignore_case = ignore_case
+        pairs = sorted(
+            {(self.key(candidate), candidate) for candidate in candidates if candidate}
+        )
+        self.keys: tuple[str, ...] = tuple(key for key, _ in pairs)
+        self.values: tuple[str, ...] = tuple(value for _, value in pairs)
+
+    def key(self, text: str) -> str:
+        """
+        The sort and search key of a text.
+        """
+        return text.lower() if self.ignore_case else text
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def matches(self, prefix: str) -> tuple[str, ...]:
+        """
+        Get the candidates starting with a prefix.
+        """
+        if not prefix:
+            return self.values
+        key = self.key(prefix)
+        start = bisect.bisect_left(self.keys, key)
+        end = bisect.bisect_left(self.keys, key + _PREFIX_END, start)
+        return self.values[start:end]
+
+
+class Completer:
+    """
+    A readline completer over candidate sets, keeping the matches of the completed text across states.
+    """
+
+    # Whether to compute the matches again on each completion request, even for the same text.
+    refresh = False
+
+    def __init__(self, *candidates: Candidates, complete_empty: bool = True):
+        self.candidates = candidates
+        self.complete_empty = complete_empty
+        self._text: typing.Optional[str] = None
+        self._matches: tuple[str, ...] = ()
+
+    def matches(self, text: str) -> tuple[str, ...]:
+        """
+        Get all the matches of a text.
+        """
+        if not text and not self.complete_empty:
+            return ()
+        matches: tuple[str, ...] = ()
+        for candidates in self.candidates:
+            matches += candidates.matches(text)
+        return matches
+
+    def __call__(self, text: str, state: int) -> typing.Optional[str]:
+        if text != self._text or (self.refresh and state == 0):
+            self._text = text
+            self._matches = self.matches(text)
+        return self._matches[state] if state < len(self._matches) else None
+
+
+class GlobCompleter(Completer):
+    """
+    A readline completer of file paths, globbing the file system once per completion request.
+    """
+
+    refresh = True
+
+    def matches(self, text: str) -> tuple[str, ...]:
+        return tuple(
+            path + "/" if os.path.isdir(path) else path
+            for path in glob.glob(text + "*")
+        )
+
+
+def completer(
+    candidates: typing.Iterable[str],
+    ignore_case: bool = False,
+    complete_empty: bool = True,
+) -> Completer:
+    """
+    Build a completer over a single set of candidates.
+    """
+    return Completer(Candidates(candidates, ignore_case), complete_empty=complete_empty)
@@ -26,12 +26,19 @@ import sys
 import archcraftsman.arguments
 import archcraftsman.base
 import archcraftsman.bundles.bundle
+import archcraftsman.bundles.genericcatalog
+import archcraftsman.bundles.genericbundle
 import archcraftsman.bundles.utils
+import archcraftsman.i18n
 import archcraftsman.info
+import archcraftsman.packages
 import archcraftsman.partition
 import archcraftsman.partitioninginfo
 import archcraftsman.prelaunchinfo
 import archcraftsman.systeminfo
+import archcraftsman.timezones
+
+_ = archcraftsman.i18n.translate
 
 
 def serialize():
@@ -48,9 +55,9 @@ def serialize():
     )
     file_name = f"{archcraftsman.info.ai.system_info.hostname}.json"
     file_path = (
-        f"/mnt/home/{archcraftsman.info.ai.system_info.user_name}/{archcraftsman.info.ai.system_info.hostname}.json"
+        f"{archcraftsman.arguments.target_root()}/home/{archcraftsman.info.ai.system_info.user_name}/{archcraftsman.info.ai.system_info.hostname}.json"
         if archcraftsman.info.ai.system_info.user_name
-        else f"/mnt/root/{archcraftsman.info.ai.system_info.hostname}.json"
+        else f"{archcraftsman.arguments.target_root()}/root/{archcraftsman.info.ai.system_info.hostname}.json"
     )
     file_path = (
         file_path
@@ -60,7 +67,7 @@ def serialize():
     if os.path.exists(file_path):
         os.remove(file_path)
     else:
-        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        os.makedirs(os.path.dirname(file_path) or ".", exist_ok=True)
     with open(file_path, "w", encoding="UTF-8") as file:
         file.write(json_str)
     with open(file_name, "w", encoding="UTF-8") as file:
@@ -68,7 +75,7 @@ def serialize():
     if archcraftsman.info.ai.system_info.user_name:
         archcraftsman.base.execute(
             f"chown {archcraftsman.info.ai.system_info.user_name}:"
-            f"{archcraftsman.info.ai.system_info.user_name} {file_path.replace('/mnt', '')}",
+            f"{archcraftsman.info.ai.system_info.user_name} {file_path.removeprefix(archcraftsman.arguments.target_root())}",
             chroot=True,
         )
 
@@ -90,7 +97,12 @@ def dict_to_bundle(dict_obj) -> archcraftsman.bundles.bundle.Bundle:
     """
     Convert a dict to a bundle object.
     """
-    bundle = archcraftsman.bundles.utils.get_bundle_type_by_name(dict_obj["name"])()
+    if dict_obj["name"] in archcraftsman.bundles.genericcatalog.catalog():
+        bundle: archcraftsman.bundles.bundle.Bundle = (
+            archcraftsman.bundles.genericbundle.GenericBundle(dict_obj["name"])
+        )
+    else:
+        bundle = archcraftsman.bundles.utils.get_bundle_type_by_name(dict_obj["name"])()
     for key, value in dict_obj.items():
         if hasattr(bundle, key):
             setattr(bundle, key, value)
@@ -176,3 +188,57 @@ def deserialize(file_path: str):
     for bundle in archcraftsman.info.ai.system_info.bundles:
         fake.system_info.bundles.append(type(bundle)())
     validate(data, fake)
+    timezone_file = archcraftsman.timezones.index().timezone_file(
+        archcraftsman.info.ai.system_info.timezone
+    )
+    if not timezone_file:
+        archcraftsman.base.print_error(
+            _("%s is not a valid timezone.")
+            % archcraftsman.info.ai.system_info.timezone,
+            do_pause=False,
+        )
+        sys.exit(1)
+    archcraftsman.info.ai.system_info.timezone = timezone_file
+
+
+def check(file_paths: list[str]) -> bool:
+    """
+    Check all the packages required by config files against the sync databases.
+    """
+    packages = archcraftsman.packages.Packages()
+    packages.warn_unreadable()
+    if not packages.packages:
+        archcraftsman.base.print_error(
+            _("No package database available, run 'pacman -Sy' first."),
+            do_pause=False,
+        )
+        return False
+    archcraftsman.base.print_step(_("Checking config files packages..."), clear=False)
+    all_ok = True
+    for file_path in file_paths:
+        try:
+            with open(file_path, "r", encoding="UTF-8") as file:
+                system_info = dict(json.loads(file.read())).get("system_info", {})
+            bundles = [
+                dict_to_bundle(bundle) for bundle in system_info.get("bundles", [])
+            ]
+        except (OSError, ValueError, KeyError) as exception:
+            archcraftsman.base.print_error(
+                _("%s can't be read: %s") % (file_path, exception), do_pause=False
+            )
+            all_ok = False
+            continue
+        missing_packages = packages.missing(
+            archcraftsman.bundles.utils.bundles_packages(bundles)
+            | set(system_info.get("more_pkgs", []))
+        )
+        if missing_packages:
+            archcraftsman.base.print_error(
+                _("%s requires unavailable packages: %s")
+                % (file_path, " ".join(missing_packages)),
+                do_pause=False,
+            )
+            all_ok = False
+        else:
+            archcraftsman.base.print_sub_step(_("%s: OK") % file_path)
+    return all_ok
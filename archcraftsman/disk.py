@@ -46,6 +46,7 @@ class Disk:
         detected_partitions = archcraftsman.base.execute(
             f'lsblk -nl "{path}" -o PATH,TYPE,PARTTYPENAME | grep part | grep -iE "linux|efi|swap"',
             force=True,
+            cache={archcraftsman.base.CACHE_BLOCK},
             check=False,
             capture_output=True,
         ).output
@@ -60,6 +61,7 @@ class Disk:
             archcraftsman.base.execute(
                 f'lsblk -b --output SIZE -n -d "{self.path}"',
                 force=True,
+                cache={archcraftsman.base.CACHE_BLOCK},
                 check=False,
                 capture_output=True,
             ).output
@@ -73,6 +75,7 @@ class Disk:
                     archcraftsman.base.execute(
                         f"lsblk {path} -o PATH,TYPE,PHY-SEC | grep disk | awk '{{print $3}}'",
                         force=True,
+                        cache={archcraftsman.base.CACHE_BLOCK},
                         capture_output=True,
                     ).output,
                 )
@@ -87,6 +90,7 @@ class Disk:
                     archcraftsman.base.execute(
                         f"fdisk -l | grep {last_partition_path} | awk '{{print $3}}'",
                         force=True,
+                        cache={archcraftsman.base.CACHE_BLOCK},
                         capture_output=True,
                         sudo=True,
                     ).output,
@@ -0,0 +1,228 @@
+# ArchCraftsman, The careful yet very fast Arch Linux Craftsman.
+# Copyright (C) 2023 Rawleenc
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+The install events module, emitting machine-readable events to a JSON lines file or a Unix domain socket.
+"""
+import atexit
+import json
+import os
+import socket
+import threading
+import time
+import typing
+
+import archcraftsman.base
+import archcraftsman.i18n
+import archcraftsman.progress
+
+_ = archcraftsman.i18n.translate
+
+UNIX_PREFIX = "unix:"
+
+
+def default_source() -> str:
+    """
+    The default name of this machine in the events, its hostname and the beginning of its machine id.
+    """
+    try:
+        with open("/etc/machine-id", "r", encoding="UTF-8") as machine_id_file:
+            machine_id = machine_id_file.read().strip()[:8]
+    except OSError:
+        machine_id = ""
+    return "-".join(filter(None, [socket.gethostname(), machine_id]))
+
+
+class EventStream:
+    """
+    A stream of JSON lines events, written to a file or sent to a Unix domain socket.
+    A stream whose target disappears is silently disabled, the installation goes on.
+    """
+
+    def __init__(self, target: str, source: str) -> None:
+        self.target = target
+        self.source = source
+        self._lock = threading.Lock()
+        self._socket: typing.Optional[socket.socket] = None
+        self._file: typing.Optional[typing.TextIO] = None
+        try:
+            if target.startswith(UNIX_PREFIX):
+                self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                self._socket.connect(target.removeprefix(UNIX_PREFIX))
+                self._file = self._socket.makefile("w", encoding="UTF-8")
+            else:
+                if os.path.dirname(target):
+                    os.makedirs(os.path.dirname(target), exist_ok=True)
+                self._file = open(  # pylint: disable=consider-using-with
+                    target, "a", encoding="UTF-8"
+                )
+        except OSError as exception:
+            self._close()
+            archcraftsman.base.print_warning(
+                _("Unable to emit the install events to %s: %s") % (target, exception),
+                do_pause=False,
+            )
+
+    def emit(self, event: str, **fields):
+        """
+        Emit an event.
+        """
+        line = json.dumps(
+            {"time": time.time(), "source": self.source, "event": event, **fields}
+        )
+        with self._lock:
+            if self._file is None:
+                return
+            try:
+                self._file.write(line + "\n")
+                self._file.flush()
+            except OSError:
+                self._close()
+
+    def close(self):
+        """
+        Close the stream.
+        """
+        with self._lock:
+            self._close()
+
+    def _close(self):
+        """
+        Close the stream, the lock being held.
+        """
+        for closeable in (self._file, self._socket):
+            if closeable:
+                try:
+                    closeable.close()
+                except OSError:
+                    pass
+        self._file = None
+        self._socket = None
+
+
+class InstallEvents:
+    """
+    The listener turning messages, executions and progress updates into install events.
+    """
+
+    def __init__(self, stream: EventStream) -> None:
+        self.stream = stream
+        self.phase = ""
+        self.phase_started = 0.0
+        self.finished = False
+        self._last_progress: tuple[str, str, int] = ("", "", -1)
+
+    def on_message(self, kind: str, message: str):
+        """
+        The message listener.
+        """
+        if kind == "step":
+            self.end_phase()
+            self.phase = message
+            self.phase_started = time.monotonic()
+            self.stream.emit("phase_start", phase=message)
+        elif kind == "command":
+            self.stream.emit("command_start", phase=self.phase, command=message)
+        elif kind in ("warning", "error"):
+            self.stream.emit(kind, phase=self.phase, message=message)
+
+    def on_execution(self, result: archcraftsman.base.ExecutionResult):
+        """
+        The execution listener.
+        """
+        self.stream.emit(
+            "command_end",
+            phase=self.phase,
+            command=result.plain_command,
+            returncode=result.returncode,
+            duration=result.duration,
+            chroot=result.chroot,
+            fake=result.fake,
+            cached=result.cached,
+        )
+
+    def on_progress(self, progress: archcraftsman.progress.TransactionProgress):
+        """
+        The progress listener, emitting only when the rounded percent or the phase changes.
+        """
+        state = (progress.description, progress.phase, int(progress.fraction() * 100))
+        if state == self._last_progress:
+            return
+        self._last_progress = state
+        self.stream.emit("progress", phase=self.phase, **progress.to_dict())
+
+    def end_phase(self):
+        """
+        Emit the end of the current phase, if any.
+        """
+        if self.phase:
+            self.stream.emit(
+                "phase_end",
+                phase=self.phase,
+                duration=time.monotonic() - self.phase_started,
+            )
+            self.phase = ""
+
+    def finish(self, status: str, **fields):
+        """
+        Emit the final status once.
+        """
+        if self.finished:
+            return
+        self.finished = True
+        self.end_phase()
+        self.stream.emit("status", status=status, **fields)
+
+
+_EVENTS: typing.Optional[InstallEvents] = None
+
+
+def start(target: str, source: str = "") -> InstallEvents:
+    """
+    Start emitting the install events to a JSON lines file or, prefixed with 'unix:', a Unix domain socket.
+    """
+    global _EVENTS
+    stop()
+    events = InstallEvents(EventStream(target, source or default_source()))
+    archcraftsman.base.add_message_listener(events.on_message)
+    archcraftsman.base.add_execution_listener(events.on_execution)
+    archcraftsman.progress.add_progress_listener(events.on_progress)
+    events.stream.emit("start", pid=os.getpid())
+    _EVENTS = events
+    atexit.register(finish, "exited")
+    return events
+
+
+def finish(status: str, **fields):
+    """
+    Emit the final status of the installation, if the events are enabled.
+    """
+    if _EVENTS:
+        _EVENTS.finish(status, **fields)
+
+
+def stop():
+    """
+    Stop emitting the install events.
+    """
+    global _EVENTS
+    if _EVENTS is None:
+        return
+    archcraftsman.base.remove_message_listener(_EVENTS.on_message)
+    archcraftsman.base.remove_execution_listener(_EVENTS.on_execution)
+    archcraftsman.progress.remove_progress_listener(_EVENTS.on_progress)
+    _EVENTS.stream.close()
+    _EVENTS = None
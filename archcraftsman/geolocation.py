@@ -0,0 +1,227 @@
+# ArchCraftsman, The careful yet very fast Arch Linux Craftsman.
+# Copyright (C) 2023 Rawleenc
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+The geolocation module, looking up the IP geolocation in the background with a local fallback.
+"""
+import json
+import os
+import re
+import threading
+import time
+import typing
+import urllib.request
+
+import archcraftsman.base
+import archcraftsman.timezones
+
+GEOIP_URL = "https://ipapi.co/json"
+TIMEOUT = 3.0
+CACHE_MAX_AGE = 24 * 3600
+VCONSOLE_FILE = "/etc/vconsole.conf"
+
+
+class Location:
+    """
+    The detected language, country code and timezone, and where they come from.
+    """
+
+    def __init__(
+        self,
+        language: str = "en-US",
+        country_code: str = "US",
+        timezone: str = "Etc/UTC",
+        source: str = "default",
+    ) -> None:
+        self.language = language
+        self.country_code = country_code
+        self.timezone = timezone
+        self.source = source
+
+    def to_dict(self) -> dict:
+        """
+        Convert the location to a serializable dict.
+        """
+        return {
+            "languages": self.language,
+            "country_code": self.country_code,
+            "timezone": self.timezone,
+        }
+
+    @staticmethod
+    def from_dict(data: dict, source: str) -> "Location":
+        """
+        Build a location from a geoip or cached dict.
+        """
+        return Location(
+            str(data["languages"]).split(",", maxsplit=1)[0],
+            str(data["country_code"]),
+            str(data["timezone"]),
+            source,
+        )
+
+
+def cache_file() -> str:
+    """
+    Get the geolocation cache file path.
+    """
+    cache_dir = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return os.path.join(cache_dir, "archcraftsman", "geoip.json")
+
+
+def read_cache(max_age: float = CACHE_MAX_AGE) -> typing.Optional[Location]:
+    """
+    Read the cached geolocation, if it is recent enough.
+    """
+    try:
+        if time.time() - os.path.getmtime(cache_file()) > max_age:
+            return None
+        with open(cache_file(), "r", encoding="UTF-8") as file:
+            return Location.from_dict(json.load(file), "cache")
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def write_cache(location: Location):
+    """
+    Cache a fetched geolocation.
+    """
+    try:
+        os.makedirs(os.path.dirname(cache_file()), exist_ok=True)
+        with open(cache_file(), "w", encoding="UTF-8") as file:
+            json.dump(location.to_dict(), file)
+    except OSError as exception:
+        archcraftsman.base.log(f"Unable to cache the geolocation: {exception}")
+
+
+def fetch(timeout: float) -> typing.Optional[Location]:
+    """
+    Fetch the IP geolocation.
+    """
+    try:
+        with urllib.request.urlopen(GEOIP_URL, timeout=timeout) as response:
+            return Location.from_dict(json.loads(response.read()), "geoip")
+    except (OSError, ValueError, KeyError) as exception:
+        archcraftsman.base.log(f"IP geolocation failed: {exception}")
+        return None
+
+
+def live_timezone() -> typing.Optional[str]:
+    """
+    Get the timezone of the live system, from TZ or the /etc/localtime link.
+    """
+    timezone = os.environ.get("TZ", "").lstrip(":")
+    if not timezone:
+        try:
+            target = os.path.realpath("/etc/localtime")
+        except OSError:
+            return None
+        if not target.startswith(archcraftsman.timezones.ZONEINFO + "/"):
+            return None
+        timezone = os.path.relpath(target, archcraftsman.timezones.ZONEINFO)
+    return timezone or None
+
+
+def keymap_country() -> typing.Optional[str]:
+    """
+    Get the country code of the live console keymap.
+    """
+    try:
+        with open(VCONSOLE_FILE, "r", encoding="UTF-8") as file:
+            match = re.search(r"^KEYMAP=\"?([a-z]{2})\b", file.read(), re.MULTILINE)
+    except OSError:
+        return None
+    return match.group(1).upper() if match else None
+
+
+def local_location() -> Location:
+    """
+    Guess the location from the live system, its timezone, the zoneinfo country tables and its keymap.
+    A live system left in UTC gets the main timezone of the guessed country.
+    """
+    location = Location(source="local")
+    language = os.environ.get("LANG", "").split(".", maxsplit=1)[0]
+    if re.fullmatch(r"[a-z]{2}_[A-Z]{2}", language):
+        location.language = language.replace("_", "-")
+    timezones = archcraftsman.timezones.index()
+    timezone = live_timezone()
+    if timezone in archcraftsman.timezones.EXTRA_ZONES:
+        timezone = None
+    country_code = (
+        (timezones.country_of(timezone) if timezone else None)
+        or keymap_country()
+        or (location.language.split("-")[1] if "-" in location.language else None)
+    )
+    if country_code:
+        location.country_code = country_code
+        timezone = timezone or timezones.for_country(country_code)
+    if timezone:
+        location.timezone = timezone
+    return location
+
+
+class Lookup:
+    """
+    The background IP geolocation lookup, answered from the cache when recent enough.
+    """
+
+    def __init__(self, timeout: typing.Optional[float] = None) -> None:
+        self.timeout = TIMEOUT if timeout is None else timeout
+        self.deadline = time.monotonic() + self.timeout
+        self.location: typing.Optional[Location] = read_cache()
+        self._done = threading.Event()
+        if self.location is not None:
+            self._done.set()
+        else:
+            threading.Thread(target=self._run, name="geolocation", daemon=True).start()
+
+    def _run(self):
+        self.location = fetch(self.timeout)
+        if self.location is not None:
+            write_cache(self.location)
+        self._done.set()
+
+    def result(self, wait: bool = True) -> typing.Optional[Location]:
+        """
+        Get the looked up location, waiting for it until the deadline, None if not arrived in time.
+        """
+        if wait:
+            self._done.wait(max(0.0, self.deadline - time.monotonic()))
+        return self.location if self._done.is_set() else None
+
+
+_LOOKUP: typing.Optional[Lookup] = None
+_LOOKUP_LOCK = threading.Lock()
+
+
+def start_lookup(timeout: typing.Optional[float] = None) -> Lookup:
+    """
+    Start the shared background lookup, if not already started.
+    """
+    global _LOOKUP
+    with _LOOKUP_LOCK:
+        if _LOOKUP is None:
+            _LOOKUP = Lookup(timeout)
+        return _LOOKUP
+
+
+def reset():
+    """
+    Forget the shared background lookup.
+    """
+    global _LOOKUP
+    with _LOOKUP_LOCK:
+        _LOOKUP = None
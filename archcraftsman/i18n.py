@@ -17,12 +17,94 @@
 """
 The I18n management singleton module
 """
+import ast
 import gettext
+import importlib.resources
+import io
+import struct
+import typing
 
 import archcraftsman.options
 
 _I18N_METHOD = gettext.gettext
 
+LOCALES_PACKAGE = "archcraftsman.locales"
+
+
+def parse_po(text: str) -> dict[str, str]:
+    """
+    Parse the translated messages of a PO file, fuzzy ones excepted.
+    """
+    messages: dict[str, str] = {}
+    entry: dict[str, str] = {}
+    section = ""
+    fuzzy = False
+
+    def flush():
+        nonlocal entry, fuzzy
+        if "msgid" in entry and entry.get("msgstr"):
+            if not fuzzy or not entry["msgid"]:
+                messages[entry["msgid"]] = entry["msgstr"]
+        entry = {}
+        fuzzy = False
+
+    for line in text.splitlines():
+        line = line.strip()
+        if line.startswith("#,") and "fuzzy" in line:
+            flush()
+            fuzzy = True
+        elif line.startswith("msgid "):
+            if "msgid" in entry:
+                flush()
+            section = "msgid"
+            entry[section] = ast.literal_eval(line[6:])
+        elif line.startswith("msgstr "):
+            section = "msgstr"
+            entry[section] = ast.literal_eval(line[7:])
+        elif line.startswith('"') and section in entry:
+            entry[section] += ast.literal_eval(line)
+    flush()
+    return messages
+
+
+def compile_po(text: str) -> bytes:
+    """
+    Compile a PO file to a GNU MO catalog, like msgfmt does.
+    """
+    messages = sorted(
+        (msgid.encode("UTF-8"), msgstr.encode("UTF-8"))
+        for msgid, msgstr in parse_po(text).items()
+    )
+    count = len(messages)
+    strings_offset = 28 + 16 * count
+    ids = b""
+    strs = b""
+    id_table: list[int] = []
+    str_table: list[int] = []
+    for msgid, msgstr in messages:
+        id_table += [len(msgid), strings_offset + len(ids)]
+        ids += msgid + b"\0"
+    for msgid, msgstr in messages:
+        str_table += [len(msgstr), strings_offset + len(ids) + len(strs)]
+        strs += msgstr + b"\0"
+    return (
+        struct.pack("Iiiiiii", 0x950412DE, 0, count, 28, 28 + 8 * count, 0, 0)
+        + struct.pack(f"{len(id_table)}i", *id_table)
+        + struct.pack(f"{len(str_table)}i", *str_table)
+        + ids
+        + strs
+    )
+
+
+def compiled_catalog(global_language: str) -> typing.Optional[bytes]:
+    """
+    Get the precompiled MO catalog of a language shipped within the package, if any.
+    """
+    resource = importlib.resources.files(LOCALES_PACKAGE).joinpath(
+        f"{global_language}.mo"
+    )
+    return resource.read_bytes() if resource.is_file() else None
+
 
 def update_method(global_language: str):
     """
@@ -30,11 +112,17 @@ def update_method(global_language: str):
     """
 
     if global_language != archcraftsman.options.Languages.ENGLISH:
-        translation = gettext.translation(
-            "archcraftsman",
-            localedir="/usr/share/locale",
-            languages=[global_language],
-        )
+        catalog = compiled_catalog(global_language)
+        translation: gettext.NullTranslations
+        if catalog is not None:
+            translation = gettext.GNUTranslations(io.BytesIO(catalog))
+        else:
+            translation = gettext.translation(
+                "archcraftsman",
+                localedir="/usr/share/locale",
+                languages=[global_language],
+                fallback=True,
+            )
         translation.install()
         global _I18N_METHOD
         _I18N_METHOD = translation.gettext
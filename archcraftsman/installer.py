@@ -18,9 +18,12 @@
 The ArchCraftsman installer.
 """
 import argparse
+import copy
+import os
 import readline
 import subprocess
 import sys
+import typing
 
 import archcraftsman.arguments
 import archcraftsman.autopart
@@ -28,21 +31,34 @@ import archcraftsman.base
 import archcraftsman.basesetup
 import archcraftsman.btrfs
 import archcraftsman.config
+import archcraftsman.events
+import archcraftsman.geolocation
 import archcraftsman.i18n
 import archcraftsman.info
 import archcraftsman.manualpart
 import archcraftsman.options
+import archcraftsman.pipeline
+import archcraftsman.progress
+import archcraftsman.profiler
+import archcraftsman.recorder
 import archcraftsman.shell
+import archcraftsman.targets
+import archcraftsman.terminal
 import archcraftsman.utils
 
 _ = archcraftsman.i18n.translate
 
+PIPELINE_LOG = "/tmp/archcraftsman-pipeline.log"
+PACKAGE_CACHE = "/var/cache/pacman/pkg"
+SYNC_DATABASES = "/var/lib/pacman/sync"
+BASE_PACKAGES = ["base", "base-devel", "linux-firmware"]
 
-def update_mirrorlist():
+
+def update_mirrorlist(interactive: bool = True):
     """
     Update the mirrorlist.
     """
-    config: bool = bool(archcraftsman.arguments.config())
+    config: bool = bool(archcraftsman.arguments.config()) or not interactive
     user_answer = False
     manual_change = False
     while not user_answer:
@@ -72,20 +88,134 @@ def create_basic_swapfile():
     """
     Create a basic swapfile.
     """
-    archcraftsman.base.execute("mkdir -p /mnt/swap")
+    archcraftsman.base.execute(f"mkdir -p {archcraftsman.arguments.target_root()}/swap")
+    archcraftsman.base.execute(
+        f'fallocate -l "{archcraftsman.info.ai.partitioning_info.swapfile_size}" {archcraftsman.arguments.target_root()}/swap/swapfile'
+    )
     archcraftsman.base.execute(
-        f'fallocate -l "{archcraftsman.info.ai.partitioning_info.swapfile_size}" /mnt/swap/swapfile'
+        f"chmod 600 {archcraftsman.arguments.target_root()}/swap/swapfile"
     )
-    archcraftsman.base.execute("chmod 600 /mnt/swap/swapfile")
-    archcraftsman.base.execute("mkswap /mnt/swap/swapfile")
+    archcraftsman.base.execute(
+        f"mkswap {archcraftsman.arguments.target_root()}/swap/swapfile"
+    )
+
+
+def install_base(base_pkgs: set[str]):
+    """
+    Install the base packages on the target.
+    """
+    archcraftsman.base.print_step(_("Installation of the base..."), clear=False)
+    # -c uses the live environment package cache, shared with the other installations.
+    options = "-Kc" if archcraftsman.arguments.shared_cache() else "-K"
+    archcraftsman.progress.execute_transaction(
+        f'pacstrap {options} {archcraftsman.arguments.target_root()} {" ".join(sorted(base_pkgs))}',
+        _("Base"),
+    )
+
+
+def mount_package_cache():
+    """
+    Mount the live environment package cache on the target, to share the downloaded packages with the other targets.
+    """
+    archcraftsman.base.execute(
+        f"mount --mkdir --bind {PACKAGE_CACHE} {archcraftsman.arguments.target_root()}{PACKAGE_CACHE}"
+    )
+
+
+def copy_sync_databases():
+    """
+    Copy the live environment sync databases to the target, so it installs the very packages downloaded by the parent installation.
+    """
+    archcraftsman.base.execute(
+        f"cp {SYNC_DATABASES}/*.db {archcraftsman.arguments.target_root()}{SYNC_DATABASES}/"
+    )
+
+
+def start_base_installation(
+    base_pkgs: set[str],
+) -> archcraftsman.pipeline.StepScheduler:
+    """
+    Start the partitions formatting, the mirrors ranking and the base installation in the background.
+    With encrypted partitions, the formatting runs in the foreground since cryptsetup asks for their passphrase.
+    """
+    partitioning_info = archcraftsman.info.ai.partitioning_info
+    encrypted = any(partition.encrypted for partition in partitioning_info.partitions)
+    if encrypted:
+        partitioning_info.format_and_mount_partitions()
+    scheduler = archcraftsman.pipeline.StepScheduler(PIPELINE_LOG)
+    if not encrypted:
+        scheduler.submit("format", partitioning_info.format_and_mount_partitions)
+    scheduler.submit("mirrors", lambda: update_mirrorlist(interactive=False))
+    scheduler.submit("base", lambda: install_base(base_pkgs))
+    return scheduler
+
+
+def system_packages() -> set[str]:
+    """
+    The packages to install on top of the base and the kernel.
+    """
+    pkgs = set()
+    pkgs.update(
+        [
+            "man-db",
+            "man-pages",
+            "texinfo",
+            "nano",
+            "vim",
+            "git",
+            "curl",
+            "os-prober",
+            "efibootmgr",
+            "xdg-user-dirs",
+            "reflector",
+            "numlockx",
+            "net-tools",
+            "polkit",
+            "pacman-contrib",
+        ]
+    )
+
+    if archcraftsman.info.ai.pre_launch_info.global_language.lower() != "en" and archcraftsman.base.execute(
+        f"pacman -Si man-pages-{archcraftsman.info.ai.pre_launch_info.global_language.lower()} &>/dev/null",
+        check=False,
+    ):
+        pkgs.add(
+            f"man-pages-{archcraftsman.info.ai.pre_launch_info.global_language.lower()}"
+        )
+
+    if (
+        archcraftsman.info.ai.partitioning_info.filesystem_in_use()
+        == archcraftsman.options.FSFormats.BTRFS
+    ):
+        pkgs.update(archcraftsman.btrfs.get_packages())
+
+    if (
+        archcraftsman.info.ai.partitioning_info.root_partition().part_format_type
+        == archcraftsman.options.FSFormats.BTRFS
+    ):
+        pkgs.update(archcraftsman.btrfs.get_management_packages())
+
+    for bundle in archcraftsman.info.ai.system_info.bundles:
+        pkgs.update(bundle.packages())
+
+    if len(archcraftsman.info.ai.system_info.more_pkgs) > 0:
+        pkgs.update(archcraftsman.info.ai.system_info.more_pkgs)
+
+    return pkgs
 
 
 def install():
     """
     The main installation method.
+    In pipelined mode, the partitioning is asked first, then the partitions formatting,
+    the mirrors ranking and the base installation run in the background while the system setup is asked.
     """
+    scheduler: typing.Optional[archcraftsman.pipeline.StepScheduler] = None
     try:
-        if not archcraftsman.arguments.config():
+        pipelined = (
+            archcraftsman.arguments.pipelined() and not archcraftsman.arguments.config()
+        )
+        if not archcraftsman.arguments.config() and not pipelined:
             archcraftsman.basesetup.setup_system()
 
         partitioning_info_ok: bool = bool(archcraftsman.arguments.config())
@@ -99,101 +229,81 @@ def install():
             else:
                 partitioning_info_ok = archcraftsman.manualpart.manual_partitioning()
 
-        archcraftsman.info.ai.partitioning_info.format_and_mount_partitions()
-
-        update_mirrorlist()
-
         base_pkgs = set()
-        base_pkgs.update(["base", "base-devel", "linux-firmware"])
-
-        base_pkgs.update(archcraftsman.info.ai.system_info.kernel().packages())
+        base_pkgs.update(BASE_PACKAGES)
 
         pkgs = set()
-        pkgs.update(
-            [
-                "man-db",
-                "man-pages",
-                "texinfo",
-                "nano",
-                "vim",
-                "git",
-                "curl",
-                "os-prober",
-                "efibootmgr",
-                "xdg-user-dirs",
-                "reflector",
-                "numlockx",
-                "net-tools",
-                "polkit",
-                "pacman-contrib",
-            ]
-        )
-
-        if archcraftsman.info.ai.pre_launch_info.global_language.lower() != "en" and archcraftsman.base.execute(
-            f"pacman -Si man-pages-{archcraftsman.info.ai.pre_launch_info.global_language.lower()} &>/dev/null",
-            check=False,
-        ):
-            pkgs.add(
-                f"man-pages-{archcraftsman.info.ai.pre_launch_info.global_language.lower()}"
+        if pipelined:
+            scheduler = start_base_installation(base_pkgs)
+            archcraftsman.base.print_sub_step(
+                _("The installation of the base started, its output goes to %s.")
+                % PIPELINE_LOG
             )
-
-        if (
-            archcraftsman.info.ai.partitioning_info.filesystem_in_use()
-            == archcraftsman.options.FSFormats.BTRFS
-        ):
-            pkgs.update(archcraftsman.btrfs.get_packages())
-
-        if (
-            archcraftsman.info.ai.partitioning_info.root_partition().part_format_type
-            == archcraftsman.options.FSFormats.BTRFS
-        ):
-            pkgs.update(archcraftsman.btrfs.get_management_packages())
-
-        for bundle in archcraftsman.info.ai.system_info.bundles:
-            pkgs.update(bundle.packages())
-
-        if len(archcraftsman.info.ai.system_info.more_pkgs) > 0:
-            pkgs.update(archcraftsman.info.ai.system_info.more_pkgs)
-
-        archcraftsman.base.print_step(_("Installation of the base..."), clear=False)
-        archcraftsman.base.execute(f'pacstrap -K /mnt {" ".join(base_pkgs)}')
+            archcraftsman.base.pause()
+            archcraftsman.basesetup.setup_system(scheduler)
+            archcraftsman.base.print_step(
+                _("Waiting for the installation of the base..."), clear=False
+            )
+            scheduler.wait()
+            # The kernel is only known now, it is installed with the other packages.
+            pkgs.update(archcraftsman.info.ai.system_info.kernel().packages())
+        else:
+            archcraftsman.info.ai.partitioning_info.format_and_mount_partitions()
+            if not archcraftsman.arguments.shared_cache():
+                update_mirrorlist()
+            base_pkgs.update(archcraftsman.info.ai.system_info.kernel().packages())
+            install_base(base_pkgs)
+        pkgs.update(system_packages())
 
         archcraftsman.base.print_step(_("System configuration..."), clear=False)
         archcraftsman.base.execute(
-            'sed -i "s|#en_US.UTF-8 UTF-8|en_US.UTF-8 UTF-8|g" /mnt/etc/locale.gen'
+            f'sed -i "s|#en_US.UTF-8 UTF-8|en_US.UTF-8 UTF-8|g" {archcraftsman.arguments.target_root()}/etc/locale.gen'
         )
         archcraftsman.base.execute(
-            'sed -i "s|#en_US ISO-8859-1|en_US ISO-8859-1|g" /mnt/etc/locale.gen'
+            f'sed -i "s|#en_US ISO-8859-1|en_US ISO-8859-1|g" {archcraftsman.arguments.target_root()}/etc/locale.gen'
         )
         if (
             archcraftsman.info.ai.pre_launch_info.global_language
             == archcraftsman.options.Languages.FRENCH
         ):
             archcraftsman.base.execute(
-                'sed -i "s|#fr_FR.UTF-8 UTF-8|fr_FR.UTF-8 UTF-8|g" /mnt/etc/locale.gen'
+                f'sed -i "s|#fr_FR.UTF-8 UTF-8|fr_FR.UTF-8 UTF-8|g" {archcraftsman.arguments.target_root()}/etc/locale.gen'
+            )
+            archcraftsman.base.execute(
+                f'sed -i "s|#fr_FR ISO-8859-1|fr_FR ISO-8859-1|g" {archcraftsman.arguments.target_root()}/etc/locale.gen'
             )
             archcraftsman.base.execute(
-                'sed -i "s|#fr_FR ISO-8859-1|fr_FR ISO-8859-1|g" /mnt/etc/locale.gen'
+                f'echo "LANG=fr_FR.UTF-8" >{archcraftsman.arguments.target_root()}/etc/locale.conf'
             )
-            archcraftsman.base.execute('echo "LANG=fr_FR.UTF-8" >/mnt/etc/locale.conf')
         else:
-            archcraftsman.base.execute('echo "LANG=en_US.UTF-8" >/mnt/etc/locale.conf')
+            archcraftsman.base.execute(
+                f'echo "LANG=en_US.UTF-8" >{archcraftsman.arguments.target_root()}/etc/locale.conf'
+            )
         archcraftsman.base.execute(
-            f'echo "KEYMAP={archcraftsman.info.ai.pre_launch_info.keymap}" >/mnt/etc/vconsole.conf'
+            f'echo "KEYMAP={archcraftsman.info.ai.pre_launch_info.keymap}" >{archcraftsman.arguments.target_root()}/etc/vconsole.conf'
         )
         _hostname = archcraftsman.info.ai.system_info.hostname
-        archcraftsman.base.execute(f'echo "{_hostname}" >/mnt/etc/hostname')
+        archcraftsman.base.execute(
+            f'echo "{_hostname}" >{archcraftsman.arguments.target_root()}/etc/hostname'
+        )
 
         hosts_file_content = [
             "127.0.0.1 localhost\n",
             "::1 localhost\n",
             f"127.0.1.1 {_hostname}.localdomain {_hostname}",
         ]
-        with open("/mnt/etc/hosts", "w", encoding="UTF-8") as hosts_file:
-            hosts_file.writelines(hosts_file_content)
+        try:
+            with open(
+                f"{archcraftsman.arguments.target_root()}/etc/hosts",
+                "w",
+                encoding="UTF-8",
+            ) as hosts_file:
+                hosts_file.writelines(hosts_file_content)
+        except FileNotFoundError as exception:
+            archcraftsman.base.log(f"Exception: {exception}")
 
         archcraftsman.base.execute(
-            "cp /etc/pacman.d/mirrorlist /mnt/etc/pacman.d/mirrorlist"
+            f"cp /etc/pacman.d/mirrorlist {archcraftsman.arguments.target_root()}/etc/pacman.d/mirrorlist"
         )
 
         archcraftsman.base.print_step(_("Locales configuration..."), clear=False)
@@ -206,16 +316,27 @@ def install():
         archcraftsman.base.print_step(
             _("Installation of the remaining packages..."), clear=False
         )
-        archcraftsman.base.execute('sed -i "s|#Color|Color|g" /mnt/etc/pacman.conf')
+        if archcraftsman.arguments.shared_cache():
+            mount_package_cache()
+            copy_sync_databases()
         archcraftsman.base.execute(
-            'sed -i "s|#ParallelDownloads = 5|ParallelDownloads = 5\\nDisableDownloadTimeout|g" /mnt/etc/pacman.conf'
+            f'sed -i "s|#Color|Color|g" {archcraftsman.arguments.target_root()}/etc/pacman.conf'
         )
         archcraftsman.base.execute(
-            "pacman --noconfirm -Sy archlinux-keyring", chroot=True
+            f'sed -i "s|#ParallelDownloads = 5|ParallelDownloads = 5\\nDisableDownloadTimeout|g" {archcraftsman.arguments.target_root()}/etc/pacman.conf'
         )
-        archcraftsman.base.execute("pacman --noconfirm -Su", chroot=True)
-        archcraftsman.base.execute(
-            f'pacman --noconfirm -S {" ".join(pkgs)}', chroot=True
+        # With a shared cache, the databases must stay the ones the packages were downloaded with.
+        if not archcraftsman.arguments.shared_cache():
+            archcraftsman.progress.execute_transaction(
+                "pacman --noconfirm -Sy archlinux-keyring", _("Keyring"), chroot=True
+            )
+            archcraftsman.progress.execute_transaction(
+                "pacman --noconfirm -Su", _("Upgrade"), chroot=True
+            )
+        archcraftsman.progress.execute_transaction(
+            f'pacman --noconfirm -S {" ".join(sorted(pkgs))}',
+            _("Packages"),
+            chroot=True,
         )
 
         if (
@@ -238,7 +359,9 @@ def install():
                 )
             else:
                 create_basic_swapfile()
-            archcraftsman.base.execute("swapon /mnt/swap/swapfile")
+            archcraftsman.base.execute(
+                f"swapon {archcraftsman.arguments.target_root()}/swap/swapfile"
+            )
 
         if (
             archcraftsman.info.ai.system_info.desktop().name
@@ -270,7 +393,7 @@ def install():
                 % archcraftsman.info.ai.system_info.user_name
             )
             archcraftsman.base.execute(
-                'sed -i "s|# %wheel ALL=(ALL:ALL) ALL|%wheel ALL=(ALL:ALL) ALL|g" /mnt/etc/sudoers'
+                f'sed -i "s|# %wheel ALL=(ALL:ALL) ALL|%wheel ALL=(ALL:ALL) ALL|g" {archcraftsman.arguments.target_root()}/etc/sudoers'
             )
             archcraftsman.base.execute(
                 f"useradd --shell=/bin/bash --groups=wheel "
@@ -291,7 +414,9 @@ def install():
                 )
 
         archcraftsman.base.print_step(_("Generating fstab..."), clear=False)
-        archcraftsman.base.execute("genfstab -U /mnt >>/mnt/etc/fstab")
+        archcraftsman.base.execute(
+            f"genfstab -U {archcraftsman.arguments.target_root()} >>{archcraftsman.arguments.target_root()}/etc/fstab"
+        )
 
         archcraftsman.base.print_step(
             _("Extra packages configuration if needed..."), clear=False
@@ -305,11 +430,15 @@ def install():
         archcraftsman.base.print_success(
             _("Installation complete ! You can reboot your system."), do_pause=False
         )
+        archcraftsman.events.finish("success")
 
     except KeyboardInterrupt:
         archcraftsman.base.print_error(
             _("Script execution interrupted by the user !"), do_pause=False
         )
+        archcraftsman.events.finish("interrupted")
+        if scheduler is not None:
+            scheduler.stop()
         archcraftsman.config.serialize()
         archcraftsman.info.ai.partitioning_info.umount_partitions()
         sys.exit(1)
@@ -319,13 +448,89 @@ def install():
             % exception,
             do_pause=False,
         )
+        archcraftsman.events.finish(
+            "failed", command=exception.cmd, returncode=exception.returncode
+        )
+        if scheduler is not None:
+            scheduler.stop()
         archcraftsman.config.serialize()
         archcraftsman.info.ai.partitioning_info.umount_partitions()
         sys.exit(1)
+    except archcraftsman.recorder.ReplayError as exception:
+        archcraftsman.base.print_error(
+            _("The replayed fixture doesn't match the installation: %s") % exception,
+            do_pause=False,
+        )
+        archcraftsman.events.finish("failed", error=str(exception))
+        if scheduler is not None:
+            scheduler.stop()
+        archcraftsman.info.ai.partitioning_info.umount_partitions()
+        sys.exit(1)
     except EOFError:
+        archcraftsman.events.finish("interrupted")
+        if scheduler is not None:
+            scheduler.stop()
         sys.exit(1)
 
 
+def install_targets(disks: list[str]) -> bool:
+    """
+    Install the config on all the given disks concurrently.
+    The mirrors are ranked and the packages downloaded once, in the live environment package cache shared by all the installations.
+    """
+    for disk in disks:
+        partitioning_info = copy.deepcopy(archcraftsman.info.ai.partitioning_info)
+        try:
+            partitioning_info.move_to_disk(disk)
+        except ValueError as exception:
+            archcraftsman.base.print_error(str(exception), do_pause=False)
+            return False
+        for partition in partitioning_info.partitions:
+            if partition.encrypted:
+                archcraftsman.base.print_error(
+                    _(
+                        "The encrypted partitions can't be installed on several disks at once."
+                    ),
+                    do_pause=False,
+                )
+                return False
+            if not archcraftsman.arguments.test() and not os.path.exists(
+                partition.path
+            ):
+                archcraftsman.base.print_error(
+                    _("The partition %s doesn't exist.") % partition.path,
+                    do_pause=False,
+                )
+                return False
+
+    try:
+        update_mirrorlist()
+        archcraftsman.base.print_step(
+            _("Downloading the packages of all the installations..."), clear=False
+        )
+        pkgs = set(BASE_PACKAGES)
+        pkgs.update(archcraftsman.info.ai.system_info.kernel().packages())
+        pkgs.update(system_packages())
+        archcraftsman.progress.execute_transaction(
+            f'pacman --noconfirm -Sw {" ".join(sorted(pkgs))}', _("Packages")
+        )
+    except subprocess.CalledProcessError as exception:
+        archcraftsman.base.print_error(
+            _("A subprocess execution failed ! See the following error: %s")
+            % exception,
+            do_pause=False,
+        )
+        return False
+
+    archcraftsman.base.print_step(
+        _("Installation on %d disks...") % len(disks), clear=False
+    )
+    return archcraftsman.targets.run(
+        archcraftsman.targets.for_disks(disks, archcraftsman.arguments.target_root()),
+        archcraftsman.targets.installer_command(),
+    )
+
+
 def main():
     """
     The main installer method.
@@ -361,7 +566,119 @@ def main():
         default=False,
         help="Used to test the installer. No destructive commands will be executed.",
     )
+    parser.add_argument(
+        "-b",
+        "--bundles-dir",
+        action="append",
+        metavar="DIR",
+        help="Add a directory of TOML generic bundles. Can be used multiple times.",
+    )
+    parser.add_argument(
+        "--check-config",
+        action="store",
+        nargs="+",
+        metavar="CONFIG",
+        help="Check that all packages required by the given config files are available, then exit.",
+    )
+    recording = parser.add_mutually_exclusive_group()
+    recording.add_argument(
+        "--record",
+        action="store",
+        metavar="FIXTURE",
+        help="Record the output of all executed commands to a compressed fixture file.",
+    )
+    recording.add_argument(
+        "--replay",
+        action="store",
+        metavar="FIXTURE",
+        help="Answer all executed commands from a recorded fixture file instead of running them.",
+    )
+    parser.add_argument(
+        "--replay-timings",
+        action="store_const",
+        const=True,
+        default=False,
+        help="Make replayed commands take their recorded duration. Useless without --replay.",
+    )
+    parser.add_argument(
+        "--replay-allow-missing",
+        action="store_const",
+        const=True,
+        default=False,
+        help="Make the commands absent from the replayed fixture succeed without output instead of failing. Useless without --replay.",
+    )
+    parser.add_argument(
+        "--events",
+        action="store",
+        metavar="TARGET",
+        help="Emit install events as JSON lines to a file, or to a Unix domain socket with 'unix:PATH'.",
+    )
+    parser.add_argument(
+        "--events-source",
+        action="store",
+        metavar="NAME",
+        help="Name of this machine in the emitted events. Hostname and machine id by default.",
+    )
+    parser.add_argument(
+        "--pipelined",
+        action="store_const",
+        const=True,
+        default=False,
+        help="Ask the partitioning first, then install the base while the system setup is asked.",
+    )
+    parser.add_argument(
+        "--target-root",
+        action="store",
+        metavar="DIR",
+        help="Directory where the new system is mounted. /mnt by default.",
+    )
+    parser.add_argument(
+        "--target-disk",
+        action="store",
+        metavar="DISK",
+        help="Install the config on this disk, having the same partitions layout, instead of its main disk.",
+    )
+    parser.add_argument(
+        "--targets",
+        action="store",
+        metavar="DISK,DISK,...",
+        help="Install the config on all these disks concurrently, each one mounted in its own directory of the target root.",
+    )
+    parser.add_argument(
+        "--shared-cache",
+        action="store_const",
+        const=True,
+        default=False,
+        help="Use the package cache and mirrorlist of the live environment as they are, shared with other installations.",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store",
+        metavar="FILE",
+        help="Sample the installer stacks and write them as collapsed stacks for flame graph tools.",
+    )
     archcraftsman.arguments.init(parser.parse_args())
+    archcraftsman.terminal.RENDERER.start()
+
+    if archcraftsman.arguments.profile():
+        archcraftsman.profiler.start_profiling(archcraftsman.arguments.profile())
+
+    if archcraftsman.arguments.events():
+        archcraftsman.events.start(
+            archcraftsman.arguments.events(), archcraftsman.arguments.events_source()
+        )
+
+    if archcraftsman.arguments.record():
+        archcraftsman.recorder.start_recording(archcraftsman.arguments.record())
+    if archcraftsman.arguments.replay():
+        archcraftsman.recorder.start_replay(
+            archcraftsman.arguments.replay(),
+            archcraftsman.arguments.replay_timings(),
+            archcraftsman.arguments.replay_allow_missing(),
+        )
+
+    if archcraftsman.arguments.install() or archcraftsman.arguments.shell():
+        archcraftsman.geolocation.start_lookup()
 
     readline.set_completer_delims(" \t\n;")
     readline.parse_and_bind("tab: complete")
@@ -371,11 +688,27 @@ def main():
         parser.print_help()
         sys.exit(1)
 
+    if archcraftsman.arguments.check_config():
+        sys.exit(
+            0
+            if archcraftsman.config.check(archcraftsman.arguments.check_config())
+            else 1
+        )
+
+    if archcraftsman.arguments.targets() and not archcraftsman.arguments.config():
+        archcraftsman.base.print_error(
+            _("Installing several disks at once requires a config file."),
+            do_pause=False,
+        )
+        sys.exit(1)
+
     if archcraftsman.arguments.install():
         archcraftsman.basesetup.pre_launch()
         archcraftsman.i18n.update_method(
             archcraftsman.info.ai.pre_launch_info.global_language
         )
+        if archcraftsman.arguments.targets():
+            sys.exit(0 if install_targets(archcraftsman.arguments.targets()) else 1)
         install()
         sys.exit(0)
 
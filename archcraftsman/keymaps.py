@@ -0,0 +1,179 @@
+# ArchCraftsman, The careful yet very fast Arch Linux Craftsman.
+# Copyright (C) 2023 Rawleenc
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+The keymaps index module, listing the console keymaps once from the kbd keymaps tree.
+"""
+import hashlib
+import json
+import os
+import re
+import threading
+import typing
+
+import archcraftsman.base
+import archcraftsman.completion
+
+KEYMAPS_DIR = "/usr/share/kbd/keymaps"
+KEYMAP_SUFFIXES = (".map.gz", ".map")
+
+
+class KeymapIndex:
+    """
+    The index of all available keymaps, for validation, completion and per country lookups.
+    """
+
+    def __init__(self, names: typing.Iterable[str]) -> None:
+        self.names = sorted(set(names))
+        self._names = frozenset(self.names)
+        self.candidates = archcraftsman.completion.Candidates(self.names, True)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._names
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def complete(self, prefix: str) -> list[str]:
+        """
+        Get the keymaps starting with a case-insensitive prefix.
+        """
+        return list(self.candidates.matches(prefix))
+
+    def for_country(self, country_code: str) -> typing.Optional[str]:
+        """
+        Get the keymap of a country, its first latin variant or the one named after its code.
+        """
+        country = country_code.lower()
+        pattern = re.compile(rf"{re.escape(country)}-latin[0-9]+")
+        for name in self.complete(f"{country}-latin"):
+            if pattern.fullmatch(name):
+                return name
+        return country if country in self else None
+
+
+def keymap_name(file_name: str) -> typing.Optional[str]:
+    """
+    Get the keymap name of a keymap file, None if it is not a keymap file.
+    """
+    for suffix in KEYMAP_SUFFIXES:
+        if file_name.endswith(suffix):
+            return file_name.removesuffix(suffix)
+    return None
+
+
+def scan(directory: str) -> list[str]:
+    """
+    Walk a keymaps tree to list all keymaps, the include directories excepted.
+    """
+    names = []
+    for root, directories, files in os.walk(directory):
+        directories[:] = [name for name in directories if name != "include"]
+        for file_name in files:
+            name = keymap_name(file_name)
+            if name:
+                names.append(name)
+    return names
+
+
+def directory_signature(directory: str) -> list[list]:
+    """
+    Compute the signature of a keymaps tree from the mtimes of its first two directory levels.
+    """
+    signature = [["", os.stat(directory).st_mtime_ns]]
+    for entry in os.scandir(directory):
+        if entry.is_dir():
+            signature.append([entry.name, entry.stat().st_mtime_ns])
+            signature.extend(
+                [f"{entry.name}/{sub_entry.name}", sub_entry.stat().st_mtime_ns]
+                for sub_entry in os.scandir(entry.path)
+                if sub_entry.is_dir()
+            )
+    return sorted(signature)
+
+
+def cache_file(directory: str) -> str:
+    """
+    Get the index cache file path of a keymaps tree.
+    """
+    cache_dir = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    directory_hash = hashlib.sha1(
+        os.path.realpath(directory).encode("UTF-8"), usedforsecurity=False
+    ).hexdigest()
+    return os.path.join(cache_dir, "archcraftsman", f"keymaps-{directory_hash}.json")
+
+
+def load_directory(directory: str) -> typing.Optional[KeymapIndex]:
+    """
+    Load the keymaps of a tree, from the cached index when up to date, None if there is no such tree.
+    """
+    try:
+        signature = directory_signature(directory)
+    except OSError:
+        return None
+    directory_cache_file = cache_file(directory)
+    try:
+        with open(directory_cache_file, "r", encoding="UTF-8") as index_file:
+            data = json.load(index_file)
+        if data.get("signature") == signature:
+            return KeymapIndex(data.get("keymaps", []))
+    except (OSError, ValueError):
+        pass
+    names = scan(directory)
+    try:
+        os.makedirs(os.path.dirname(directory_cache_file), exist_ok=True)
+        with open(directory_cache_file, "w", encoding="UTF-8") as index_file:
+            json.dump({"signature": signature, "keymaps": sorted(names)}, index_file)
+    except OSError as exception:
+        archcraftsman.base.log(f"Unable to cache the keymaps index: {exception}")
+    return KeymapIndex(names)
+
+
+_INDEX: typing.Optional[KeymapIndex] = None
+_INDEX_LOCK = threading.Lock()
+
+
+def index() -> KeymapIndex:
+    """
+    Get the shared keymaps index, loaded on the first call.
+    Without a kbd keymaps tree, the keymaps are listed by localectl.
+    """
+    global _INDEX
+    with _INDEX_LOCK:
+        if _INDEX is None:
+            _INDEX = load_directory(KEYMAPS_DIR)
+        if _INDEX is None:
+            _INDEX = KeymapIndex(
+                archcraftsman.base.execute(
+                    "localectl list-keymaps",
+                    capture_output=True,
+                    check=False,
+                    force=True,
+                    cache={archcraftsman.base.CACHE_SYSTEM},
+                )
+                .output.strip()
+                .split()
+            )
+        return _INDEX
+
+
+def reset():
+    """
+    Reset the shared keymaps index so it is reloaded on the next call.
+    """
+    global _INDEX
+    with _INDEX_LOCK:
+        _INDEX = None
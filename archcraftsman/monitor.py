@@ -0,0 +1,256 @@
+# ArchCraftsman, The careful yet very fast Arch Linux Craftsman.
+# Copyright (C) 2023 Rawleenc
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+The install events monitor module, tailing the event streams of several machines and rendering a combined dashboard.
+
+Usage : python -m archcraftsman.monitor [--listen SOCKET] [--once] [EVENTS_FILE...]
+"""
+import argparse
+import json
+import os
+import selectors
+import socket
+import sys
+import time
+import typing
+
+import archcraftsman.base
+
+
+class MachineState:
+    """
+    The installation state of a machine, built from its events.
+    """
+
+    def __init__(self, source: str) -> None:
+        self.source = source
+        self.status = "running"
+        self.phase = ""
+        self.phase_started = 0.0
+        self.started = 0.0
+        self.last_event = 0.0
+        self.percent: typing.Optional[float] = None
+        self.eta: typing.Optional[float] = None
+        self.commands = 0
+        self.warnings = 0
+        self.slowest_phase = ("", 0.0)
+
+    def update(self, event: dict):
+        """
+        Update the state with an event.
+        """
+        now = event.get("time", time.time())
+        self.last_event = now
+        self.started = self.started or now
+        match event.get("event"):
+            case "phase_start":
+                self.phase = event.get("phase", "")
+                self.phase_started = now
+                self.percent = None
+                self.eta = None
+            case "phase_end":
+                if event.get("duration", 0.0) > self.slowest_phase[1]:
+                    self.slowest_phase = (event.get("phase", ""), event["duration"])
+            case "command_end":
+                self.commands += 1
+            case "progress":
+                self.percent = event.get("percent")
+                self.eta = event.get("eta")
+            case "warning" | "error":
+                self.warnings += 1
+            case "status":
+                self.status = event.get("status", "")
+
+    def elapsed(self, now: float) -> float:
+        """
+        The installation duration, up to now if still running.
+        """
+        return (now if self.status == "running" else self.last_event) - self.started
+
+    def in_phase(self, now: float) -> float:
+        """
+        The time spent in the current phase.
+        """
+        end = now if self.status == "running" else self.last_event
+        return end - self.phase_started if self.phase_started else 0.0
+
+
+def _duration(seconds: float) -> str:
+    """
+    Format a duration.
+    """
+    seconds = int(seconds)
+    return f"{seconds // 3600}:{seconds // 60 % 60:02d}:{seconds % 60:02d}"
+
+
+def render(machines: dict[str, MachineState], now: float, colors: bool = True) -> str:
+    """
+    Render the dashboard of all machines, the slowest ones first.
+    """
+    ordered = sorted(machines.values(), key=lambda machine: -machine.elapsed(now))
+    running = [machine for machine in ordered if machine.status == "running"]
+    lines = [
+        f"{'MACHINE':<24} {'STATUS':<12} {'ELAPSED':>8} {'IN PHASE':>8} {'PROGRESS':>9} "
+        f"{'CMDS':>5} {'WARN':>4}  PHASE"
+    ]
+    for machine in ordered:
+        progress = "" if machine.percent is None else f"{machine.percent:.0f}%"
+        if machine.eta:
+            progress += f" {int(machine.eta) // 60}m"
+        color = (
+            {
+                "running": "",
+                "success": archcraftsman.base.SUCCESS,
+            }.get(machine.status, archcraftsman.base.ERROR)
+            if colors
+            else ""
+        )
+        lines.append(
+            f"{color}{machine.source[:24]:<24} {machine.status[:12]:<12} "
+            f"{_duration(machine.elapsed(now)):>8} {_duration(machine.in_phase(now)):>8} "
+            f"{progress:>9} {machine.commands:>5} {machine.warnings:>4}  "
+            f"{machine.phase}{archcraftsman.base.RESET if color else ''}"
+        )
+    if running:
+        slowest = running[0]
+        stuck = max(running, key=lambda machine: machine.in_phase(now))
+        lines.append("")
+        lines.append(
+            f"Slowest : {slowest.source} ({_duration(slowest.elapsed(now))}), "
+            f"longest in phase : {stuck.source} in '{stuck.phase}' "
+            f"({_duration(stuck.in_phase(now))})"
+        )
+    done = len(machines) - len(running)
+    lines.append(f"{done}/{len(machines)} finished")
+    return "\n".join(lines)
+
+
+class Monitor:
+    """
+    The events reader, following JSON lines files and accepting Unix domain socket connections.
+    """
+
+    def __init__(self) -> None:
+        self.machines: dict[str, MachineState] = {}
+        self.selector = selectors.DefaultSelector()
+        self._files: list[tuple[typing.TextIO, list[str]]] = []
+
+    def follow(self, file_path: str):
+        """
+        Follow an events file from its beginning.
+        """
+        self._files.append((open(file_path, "r", encoding="UTF-8"), [""]))
+
+    def listen(self, socket_path: str):
+        """
+        Accept event streams on a Unix domain socket.
+        """
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(socket_path)
+        server.listen()
+        server.setblocking(False)
+        self.selector.register(server, selectors.EVENT_READ, None)
+
+    def handle_line(self, line: str):
+        """
+        Update the machines states with an events line.
+        """
+        try:
+            event = json.loads(line)
+        except ValueError:
+            return
+        if not isinstance(event, dict) or "source" not in event:
+            return
+        source = str(event["source"])
+        self.machines.setdefault(source, MachineState(source)).update(event)
+
+    def poll(self, timeout: float):
+        """
+        Read all available events, waiting at most the timeout for socket events.
+        """
+        for file, pending in self._files:
+            pending[0] += file.read()
+            *lines, pending[0] = pending[0].split("\n")
+            for line in lines:
+                self.handle_line(line)
+        if not self.selector.get_map():
+            time.sleep(timeout)
+            return
+        for key, _ in self.selector.select(timeout):
+            if key.data is None:
+                connection, _ = key.fileobj.accept()  # type: ignore
+                connection.setblocking(False)
+                self.selector.register(connection, selectors.EVENT_READ, [b""])
+                continue
+            data = key.fileobj.recv(65536)  # type: ignore
+            if not data:
+                self.selector.unregister(key.fileobj)
+                key.fileobj.close()  # type: ignore
+                data = b"\n"
+            *lines, key.data[0] = (key.data[0] + data).split(b"\n")
+            for line in lines:
+                self.handle_line(line.decode("UTF-8", errors="replace"))
+
+
+def main(arguments: typing.Optional[list[str]] = None) -> int:
+    """
+    The monitor entry point.
+    """
+    parser = argparse.ArgumentParser(
+        description="Monitor the install events of several ArchCraftsman installations."
+    )
+    parser.add_argument("files", nargs="*", help="Events files to follow.")
+    parser.add_argument(
+        "--listen",
+        metavar="SOCKET",
+        help="Unix domain socket path on which installers send their events.",
+    )
+    parser.add_argument(
+        "--interval", type=float, default=1.0, help="Refresh interval, in seconds."
+    )
+    parser.add_argument(
+        "--once", action="store_true", help="Render the current state once and exit."
+    )
+    args = parser.parse_args(arguments)
+    if not args.files and not args.listen:
+        parser.print_help()
+        return 1
+
+    monitor = Monitor()
+    for file_path in args.files:
+        monitor.follow(file_path)
+    if args.listen:
+        monitor.listen(args.listen)
+    try:
+        while True:
+            monitor.poll(0 if args.once else args.interval)
+            dashboard = render(monitor.machines, time.time(), sys.stdout.isatty())
+            if args.once:
+                print(dashboard)
+                return 0
+            if sys.stdout.isatty():
+                print("\033[H\033[2J" + dashboard, flush=True)
+            else:
+                print(dashboard + "\n", flush=True)
+    except KeyboardInterrupt:
+        return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
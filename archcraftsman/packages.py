@@ -17,15 +17,93 @@
 """
 The packages management singleton module
 """
+import glob
+import os
+import re
 import readline
+import tarfile
 import threading
+import typing
 
 import archcraftsman.arguments
 import archcraftsman.base
+import archcraftsman.completion
 import archcraftsman.i18n
 
 _ = archcraftsman.i18n.translate
 
+SYNC_DB_DIR = "/var/lib/pacman/sync"
+
+
+def parse_desc(content: str) -> dict[str, list[str]]:
+    """
+    Parse the content of a sync database desc file into its sections.
+    """
+    sections: dict[str, list[str]] = {}
+    current: list[str] = []
+    for line in content.splitlines():
+        if line.startswith("%") and line.endswith("%"):
+            current = sections.setdefault(line.strip("%"), [])
+        elif line:
+            current.append(line)
+    return sections
+
+
+def read_sync_databases(
+    sync_db_dir: str = SYNC_DB_DIR,
+) -> tuple[set[str], set[str], set[str], list[str]]:
+    """
+    Read all sync databases of a directory and return the packages, groups and provides names,
+    and the names of the repositories whose database can't be read, like zstd compressed ones.
+    """
+    names: set[str] = set()
+    groups: set[str] = set()
+    provides: set[str] = set()
+    unreadable: list[str] = []
+    for db_path in sorted(glob.glob(os.path.join(sync_db_dir, "*.db"))):
+        try:
+            with tarfile.open(db_path, "r:*") as database:
+                for member in database:
+                    if not member.isfile() or not member.name.endswith("/desc"):
+                        continue
+                    desc_file = database.extractfile(member)
+                    if desc_file is None:
+                        continue
+                    sections = parse_desc(desc_file.read().decode("UTF-8"))
+                    names.update(sections.get("NAME", []))
+                    groups.update(sections.get("GROUPS", []))
+                    provides.update(
+                        re.split("[<>=]", provided, maxsplit=1)[0]
+                        for provided in sections.get("PROVIDES", [])
+                    )
+        except (tarfile.TarError, OSError, UnicodeDecodeError) as exception:
+            archcraftsman.base.log(f"Unable to read {db_path}: {exception}")
+            unreadable.append(os.path.basename(db_path).removesuffix(".db"))
+    return names, groups, provides, unreadable
+
+
+def list_packages(repository: str = "") -> set[str]:
+    """
+    List the packages names of a repository, or of all of them, with pacman.
+    """
+    return set(
+        archcraftsman.base.execute(
+            f"pacman -Sl{' ' + repository if repository else ''} | awk '{{print $2}}'",
+            check=False,
+            capture_output=True,
+        )
+        .output.strip()
+        .split("\n")
+    )
+
+
+def synchronise() -> "Packages":
+    """
+    Synchronise the repositories, then load all their packages.
+    """
+    archcraftsman.base.execute("pacman -Sy &>/dev/null")
+    return Packages()
+
 
 class PackagesMeta(type):
     """
@@ -53,36 +131,87 @@ class Packages(metaclass=PackagesMeta):
     """
 
     packages: list[str]
+    groups: set[str]
+    provides: set[str]
 
     def __init__(self) -> None:
-        self.packages = (
-            archcraftsman.base.execute(
-                "pacman -Sl | awk '{print $2}'",
-                check=False,
-                capture_output=True,
+        # The packages are loaded in the background, the unreadable databases are warned about by warn_unreadable.
+        names, self.groups, self.provides, self.unreadable = read_sync_databases()
+        self._warned = False
+        # The packages listed with pacman come without their provides, see exist.
+        self._listed = bool(self.unreadable) or not names
+        if names:
+            for repository in self.unreadable:
+                names.update(list_packages(repository))
+        else:
+            names = list_packages()
+        if self._listed:
+            self.groups.update(
+                archcraftsman.base.execute(
+                    "pacman -Sg | awk '{print $1}'",
+                    check=False,
+                    capture_output=True,
+                )
+                .output.strip()
+                .split("\n")
             )
-            .output.strip()
-            .split("\n")
-        )
+        names.discard("")
+        self.groups.discard("")
+        self._names = names
+        self.packages = sorted(names)
+        self._candidates: typing.Optional[archcraftsman.completion.Candidates] = None
+
+    def warn_unreadable(self):
+        """
+        A method to warn once about the databases that can't be read, from the thread showing the prompts.
+        """
+        if self.unreadable and not self._warned:
+            self._warned = True
+            archcraftsman.base.print_warning(
+                _(
+                    "The package databases of %s can't be read, their packages are listed with pacman."
+                )
+                % ", ".join(self.unreadable),
+                do_pause=False,
+            )
+
+    def candidates(self) -> archcraftsman.completion.Candidates:
+        """
+        A method to get the packages completion candidates, sorted on the first call.
+        """
+        if self._candidates is None:
+            self._candidates = archcraftsman.completion.Candidates(self.packages)
+        return self._candidates
 
     def exist(self, package: str) -> bool:
         """
-        A method to check if a package exist.
+        A method to check if a package, a group or a provided name exist.
+        """
+        if package in self._names or package in self.groups or package in self.provides:
+            return True
+        if archcraftsman.arguments.test():
+            # The pacman lookups are faked, only the readable databases can tell a package is missing.
+            return self._listed
+        if self._listed and archcraftsman.base.execute(
+            f"pacman -Sp --noconfirm --print-format %n {package} &>/dev/null",
+            check=False,
+        ):
+            self.provides.add(package)
+            return True
+        return False
+
+    def missing(self, packages: typing.Iterable[str]) -> list[str]:
+        """
+        A method to get the sorted list of packages that doesn't exist in the sync databases.
         """
-        return archcraftsman.arguments.test() or package in self.packages
+        return sorted({package for package in packages if not self.exist(package)})
 
     def ask_packages(self) -> list[str]:
         """
         A method to ask the user for more packages to install.
         """
         readline.set_completer(
-            lambda text, state: (
-                [
-                    package
-                    for package in self.packages
-                    if (text and package.startswith(text))
-                ]
-            )[state]
+            archcraftsman.completion.Completer(self.candidates(), complete_empty=False)
         )
 
         pkgs_select_ok = False
@@ -21,6 +21,7 @@ import json
 import os
 import subprocess
 
+import archcraftsman.arguments
 import archcraftsman.base
 import archcraftsman.btrfs
 import archcraftsman.i18n
@@ -73,6 +74,7 @@ class Partition:
             archcraftsman.base.execute(
                 f'lsblk -nld "{self.path}" -o SIZE',
                 force=True,
+                cache={archcraftsman.base.CACHE_BLOCK},
                 check=False,
                 capture_output=True,
             ).output.strip()
@@ -85,6 +87,7 @@ class Partition:
         return archcraftsman.base.execute(
             f'lsblk -nld "{self.path}" -o PARTTYPENAME',
             force=True,
+            cache={archcraftsman.base.CACHE_BLOCK},
             check=False,
             capture_output=True,
         ).output.strip()
@@ -96,6 +99,7 @@ class Partition:
         return archcraftsman.base.execute(
             f'lsblk -nld "{self.path}" -o PKNAME',
             force=True,
+            cache={archcraftsman.base.CACHE_BLOCK},
             check=False,
             capture_output=True,
         ).output.strip()
@@ -107,6 +111,7 @@ class Partition:
         return archcraftsman.base.execute(
             f'lsblk -nld "{self.path}" -o FSTYPE',
             force=True,
+            cache={archcraftsman.base.CACHE_BLOCK},
             check=False,
             capture_output=True,
         ).output.strip()
@@ -118,6 +123,7 @@ class Partition:
         return archcraftsman.base.execute(
             f'lsblk -nld "{self.path}" -o UUID',
             force=True,
+            cache={archcraftsman.base.CACHE_BLOCK},
             check=False,
             capture_output=True,
         ).output.strip()
@@ -172,7 +178,11 @@ class Partition:
         """
         return bool(
             archcraftsman.base.execute(
-                f"cryptsetup isLuks {self.path}", force=True, check=False, sudo=True
+                f"cryptsetup isLuks {self.path}",
+                force=True,
+                check=False,
+                sudo=True,
+                cache={archcraftsman.base.CACHE_BLOCK},
             )
         )
 
@@ -276,6 +286,7 @@ class Partition:
                 check=False,
                 capture_output=True,
                 force=True,
+                cache={archcraftsman.base.CACHE_MOUNTS},
             )
         )
 
@@ -291,7 +302,7 @@ class Partition:
                 )
             case _:
                 archcraftsman.base.execute(
-                    f'mount --mkdir "{self.real_path()}" "/mnt{self.part_mount_point}"'
+                    f'mount --mkdir "{self.real_path()}" "{archcraftsman.arguments.target_root()}{self.part_mount_point}"'
                 )
 
     def umount(self) -> bool:
@@ -302,7 +313,9 @@ class Partition:
             archcraftsman.base.print_sub_step(
                 _("Unmounting %s...") % (self.real_path())
             )
-            archcraftsman.base.execute(f'umount -R "/mnt{self.part_mount_point}"')
+            archcraftsman.base.execute(
+                f'umount -R "{archcraftsman.arguments.target_root()}{self.part_mount_point}"'
+            )
             if self.encrypted:
                 archcraftsman.base.print_sub_step(
                     _("Closing %s...") % (self.real_path())
@@ -317,7 +330,10 @@ class Partition:
         A method to build a partition name with a disk and an index.
         """
         block_devices_str = archcraftsman.base.execute(
-            "lsblk -J", force=True, capture_output=True
+            "lsblk -J",
+            force=True,
+            capture_output=True,
+            cache={archcraftsman.base.CACHE_BLOCK},
         ).output
         if not block_devices_str:
             return
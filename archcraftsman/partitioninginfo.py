@@ -17,7 +17,6 @@
 """
 The module of PartitioningInfo class.
 """
-import re
 import subprocess
 
 import archcraftsman.arguments
@@ -86,6 +85,26 @@ class PartitioningInfo:
             ),
         )
 
+    def move_to_disk(self, disk: str):
+        """
+        A method to move this partitioning onto another disk having the same partitions layout.
+        """
+        moved_paths = []
+        for partition in self.partitions:
+            number = partition.path.removeprefix(self.main_disk)
+            if self.main_disk[-1:].isdigit():
+                number = number.removeprefix("p")
+            if not partition.path.startswith(self.main_disk) or not number.isdigit():
+                raise ValueError(
+                    _("The partition %s is not on the main disk %s.")
+                    % (partition.path, self.main_disk)
+                )
+            separator = "p" if disk[-1:].isdigit() else ""
+            moved_paths.append(f"{disk}{separator}{number}")
+        for partition, path in zip(self.partitions, moved_paths):
+            partition.path = path
+        self.main_disk = disk
+
     def format_and_mount_partitions(self):
         """
         A method to format and mount all partitions.
@@ -158,17 +177,19 @@ class PartitioningInfo:
         A method to unmount all mounted partitions.
         """
         archcraftsman.base.print_step(_("Unmounting partitions..."), clear=False)
-        swap = re.sub(
-            "\\s",
-            "",
-            archcraftsman.base.execute(
-                "swapon --noheadings | awk '{print $1}'",
-                check=False,
-                capture_output=True,
-            ).output,
-        )
-        if swap:
-            archcraftsman.base.execute(f"swapoff {swap} &>/dev/null", check=False)
+        own_swaps = {
+            partition.path
+            for partition in self.partitions
+            if partition.part_type == archcraftsman.options.PartTypes.SWAP
+        }
+        own_swaps.add(f"{archcraftsman.arguments.target_root()}/swap/swapfile")
+        for swap in archcraftsman.base.execute(
+            "swapon --noheadings | awk '{print $1}'",
+            check=False,
+            capture_output=True,
+        ).output.split():
+            if swap in own_swaps:
+                archcraftsman.base.execute(f"swapoff {swap} &>/dev/null", check=False)
 
         mounted_partitions = [
             partition for partition in self.partitions if partition.is_mounted()
@@ -0,0 +1,97 @@
+# ArchCraftsman, The careful yet very fast Arch Linux Craftsman.
+# Copyright (C) 2023 Rawleenc
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+The pipeline module, running installation steps in the background while the user answers the remaining questions.
+"""
+import queue
+import threading
+import typing
+
+import archcraftsman.terminal
+
+
+class StepScheduler:
+    """
+    A scheduler running the submitted steps in order on a background thread, their output diverted to a log file.
+    Once a step failed, the next ones are skipped and the error is raised by wait().
+    """
+
+    def __init__(self, log_path: str) -> None:
+        self.log_path = log_path
+        self.done: list[str] = []
+        self.current = ""
+        self._steps: queue.Queue = queue.Queue()
+        self._error: typing.Optional[BaseException] = None
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run, name="pipeline", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        with open(self.log_path, "ab") as log_file:
+            with archcraftsman.terminal.RENDERER.divert(log_file):
+                while True:
+                    item = self._steps.get()
+                    if item is None:
+                        break
+                    name, step = item
+                    if self._error is not None or self._stopped:
+                        continue
+                    self._run_step(name, step)
+
+    def _run_step(self, name: str, step: typing.Callable[[], typing.Any]):
+        """
+        Run a step, keeping its error instead of raising it.
+        """
+        self.current = name
+        try:
+            step()
+            self.done.append(name)
+        except BaseException as exception:  # pylint: disable=broad-exception-caught
+            self._error = exception
+        finally:
+            self.current = ""
+
+    def submit(self, name: str, step: typing.Callable[[], typing.Any]):
+        """
+        Add a step to run after the already submitted ones.
+        """
+        self._steps.put((name, step))
+
+    def failed(self) -> bool:
+        """
+        Check if a step failed.
+        """
+        return self._error is not None
+
+    def wait(self):
+        """
+        Wait for all the submitted steps, raising the error of the failed step if any.
+        No step can be submitted afterwards.
+        """
+        self._steps.put(None)
+        self._thread.join()
+        if self._error is not None:
+            raise self._error
+
+    def stop(self):
+        """
+        Skip the steps not started yet and wait for the current one, without raising its error.
+        An interruption from the terminal also reaches the subprocess of the current step, so it ends quickly.
+        """
+        self._stopped = True
+        self._steps.put(None)
+        self._thread.join()
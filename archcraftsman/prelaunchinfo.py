@@ -17,12 +17,14 @@
 """
 The module of PreLaunchInfo class.
 """
-import json
 import os
-import urllib.request
+import typing
 
+import archcraftsman.arguments
 import archcraftsman.base
+import archcraftsman.geolocation
 import archcraftsman.i18n
+import archcraftsman.keymaps
 import archcraftsman.options
 
 _ = archcraftsman.i18n.translate
@@ -56,31 +58,11 @@ def get_default_keymap(
     if language in DEFAULT_KEYMAPS:
         return DEFAULT_KEYMAPS[language]
 
-    lower_country_code = detected_country_code.lower()
-
-    keymaps = archcraftsman.base.execute(
-        f'localectl list-keymaps | grep -E "^{lower_country_code}-latin[0-9]+$"',
-        check=False,
-        force=True,
-        capture_output=True,
+    return (
+        archcraftsman.keymaps.index().for_country(detected_country_code)
+        or DEFAULT_KEYMAP
     )
 
-    if keymaps.returncode == 0:
-        return keymaps.output.split("\n")[0]
-
-    if (
-        archcraftsman.base.execute(
-            f'localectl list-keymaps | grep -E "^{lower_country_code}$"',
-            check=False,
-            force=True,
-            capture_output=True,
-        ).returncode
-        == 0
-    ):
-        return lower_country_code
-
-    return DEFAULT_KEYMAP
-
 
 class PreLaunchInfo:
     """
@@ -102,17 +84,36 @@ class PreLaunchInfo:
         self._detected_language = detected_language
         self._detected_country_code = detected_country_code
         self._detected_timezone = detected_timezone
+        self._lookup: typing.Optional[archcraftsman.geolocation.Lookup] = None
+
+    def _apply(self, location: archcraftsman.geolocation.Location):
+        """
+        The method to use a detected location.
+        """
+        self._detected_language = location.language
+        self._detected_country_code = location.country_code
+        self._detected_timezone = location.timezone
+
+    def refine(self, wait: bool = False):
+        """
+        The method to refine the detected location with the IP geolocation, once arrived.
+        """
+        if self._lookup is None:
+            return
+        location = self._lookup.result(wait)
+        if location is not None:
+            self._apply(location)
+            self._lookup = None
 
     def init(self) -> tuple[archcraftsman.options.Languages, str]:
         """
         The method to initialize the pre-launch information
-        with fetched geoip data and return the default language and keymap.
+        with the live system location, refined by the IP geolocation if it arrives in time,
+        and return the default language and keymap.
         """
-        with urllib.request.urlopen("https://ipapi.co/json") as response:
-            geoip_info = json.loads(response.read())
-        self._detected_language = str(geoip_info["languages"]).split(",", maxsplit=1)[0]
-        self._detected_country_code = geoip_info["country_code"]
-        self._detected_timezone = geoip_info["timezone"]
+        self._apply(archcraftsman.geolocation.local_location())
+        self._lookup = archcraftsman.geolocation.start_lookup()
+        self.refine(wait=True)
 
         default_language = parse_detected_language(self._detected_language)
         return default_language, get_default_keymap(
@@ -162,10 +163,11 @@ class PreLaunchInfo:
         """
         The method to set the X keyboard of the chrooted system.
         """
+        self.refine()
         layout: str = self._detected_country_code.lower()
         if (
             archcraftsman.base.execute(
-                f'cat /mnt/usr/share/X11/xkb/rules/base.lst | grep -w "{layout}"',
+                f'cat {archcraftsman.arguments.target_root()}/usr/share/X11/xkb/rules/base.lst | grep -w "{layout}"',
                 force=True,
                 check=False,
                 capture_output=True,
@@ -180,10 +182,14 @@ class PreLaunchInfo:
             f'    Option "XkbLayout" "{layout}"\n',
             "EndSection\n",
         ]
-        archcraftsman.base.execute("mkdir --parents /mnt/etc/X11/xorg.conf.d/")
+        archcraftsman.base.execute(
+            f"mkdir --parents {archcraftsman.arguments.target_root()}/etc/X11/xorg.conf.d/"
+        )
         try:
             with open(
-                "/mnt/etc/X11/xorg.conf.d/00-keyboard.conf", "w", encoding="UTF-8"
+                f"{archcraftsman.arguments.target_root()}/etc/X11/xorg.conf.d/00-keyboard.conf",
+                "w",
+                encoding="UTF-8",
             ) as keyboard_config_file:
                 keyboard_config_file.writelines(content)
         except FileNotFoundError as exception:
@@ -193,10 +199,12 @@ class PreLaunchInfo:
         """
         The method to get the country code.
         """
+        self.refine()
         return self._detected_country_code
 
     def timezone_file(self) -> str:
         """
         The method to get the timezone file path.
         """
+        self.refine()
         return f"/usr/share/zoneinfo/{self._detected_timezone}"
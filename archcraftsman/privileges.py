@@ -0,0 +1,201 @@
+# ArchCraftsman, The careful yet very fast Arch Linux Craftsman.
+# Copyright (C) 2023 Rawleenc
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+The privileges broker module. When the user is not root, a single root helper is spawned under sudo
+and runs all the sudo executions it receives over a socket pair, streaming their outputs back.
+"""
+import atexit
+import codecs
+import json
+import os
+import selectors
+import socket
+import subprocess
+import sys
+import threading
+import typing
+
+import archcraftsman.base
+import archcraftsman.terminal
+
+PACKAGE_ROOT = os.path.dirname(
+    os.path.dirname(os.path.abspath(archcraftsman.base.__file__))
+)
+
+# The helper entry point, importing this module from the same package root whatever the sudo environment.
+HELPER_CODE = (
+    f"import sys; sys.path.insert(0, {PACKAGE_ROOT!r}); "
+    "import archcraftsman.privileges; archcraftsman.privileges.serve()"
+)
+
+
+def _encode(data: bytes) -> str:
+    """
+    Encode process output bytes to send them in a message.
+    """
+    return data.decode("UTF-8", errors="surrogateescape")
+
+
+def _decode(data: str) -> bytes:
+    """
+    Decode process output bytes received in a message.
+    """
+    return data.encode("UTF-8", errors="surrogateescape")
+
+
+def _send(channel: typing.BinaryIO, message: dict):
+    """
+    Send a JSON line message.
+    """
+    channel.write(json.dumps(message).encode("UTF-8") + b"\n")
+    channel.flush()
+
+
+def serve(channel: typing.Optional[socket.socket] = None):
+    """
+    The root helper loop, running each received command and streaming its outputs back until the channel closes.
+    The commands read from the client stdin, received first over the channel.
+    """
+    channel = channel or socket.socket(fileno=os.dup(sys.stdin.fileno()))
+    _, fds, _, _ = socket.recv_fds(channel, 1, 1)
+    stdin = fds[0] if fds else subprocess.DEVNULL
+    with channel, channel.makefile("rwb") as stream:
+        for line in stream:
+            request = json.loads(line)
+            with subprocess.Popen(
+                request["command"],
+                shell=True,
+                cwd=request.get("cwd") or None,
+                stdin=stdin,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE if request["capture_output"] else None,
+            ) as process:
+                with selectors.DefaultSelector() as selector:
+                    for name, pipe in (
+                        ("stdout", process.stdout),
+                        ("stderr", process.stderr),
+                    ):
+                        if pipe:
+                            selector.register(pipe, selectors.EVENT_READ, name)
+                    while selector.get_map():
+                        for key, _ in selector.select():
+                            data = os.read(key.fd, 65536)
+                            if data:
+                                _send(stream, {key.data: _encode(data)})
+                            else:
+                                selector.unregister(key.fileobj)
+            _send(stream, {"returncode": process.returncode})
+
+
+class Broker:
+    """
+    The client side of the root helper, usable as a sudo executor.
+    """
+
+    def __init__(self, launcher: typing.Optional[list[str]] = None) -> None:
+        self.launcher = ["sudo"] if launcher is None else launcher
+        self._process: typing.Optional[subprocess.Popen] = None
+        self._channel: typing.Optional[socket.socket] = None
+        self._stream: typing.Optional[typing.BinaryIO] = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        """
+        Spawn the root helper.
+        """
+        self._channel, helper_channel = socket.socketpair()
+        with helper_channel:
+            self._process = subprocess.Popen(  # pylint: disable=consider-using-with
+                self.launcher + [sys.executable, "-c", HELPER_CODE],
+                stdin=helper_channel,
+                stdout=helper_channel,
+            )
+        try:
+            stdin = sys.stdin.fileno()
+        except (AttributeError, OSError, ValueError):
+            stdin = -1
+        if stdin >= 0:
+            socket.send_fds(self._channel, [b"\0"], [stdin])
+        else:
+            self._channel.sendall(b"\0")
+        self._stream = self._channel.makefile("rwb")
+
+    def stop(self):
+        """
+        Stop the root helper, which exits when its channel closes.
+        """
+        if self._stream:
+            self._stream.close()
+            self._stream = None
+        if self._channel:
+            self._channel.close()
+            self._channel = None
+        if self._process:
+            self._process.wait()
+            self._process = None
+
+    def __call__(
+        self, command: str, capture_output: bool
+    ) -> subprocess.CompletedProcess:
+        with self._lock:
+            if self._stream is None:
+                self.start()
+            assert self._stream is not None
+            _send(
+                self._stream,
+                {
+                    "command": command,
+                    "capture_output": capture_output,
+                    "cwd": os.getcwd(),
+                },
+            )
+            stdout: list[bytes] = []
+            stderr: list[bytes] = []
+            # Uncaptured output goes to the renderer, which honours the diversion of the calling thread.
+            decoder = codecs.getincrementaldecoder("UTF-8")(errors="replace")
+            for line in self._stream:
+                message = json.loads(line)
+                if "returncode" in message:
+                    return subprocess.CompletedProcess(
+                        command,
+                        message["returncode"],
+                        b"".join(stdout) if capture_output else None,
+                        b"".join(stderr) if capture_output else None,
+                    )
+                if "stderr" in message:
+                    stderr.append(_decode(message["stderr"]))
+                elif capture_output:
+                    stdout.append(_decode(message["stdout"]))
+                else:
+                    archcraftsman.terminal.RENDERER.write(
+                        decoder.decode(_decode(message["stdout"]))
+                    )
+        self.stop()
+        raise ConnectionError("The privileges broker stopped unexpectedly.")
+
+
+def start_broker() -> typing.Optional[Broker]:
+    """
+    Route all sudo executions through a root helper spawned on first use, when the user is not root.
+    """
+    root, has_sudo = archcraftsman.base.privileges()
+    if root or not has_sudo:
+        return None
+    broker = Broker()
+    archcraftsman.base.set_sudo_executor(broker)
+    atexit.register(broker.stop)
+    return broker
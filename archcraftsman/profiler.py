@@ -0,0 +1,151 @@
+# ArchCraftsman, The careful yet very fast Arch Linux Craftsman.
+# Copyright (C) 2023 Rawleenc
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+The sampling profiler module, sampling the installer stacks on a wall clock timer signal
+and writing them as collapsed stacks for flame graph tools.
+"""
+import atexit
+import collections
+import signal
+import sys
+import threading
+import time
+import types
+import typing
+
+DEFAULT_INTERVAL = 0.005
+
+# The frames meaning the installer is waiting instead of running Python code, by kind of wait.
+# The innermost matching frame of a stack gives its category, "cpu" if none matches.
+WAIT_FRAMES = {
+    "archcraftsman.base:input_str": "interactive",
+    "archcraftsman.terminal:read_key": "interactive",
+    "getpass:unix_getpass": "interactive",
+    "subprocess:_execute_child": "subprocess",
+    "subprocess:_try_wait": "subprocess",
+    "subprocess:_communicate": "subprocess",
+    "selectors:select": "subprocess",
+    "socket:create_connection": "network",
+    "socket:readinto": "network",
+    "ssl:read": "network",
+}
+
+
+def frame_name(frame: types.FrameType) -> str:
+    """
+    The name of a frame, its module and function names.
+    """
+    return f"{frame.f_globals.get('__name__', '?')}:{frame.f_code.co_name}"
+
+
+def collapse(frame: typing.Optional[types.FrameType]) -> tuple[str, list[str]]:
+    """
+    Get the category and the frame names, from the outermost to the innermost, of a stack.
+    """
+    names: list[str] = []
+    while frame is not None:
+        names.append(frame_name(frame))
+        frame = frame.f_back
+    category = next((WAIT_FRAMES[name] for name in names if name in WAIT_FRAMES), "cpu")
+    names.reverse()
+    return category, names
+
+
+class SamplingProfiler:
+    """
+    A profiler sampling the stacks of all threads on each SIGALRM of a wall clock interval timer.
+    """
+
+    def __init__(self, interval: float = DEFAULT_INTERVAL) -> None:
+        self.interval = interval
+        self.samples: collections.Counter[str] = collections.Counter()
+        self.categories: collections.Counter[str] = collections.Counter()
+        self.started = 0.0
+        self.duration = 0.0
+        self._previous_handler: typing.Any = None
+
+    def _sample(self, _signum: int, _frame: typing.Optional[types.FrameType]):
+        """
+        The signal handler, sampling all threads stacks.
+        """
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for (
+            ident,
+            frame,
+        ) in sys._current_frames().items():  # pylint: disable=protected-access
+            if frame.f_code is self._sample.__code__:
+                frame = frame.f_back  # type: ignore
+            category, stack = collapse(frame)
+            if ident != threading.main_thread().ident:
+                stack.insert(0, f"thread:{names.get(ident, ident)}")
+            self.samples[";".join([category] + stack)] += 1
+            self.categories[category] += 1
+
+    def start(self):
+        """
+        Start sampling.
+        """
+        self.started = time.monotonic()
+        self._previous_handler = signal.signal(signal.SIGALRM, self._sample)
+        signal.setitimer(signal.ITIMER_REAL, self.interval, self.interval)
+
+    def stop(self):
+        """
+        Stop sampling.
+        """
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, self._previous_handler or signal.SIG_DFL)
+        self.duration = time.monotonic() - self.started
+
+    def write(self, file_path: str):
+        """
+        Write the samples as collapsed stacks, one "category;frame;...;frame count" line per stack.
+        """
+        with open(file_path, "w", encoding="UTF-8") as profile_file:
+            for stack, count in sorted(self.samples.items()):
+                profile_file.write(f"{stack} {count}\n")
+
+    def summary(self) -> str:
+        """
+        The time spent in each category, estimated from the samples.
+        """
+        total = sum(self.categories.values()) or 1
+        return ", ".join(
+            f"{category} {count * self.interval:.2f}s ({count * 100 / total:.0f}%)"
+            for category, count in self.categories.most_common()
+        )
+
+
+def start_profiling(
+    file_path: str, interval: float = DEFAULT_INTERVAL
+) -> SamplingProfiler:
+    """
+    Profile the installer until exit, then write the collapsed stacks file and print a summary.
+    """
+    profiler = SamplingProfiler(interval)
+
+    def finish():
+        profiler.stop()
+        profiler.write(file_path)
+        print(
+            f"Profile written to {file_path} in {profiler.duration:.2f}s : {profiler.summary()}",
+            file=sys.stderr,
+        )
+
+    profiler.start()
+    atexit.register(finish)
+    return profiler
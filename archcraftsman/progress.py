@@ -0,0 +1,334 @@
+# ArchCraftsman, The careful yet very fast Arch Linux Craftsman.
+# Copyright (C) 2023 Rawleenc
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+The pacman transactions progress module.
+"""
+import collections
+import re
+import subprocess
+import time
+import typing
+
+import archcraftsman.base
+import archcraftsman.i18n
+import archcraftsman.terminal
+
+_ = archcraftsman.i18n.translate
+
+SIZE_UNITS = {
+    "B": 1,
+    "KiB": 1024,
+    "MiB": 1024**2,
+    "GiB": 1024**3,
+    "TiB": 1024**4,
+}
+
+# The weight of each phase in the overall percent.
+DOWNLOAD_WEIGHT = 0.45
+INSTALL_WEIGHT = 0.45
+HOOKS_WEIGHT = 0.10
+
+# The time window used to compute the current throughput, in seconds.
+ETA_WINDOW = 30.0
+
+PACKAGES_PATTERN = re.compile(r"^Packages \((\d+)\)")
+DOWNLOAD_SIZE_PATTERN = re.compile(r"^Total Download Size:\s+([\d.]+) (\w+)")
+DOWNLOADING_PATTERN = re.compile(
+    r"^\s*(?:downloading (\S+)\.\.\.|(\S+) downloading\.\.\.)$"
+)
+DOWNLOAD_BAR_PATTERN = re.compile(
+    r"^\s*(\S+)\s+([\d.]+) (\w+)\s+[\d.]+ \w+/s\s+[\d:-]+\s+\[[^\]]*\]\s+(\d+)%$"
+)
+COUNTER_PATTERN = re.compile(r"^\(\s*(\d+)/(\d+)\) (.+)$")
+INSTALL_PATTERN = re.compile(r"^(installing|upgrading|reinstalling|downgrading) (\S+)")
+
+
+def parse_size(value: str, unit: str) -> int:
+    """
+    Convert a pacman size in bytes.
+    """
+    return int(float(value) * SIZE_UNITS.get(unit, 1))
+
+
+_PROGRESS_LISTENERS: list[typing.Callable[["TransactionProgress"], None]] = []
+
+
+def add_progress_listener(listener: typing.Callable[["TransactionProgress"], None]):
+    """
+    A method to register a listener called after each progress update of any transaction.
+    """
+    _PROGRESS_LISTENERS.append(listener)
+
+
+def remove_progress_listener(listener: typing.Callable[["TransactionProgress"], None]):
+    """
+    A method to unregister a progress listener.
+    """
+    if listener in _PROGRESS_LISTENERS:
+        _PROGRESS_LISTENERS.remove(listener)
+
+
+class TransactionProgress:
+    """
+    The aggregated progress of a pacman or pacstrap transaction, fed with its output lines.
+    Both the progress bars lines and the plain lines printed when the output is not a terminal are understood.
+    """
+
+    def __init__(
+        self,
+        description: str,
+        clock: typing.Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.description = description
+        self.clock = clock
+        self.phase = "sync"
+        self.total_packages = 0
+        self.download_total = 0
+        self.downloads_started = 0
+        self.download_files: dict[str, tuple[int, int]] = {}
+        self.installed_packages = 0
+        self.current_package = ""
+        self.hooks_run = 0
+        self.hooks_total = 0
+        self.started = clock()
+        self._samples: collections.deque[tuple[float, float]] = collections.deque()
+
+    def feed(self, line: str):
+        """
+        Update the progress with an output line.
+        """
+        line = line.rstrip()
+        if not self._parse(line):
+            return
+        now = self.clock()
+        self._samples.append((now, self.fraction()))
+        while len(self._samples) > 2 and self._samples[1][0] < now - ETA_WINDOW:
+            self._samples.popleft()
+        for listener in list(_PROGRESS_LISTENERS):
+            listener(self)
+
+    def _parse(self, line: str) -> bool:
+        """
+        Parse an output line and return whether the progress changed.
+        """
+        if match := PACKAGES_PATTERN.match(line):
+            self.total_packages = int(match.group(1))
+        elif match := DOWNLOAD_SIZE_PATTERN.match(line):
+            self.download_total = parse_size(match.group(1), match.group(2))
+        elif match := DOWNLOAD_BAR_PATTERN.match(line):
+            self.phase = "download"
+            self.download_files[match.group(1)] = (
+                parse_size(match.group(2), match.group(3)),
+                int(match.group(4)),
+            )
+        elif match := DOWNLOADING_PATTERN.match(line):
+            self.phase = "download"
+            self.downloads_started += 1
+            self.current_package = match.group(1) or match.group(2)
+        elif line.startswith(":: Processing package changes"):
+            self.phase = "install"
+        elif line.startswith(":: Running pre-transaction hooks"):
+            self.phase = "pre-hooks"
+        elif line.startswith(":: Running post-transaction hooks"):
+            self.phase = "hooks"
+        elif line.startswith("checking ") and self.phase in ("sync", "download"):
+            self.phase = "check"
+        elif match := COUNTER_PATTERN.match(line):
+            return self._parse_counter(match)
+        elif match := INSTALL_PATTERN.match(line):
+            self.phase = "install"
+            self.installed_packages += 1
+            self.current_package = match.group(2).rstrip(".")
+        else:
+            return False
+        return True
+
+    def _parse_counter(self, match: re.Match) -> bool:
+        """
+        Parse a counted step line, either a package installation or a hook.
+        """
+        index, total, step = int(match.group(1)), int(match.group(2)), match.group(3)
+        if self.phase == "hooks":
+            self.hooks_run, self.hooks_total = index, total
+            self.current_package = step.rstrip(".")
+            return True
+        if install_match := INSTALL_PATTERN.match(step):
+            self.phase = "install"
+            self.installed_packages, self.total_packages = index, total
+            self.current_package = install_match.group(2).rstrip(".")
+            return True
+        return False
+
+    def download_fraction(self) -> float:
+        """
+        The downloaded fraction, from the download bars when available, else from the started downloads.
+        """
+        if self.phase not in ("sync", "download"):
+            return 1.0
+        if self.download_files:
+            total = self.download_total or sum(
+                size for size, _ in self.download_files.values()
+            )
+            done = sum(
+                size * percent / 100 for size, percent in self.download_files.values()
+            )
+            return min(done / total, 1.0) if total else 0.0
+        if self.total_packages:
+            return min(max(self.downloads_started - 1, 0) / self.total_packages, 1.0)
+        return 0.0
+
+    def fraction(self) -> float:
+        """
+        The overall done fraction of the transaction.
+        """
+        if self.phase == "done":
+            return 1.0
+        install = (
+            self.installed_packages / self.total_packages
+            if self.total_packages
+            else 0.0
+        )
+        hooks = self.hooks_run / self.hooks_total if self.hooks_total else 0.0
+        if self.phase == "hooks" and not self.hooks_total:
+            install = 1.0
+        return min(
+            DOWNLOAD_WEIGHT * self.download_fraction()
+            + INSTALL_WEIGHT * install
+            + HOOKS_WEIGHT * hooks,
+            1.0,
+        )
+
+    def eta(self) -> typing.Optional[float]:
+        """
+        The estimated remaining time in seconds, from the throughput over the last samples.
+        """
+        if len(self._samples) < 2:
+            return None
+        (start, start_fraction), (end, end_fraction) = (
+            self._samples[0],
+            self._samples[-1],
+        )
+        if end <= start or end_fraction <= start_fraction:
+            return None
+        rate = (end_fraction - start_fraction) / (end - start)
+        return (1.0 - end_fraction) / rate
+
+    def finish(self):
+        """
+        Mark the transaction as done.
+        """
+        self.phase = "done"
+        for listener in list(_PROGRESS_LISTENERS):
+            listener(self)
+
+    def to_dict(self) -> dict:
+        """
+        The progress as a dict, for traces and event streams.
+        """
+        return {
+            "description": self.description,
+            "phase": self.phase,
+            "percent": round(self.fraction() * 100, 1),
+            "eta": self.eta(),
+            "total_packages": self.total_packages,
+            "installed_packages": self.installed_packages,
+            "download_total": self.download_total,
+            "downloads_started": self.downloads_started,
+            "hooks_run": self.hooks_run,
+            "hooks_total": self.hooks_total,
+            "current": self.current_package,
+            "elapsed": self.clock() - self.started,
+        }
+
+    def __str__(self) -> str:
+        eta = self.eta()
+        return (
+            f"{self.description} [{self.fraction() * 100:3.0f}%] "
+            + {
+                "sync": _("synchronising"),
+                "download": _("downloading %s") % self.current_package,
+                "check": _("checking packages"),
+                "pre-hooks": _("running hooks"),
+                "install": _("installing %s (%d/%d)")
+                % (self.current_package, self.installed_packages, self.total_packages),
+                "hooks": _("running hooks (%d/%d)")
+                % (self.hooks_run, self.hooks_total),
+                "done": _("done"),
+            }[self.phase]
+            + (f" - ETA {int(eta) // 60:02d}:{int(eta) % 60:02d}" if eta else "")
+        )
+
+
+class ProgressPrinter:
+    """
+    A progress listener drawing the terminal status line with a progress bar, or printing each phase change otherwise.
+    """
+
+    def __init__(self, interval: float = 0.2) -> None:
+        self.interval = interval
+        self._last_print = 0.0
+        self._last_phase = ""
+
+    def __call__(self, progress: TransactionProgress):
+        renderer = archcraftsman.terminal.RENDERER
+        if renderer.is_tty():
+            now = time.monotonic()
+            if progress.phase == "done":
+                renderer.clear_status()
+                archcraftsman.base.print_sub_step(str(progress))
+            elif now - self._last_print >= self.interval:
+                self._last_print = now
+                renderer.status(
+                    f"{archcraftsman.base.SUBSTEP}{progress}{archcraftsman.base.RESET}",
+                    progress.fraction(),
+                )
+        elif progress.phase != self._last_phase:
+            self._last_phase = progress.phase
+            archcraftsman.base.print_sub_step(str(progress))
+
+
+def execute_transaction(
+    command: str, description: str, chroot: bool = False
+) -> archcraftsman.base.ExecutionResult:
+    """
+    Execute a pacman or pacstrap transaction, showing its aggregated progress instead of its raw output.
+    The end of the raw output is printed if the transaction fails.
+    """
+    progress = TransactionProgress(description)
+    printer = ProgressPrinter()
+    add_progress_listener(printer)
+    try:
+        result = archcraftsman.base.execute(
+            f"LC_ALL=C {command}",
+            chroot=chroot,
+            capture_output=True,
+            line_handler=progress.feed,
+        )
+        if progress.phase != "sync":
+            progress.finish()
+        return result
+    except subprocess.CalledProcessError as exception:
+        archcraftsman.terminal.RENDERER.clear_status()
+        for output in (exception.output, exception.stderr):
+            if output:
+                archcraftsman.terminal.RENDERER.line(
+                    output.decode("UTF-8", errors="replace")
+                )
+        raise
+    finally:
+        archcraftsman.terminal.RENDERER.clear_status()
+        remove_progress_listener(printer)
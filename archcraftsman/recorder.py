@@ -0,0 +1,177 @@
+# ArchCraftsman, The careful yet very fast Arch Linux Craftsman.
+# Copyright (C) 2023 Rawleenc
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+The command recording and replaying module.
+"""
+import atexit
+import gzip
+import json
+import subprocess
+import threading
+import time
+
+import archcraftsman.base
+
+FIXTURE_VERSION = 2
+
+
+class ReplayError(LookupError):
+    """
+    The error raised by a replayer for a command absent from its fixture.
+    """
+
+
+def _encode(data: bytes | None) -> str:
+    """
+    Encode a process output to store it in a fixture.
+    """
+    return (data or b"").decode("UTF-8", errors="surrogateescape")
+
+
+def _decode(data: str) -> bytes:
+    """
+    Decode a process output stored in a fixture.
+    """
+    return data.encode("UTF-8", errors="surrogateescape")
+
+
+def load_fixture(file_path: str) -> dict[str, list[dict]]:
+    """
+    Load the recorded executions of a compressed fixture file, by command.
+    """
+    with gzip.open(file_path, "rt", encoding="UTF-8") as fixture_file:
+        fixture = json.load(fixture_file)
+    if fixture.get("version") != FIXTURE_VERSION:
+        raise ValueError(f"Unsupported fixture version in {file_path}.")
+    return fixture["commands"]
+
+
+def save_fixture(file_path: str, commands: dict[str, list[dict]]):
+    """
+    Save recorded executions by command to a compressed fixture file.
+    """
+    with gzip.open(file_path, "wt", encoding="UTF-8") as fixture_file:
+        json.dump({"version": FIXTURE_VERSION, "commands": commands}, fixture_file)
+
+
+class Recorder:
+    """
+    An executor running the commands for real and recording their outputs, return codes and durations.
+    """
+
+    def __init__(self) -> None:
+        self.commands: dict[str, list[dict]] = {}
+        self._lock = threading.Lock()
+
+    def __call__(
+        self, command: str, capture_output: bool
+    ) -> subprocess.CompletedProcess:
+        start = time.monotonic()
+        process = archcraftsman.base.run_process(command, capture_output)
+        with self._lock:
+            self.commands.setdefault(command, []).append(
+                {
+                    "capture_output": capture_output,
+                    "stdout": _encode(process.stdout),
+                    "stderr": _encode(process.stderr),
+                    "returncode": process.returncode,
+                    "duration": time.monotonic() - start,
+                }
+            )
+        return process
+
+    def save(self, file_path: str):
+        """
+        Save the recorded executions to a fixture file.
+        """
+        with self._lock:
+            save_fixture(file_path, self.commands)
+
+
+class Replayer:
+    """
+    An executor answering the commands from a fixture, without running anything.
+    The executions are looked up by command and by whether their output is captured.
+    Successive executions of a command get its successive recorded results, the last one being repeated.
+    A command absent from the fixture raises a ReplayError, or succeeds without output if missing commands are allowed.
+    """
+
+    def __init__(
+        self,
+        commands: dict[str, list[dict]],
+        timings: bool = False,
+        allow_missing: bool = False,
+    ) -> None:
+        self.commands = commands
+        self.timings = timings
+        self.allow_missing = allow_missing
+        self.misses: list[str] = []
+        self._executions: dict[tuple[str, bool], list[dict]] = {}
+        for command, executions in commands.items():
+            for execution in executions:
+                self._executions.setdefault(
+                    (command, execution["capture_output"]), []
+                ).append(execution)
+        self._positions: dict[tuple[str, bool], int] = {}
+        self._lock = threading.Lock()
+
+    def __call__(
+        self, command: str, capture_output: bool
+    ) -> subprocess.CompletedProcess:
+        key = (command, capture_output)
+        with self._lock:
+            executions = self._executions.get(key)
+            if not executions:
+                if not self.allow_missing:
+                    raise ReplayError(f"No recorded execution of: {command}")
+                self.misses.append(command)
+                archcraftsman.base.log(f"No recorded execution of: {command}")
+                return subprocess.CompletedProcess(command, 0, b"", b"")
+            position = self._positions.get(key, 0)
+            self._positions[key] = position + 1
+            execution = executions[min(position, len(executions) - 1)]
+        if self.timings:
+            time.sleep(execution["duration"])
+        return subprocess.CompletedProcess(
+            command,
+            execution["returncode"],
+            _decode(execution["stdout"]) if capture_output else None,
+            _decode(execution["stderr"]) if capture_output else None,
+        )
+
+
+def start_recording(file_path: str) -> Recorder:
+    """
+    Record all real executions from now on, and save them to the fixture file at exit.
+    """
+    recorder = Recorder()
+    archcraftsman.base.set_executor(recorder)
+    atexit.register(recorder.save, file_path)
+    return recorder
+
+
+def start_replay(
+    file_path: str, timings: bool = False, allow_missing: bool = False
+) -> Replayer:
+    """
+    Replay all real executions from the fixture file from now on, optionally with their recorded durations.
+    """
+    replayer = Replayer(
+        load_fixture(file_path), timings=timings, allow_missing=allow_missing
+    )
+    archcraftsman.base.set_executor(replayer)
+    return replayer
@@ -0,0 +1,175 @@
+# ArchCraftsman, The careful yet very fast Arch Linux Craftsman.
+# Copyright (C) 2023 Rawleenc
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+The multi-target module, installing the same config on several disks concurrently.
+"""
+import os
+import subprocess
+import sys
+import time
+import typing
+import zipfile
+
+import archcraftsman.arguments
+import archcraftsman.base
+import archcraftsman.i18n
+import archcraftsman.terminal
+
+_ = archcraftsman.i18n.translate
+
+LOG_DIRECTORY = "/tmp"
+SUMMARY_NAME = "archcraftsman-targets.log"
+
+
+class Target:
+    """
+    The installation of one disk, run by a child installer process writing to its own log.
+    """
+
+    def __init__(self, disk: str, root: str, log_path: str) -> None:
+        self.disk = disk
+        self.root = root
+        self.log_path = log_path
+        self.returncode: typing.Optional[int] = None
+        self.duration = 0.0
+        self._process: typing.Optional[subprocess.Popen] = None
+        self._start = 0.0
+
+    def start(self, command: list[str]):
+        """
+        Start the child installer on this target.
+        """
+        with open(self.log_path, "wb") as log_file:
+            self._process = subprocess.Popen(  # pylint: disable=consider-using-with
+                command + ["--target-root", self.root, "--target-disk", self.disk],
+                stdin=subprocess.DEVNULL,
+                stdout=log_file,
+                stderr=subprocess.STDOUT,
+            )
+        self._start = time.monotonic()
+
+    def poll(self) -> bool:
+        """
+        Check if the child installer is done, recording its return code and duration.
+        """
+        if self.returncode is None and self._process is not None:
+            self.returncode = self._process.poll()
+            if self.returncode is not None:
+                self.duration = time.monotonic() - self._start
+        return self.returncode is not None
+
+    def last_line(self) -> str:
+        """
+        The last non empty line of the log, usually the reason of a failure.
+        """
+        try:
+            with open(self.log_path, "rb") as log_file:
+                log_file.seek(max(0, os.path.getsize(self.log_path) - 4096))
+                lines = log_file.read().decode("UTF-8", "replace").splitlines()
+        except OSError:
+            return ""
+        return next((line.strip() for line in reversed(lines) if line.strip()), "")
+
+    def summary(self) -> str:
+        """
+        The summary line of this target.
+        """
+        duration = f"{int(self.duration) // 60}m{int(self.duration) % 60:02d}s"
+        if self.returncode == 0:
+            return _("%s : installed in %s, log in %s") % (
+                self.disk,
+                duration,
+                self.log_path,
+            )
+        return _("%s : failed with code %s after %s, log in %s : %s") % (
+            self.disk,
+            self.returncode,
+            duration,
+            self.log_path,
+            self.last_line(),
+        )
+
+
+def for_disks(disks: list[str], target_root: str) -> list[Target]:
+    """
+    Build the targets of the given disks, each one mounted in its own directory of the target root.
+    """
+    targets = []
+    for disk in disks:
+        name = os.path.basename(disk)
+        targets.append(
+            Target(
+                disk,
+                os.path.join(target_root, name),
+                os.path.join(LOG_DIRECTORY, f"archcraftsman-{name}.log"),
+            )
+        )
+    return targets
+
+
+def installer_command() -> list[str]:
+    """
+    The command running a child installer, the same way this installer was run.
+    """
+    if os.path.isfile(sys.argv[0]) and zipfile.is_zipfile(sys.argv[0]):
+        command = [sys.executable, sys.argv[0]]
+    else:
+        command = [sys.executable, "-m", "archcraftsman.installer"]
+    command += [
+        "--install",
+        "--config",
+        os.path.abspath(archcraftsman.arguments.config()),
+        "--shared-cache",
+    ]
+    if archcraftsman.arguments.test():
+        command.append("--test")
+    for bundles_dir in archcraftsman.arguments.bundles_dirs():
+        command += ["--bundles-dir", bundles_dir]
+    return command
+
+
+def run(targets: list[Target], command: list[str], interval: float = 1.0) -> bool:
+    """
+    Run the installation of all the targets concurrently, then print and write their combined summary.
+    """
+    for target in targets:
+        archcraftsman.base.print_sub_step(
+            _("Installing %s, its output goes to %s.") % (target.disk, target.log_path)
+        )
+        target.start(command)
+    running = list(targets)
+    while running:
+        time.sleep(interval)
+        for target in [target for target in running if target.poll()]:
+            running.remove(target)
+            archcraftsman.terminal.RENDERER.clear_status()
+            archcraftsman.base.print_sub_step(target.summary())
+        archcraftsman.terminal.RENDERER.status(
+            _("%d of %d installations done")
+            % (len(targets) - len(running), len(targets)),
+            (len(targets) - len(running)) / len(targets),
+        )
+    archcraftsman.terminal.RENDERER.clear_status()
+
+    summary = [target.summary() for target in targets]
+    summary_path = os.path.join(LOG_DIRECTORY, SUMMARY_NAME)
+    with open(summary_path, "w", encoding="UTF-8") as summary_file:
+        summary_file.write("\n".join(summary) + "\n")
+    archcraftsman.base.print_step(_("Summary :"), clear=False)
+    for line in summary:
+        archcraftsman.base.print_sub_step(line)
+    return all(target.returncode == 0 for target in targets)
@@ -0,0 +1,177 @@
+# ArchCraftsman, The careful yet very fast Arch Linux Craftsman.
+# Copyright (C) 2023 Rawleenc
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+The terminal rendering module, drawing directly with ANSI sequences on a terminal
+and degrading to plain uncolored lines otherwise.
+"""
+import contextlib
+import re
+import sys
+import termios
+import threading
+import tty
+import typing
+
+CLEAR_SCREEN = "\033[H\033[2J\033[3J"
+ERASE_LINE = "\r\033[K"
+ANSI_SEQUENCE = re.compile("\033\\[[0-9;]*[A-Za-z]")
+
+
+def progress_bar(fraction: float, width: int = 24) -> str:
+    """
+    Build a progress bar of a done fraction.
+    """
+    done = round(min(max(fraction, 0.0), 1.0) * width)
+    return f"[{'#' * done}{'-' * (width - done)}]"
+
+
+class Renderer:
+    """
+    A renderer of lines and of a persistent status line kept below them.
+    Output is flushed on demand instead of at each line, see flush().
+    """
+
+    def __init__(self, stream: typing.Optional[typing.TextIO] = None) -> None:
+        self._stream = stream
+        self._status = ""
+        self._lock = threading.RLock()
+        self._local = threading.local()
+
+    @property
+    def stream(self) -> typing.TextIO:
+        """
+        The output stream, the current standard output by default.
+        """
+        return self._stream or sys.stdout
+
+    def is_tty(self) -> bool:
+        """
+        Check if the output is a terminal.
+        """
+        return self.stream.isatty()
+
+    def diversion(self) -> typing.Optional[typing.BinaryIO]:
+        """
+        The file the output of the current thread is diverted to, if any.
+        """
+        return getattr(self._local, "target", None)
+
+    @contextlib.contextmanager
+    def divert(self, target: typing.BinaryIO):
+        """
+        Divert the output of the current thread to a file, without colors nor status line.
+        """
+        previous = self.diversion()
+        self._local.target = target
+        try:
+            yield
+        finally:
+            self._local.target = previous
+
+    def start(self):
+        """
+        Stop flushing a terminal output at each line, the renderer flushes when needed.
+        """
+        if self.is_tty() and hasattr(self.stream, "reconfigure"):
+            self.stream.reconfigure(line_buffering=False)  # type: ignore
+
+    def write(self, text: str):
+        """
+        Write some text above the status line, without colors and flushed at each line if the output is not a terminal.
+        """
+        diversion = self.diversion()
+        if diversion is not None:
+            diversion.write(ANSI_SEQUENCE.sub("", text).encode("UTF-8", "replace"))
+            diversion.flush()
+            return
+        with self._lock:
+            if not self.is_tty():
+                # A pipe or a log file is followed line by line, each one is flushed.
+                self.stream.write(ANSI_SEQUENCE.sub("", text))
+                if "\n" in text:
+                    self.stream.flush()
+                return
+            if self._status:
+                self.stream.write(ERASE_LINE + text + self._status)
+                self.stream.flush()
+            else:
+                self.stream.write(text)
+
+    def line(self, text: str = ""):
+        """
+        Write a line above the status line.
+        """
+        self.write(text + "\n")
+
+    def flush(self):
+        """
+        Flush the output, before a prompt or a subprocess.
+        """
+        self.stream.flush()
+
+    def clear(self):
+        """
+        Clear a terminal screen, the status line being redrawn.
+        """
+        if self.diversion() is not None:
+            return
+        with self._lock:
+            if self.is_tty():
+                self.stream.write(CLEAR_SCREEN + self._status)
+
+    def status(self, text: str, fraction: typing.Optional[float] = None):
+        """
+        Draw the status line of a terminal, with a progress bar if a done fraction is given.
+        """
+        if not self.is_tty() or self.diversion() is not None:
+            return
+        with self._lock:
+            bar = "" if fraction is None else progress_bar(fraction) + " "
+            self._status = bar + text
+            self.stream.write(ERASE_LINE + self._status)
+            self.stream.flush()
+
+    def clear_status(self):
+        """
+        Remove the status line.
+        """
+        if self.diversion() is not None:
+            return
+        with self._lock:
+            if self._status and self.is_tty():
+                self.stream.write(ERASE_LINE)
+                self.stream.flush()
+            self._status = ""
+
+
+RENDERER = Renderer()
+
+
+def read_key() -> str:
+    """
+    Read a single key without echo from a terminal, or a single char from any other input.
+    """
+    RENDERER.flush()
+    if not sys.stdin.isatty():
+        return sys.stdin.read(1)
+    fd = sys.stdin.fileno()
+    old_settings = termios.tcgetattr(fd)
+    try:
+        tty.setcbreak(fd)
+        return sys.stdin.read(1)
+    finally:
+        termios.tcsetattr(fd, termios.TCSADRAIN, old_settings)
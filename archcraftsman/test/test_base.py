@@ -22,6 +22,16 @@ import subprocess
 import unittest.mock
 
 import archcraftsman.base
+import archcraftsman.terminal
+
+
+class TerminalStringIO(io.StringIO):
+    """
+    A string output behaving like a terminal.
+    """
+
+    def isatty(self) -> bool:
+        return True
 
 
 class TestBase(unittest.TestCase):
@@ -29,6 +39,12 @@ class TestBase(unittest.TestCase):
     Tests for the base module.
     """
 
+    def setUp(self):
+        archcraftsman.base.EXECUTION_CACHE.clear()
+
+    def tearDown(self):
+        archcraftsman.base.reset_privileges()
+
     @unittest.mock.patch("glob.glob", return_value=["toto", "tata", "titi"])
     @unittest.mock.patch("os.path.isdir", return_value=False)
     def test_glob_completer_first(self, _mock_glob, _mock_isdir):
@@ -110,6 +126,7 @@ class TestBase(unittest.TestCase):
                 ),
                 unittest.mock.patch("archcraftsman.base.is_root", return_value=False),
             ):
+                archcraftsman.base.reset_privileges()
                 self.assertRaises(
                     PermissionError,
                     lambda: archcraftsman.base.execute("echo E", sudo=True),
@@ -118,10 +135,171 @@ class TestBase(unittest.TestCase):
                 unittest.mock.patch("archcraftsman.base.sudo_exist", return_value=True),
                 unittest.mock.patch("archcraftsman.base.is_root", return_value=False),
             ):
+                archcraftsman.base.reset_privileges()
                 self.assertIn(
                     "sudo", archcraftsman.base.execute("echo E", sudo=True).command
                 )
 
+    def test_execution_listener(self):
+        """
+        Test the execution listeners notification.
+        """
+        results = []
+        archcraftsman.base.add_execution_listener(results.append)
+        try:
+            with unittest.mock.patch("subprocess.run") as mock_subprocess_run:
+                mock_subprocess_run.return_value = subprocess.CompletedProcess(
+                    args="false", returncode=1, stdout=b""
+                )
+                self.assertRaises(
+                    subprocess.CalledProcessError,
+                    lambda: archcraftsman.base.execute("false"),
+                )
+            with (
+                unittest.mock.patch("sys.stdout", new_callable=io.StringIO),
+                unittest.mock.patch("archcraftsman.arguments.test", return_value=True),
+            ):
+                archcraftsman.base.execute("echo A", chroot=True)
+        finally:
+            archcraftsman.base.remove_execution_listener(results.append)
+        self.assertEqual(len(results), 2)
+        self.assertEqual(results[0].returncode, 1)
+        self.assertFalse(results[0].fake)
+        self.assertTrue(results[1].fake)
+        self.assertTrue(results[1].chroot)
+        self.assertEqual(results[1].plain_command, "echo A")
+
+    def test_execute_line_handler(self):
+        """
+        Test the streamed execution with a line handler and a bounded output tail.
+        """
+        lines: list[str] = []
+        with unittest.mock.patch("archcraftsman.base.OUTPUT_TAIL_LINES", 3):
+            with self.assertRaises(subprocess.CalledProcessError) as context:
+                archcraftsman.base.execute(
+                    "seq 1 5; printf 'a\\rb'; echo error >&2; exit 2",
+                    capture_output=True,
+                    line_handler=lines.append,
+                )
+        self.assertEqual(
+            sorted(lines), sorted(["1", "2", "3", "4", "5", "a", "b", "error"])
+        )
+        self.assertEqual(context.exception.output, b"5\na\nb")
+        self.assertEqual(context.exception.stderr, b"error")
+
+    def test_split_lines(self):
+        """
+        Test the lines splitting of the streamed outputs, across successive reads.
+        """
+        lines, rest = archcraftsman.base._split_lines(b"first\r", False)
+        self.assertEqual((lines, rest), ([], b"first\r"))
+        lines, rest = archcraftsman.base._split_lines(rest + b"\nsecond", False)
+        self.assertEqual((lines, rest), ([b"first"], b"second"))
+        lines, rest = archcraftsman.base._split_lines(rest + b"\r", True)
+        self.assertEqual((lines, rest), ([b"second"], b""))
+        with unittest.mock.patch.object(archcraftsman.base, "MAX_PARTIAL_LINE", 4):
+            lines, rest = archcraftsman.base._split_lines(b"a\nprogress", False)
+        self.assertEqual((lines, rest), ([b"a", b"progress"], b""))
+
+    def test_execution_cache(self):
+        """
+        Test the execution cache hits and its invalidation by mutating commands.
+        """
+        with unittest.mock.patch("subprocess.run") as mock_subprocess_run:
+            mock_subprocess_run.return_value = subprocess.CompletedProcess(
+                args="lsblk", returncode=0, stdout=b"sda"
+            )
+            for _ in range(2):
+                self.assertEqual(
+                    archcraftsman.base.execute(
+                        'lsblk -nld "/dev/sda1" -o FSTYPE',
+                        force=True,
+                        capture_output=True,
+                        cache={archcraftsman.base.CACHE_BLOCK},
+                    ).output,
+                    "sda",
+                )
+                archcraftsman.base.execute(
+                    "cat /proc/mounts",
+                    force=True,
+                    capture_output=True,
+                    cache={archcraftsman.base.CACHE_MOUNTS},
+                )
+            self.assertEqual(mock_subprocess_run.call_count, 2)
+            archcraftsman.base.execute("fdisk -l", force=True)
+            archcraftsman.base.execute("mkfs.ext4 /dev/sda1", force=True)
+            self.assertFalse(
+                archcraftsman.base.execute(
+                    'lsblk -nld "/dev/sda1" -o FSTYPE',
+                    force=True,
+                    capture_output=True,
+                    cache={archcraftsman.base.CACHE_BLOCK},
+                ).cached
+            )
+            self.assertTrue(
+                archcraftsman.base.execute(
+                    "cat /proc/mounts",
+                    force=True,
+                    capture_output=True,
+                    cache={archcraftsman.base.CACHE_MOUNTS},
+                ).cached
+            )
+        self.assertEqual(
+            archcraftsman.base.EXECUTION_CACHE.stats(),
+            {"hits": 3, "misses": 3, "invalidations": 1},
+        )
+
+    def test_execution_cache_invalidations(self):
+        """
+        Test which commands invalidate the cached block devices state.
+        """
+        for command, invalidates in (
+            ("sgdisk -Z /dev/sda", True),
+            ("gdisk /dev/sda", True),
+            ("cgdisk /dev/sda", True),
+            ("sfdisk --dump /dev/sda", True),
+            ("fdisk -l", False),
+            ("lsblk -nld /dev/sda", False),
+        ):
+            cache = archcraftsman.base.ExecutionCache()
+            cache.put(
+                archcraftsman.base.ExecutionResult(
+                    "lsblk", subprocess.CompletedProcess("lsblk", 0, b"sda")
+                ),
+                True,
+                {archcraftsman.base.CACHE_BLOCK},
+            )
+            cache.invalidate(command)
+            self.assertEqual(cache.get("lsblk", True) is None, invalidates, command)
+
+    def test_execution_cache_failure(self):
+        """
+        Test that a failure cached without check still raises for a checked execution, with its error output.
+        """
+        with unittest.mock.patch("subprocess.run") as mock_subprocess_run:
+            mock_subprocess_run.return_value = subprocess.CompletedProcess(
+                args="pacman -Si foo", returncode=1, stdout=b"", stderr=b"not found"
+            )
+            self.assertFalse(
+                archcraftsman.base.execute(
+                    "pacman -Si foo",
+                    check=False,
+                    force=True,
+                    capture_output=True,
+                    cache={archcraftsman.base.CACHE_PACMAN_DB},
+                )
+            )
+            with self.assertRaises(subprocess.CalledProcessError) as context:
+                archcraftsman.base.execute(
+                    "pacman -Si foo",
+                    force=True,
+                    capture_output=True,
+                    cache={archcraftsman.base.CACHE_PACMAN_DB},
+                )
+            self.assertEqual(mock_subprocess_run.call_count, 1)
+        self.assertEqual(context.exception.returncode, 1)
+        self.assertEqual(context.exception.stderr, b"not found")
+
     @unittest.mock.patch(
         "archcraftsman.base.execute",
         return_value=archcraftsman.base.ExecutionResult(
@@ -157,37 +335,45 @@ class TestBase(unittest.TestCase):
         """
         with unittest.mock.patch("archcraftsman.base.is_root", return_value=True):
             self.assertTrue(archcraftsman.base.elevate())
+        archcraftsman.base.reset_privileges()
         with unittest.mock.patch("archcraftsman.base.sudo_exist", return_value=True):
             self.assertTrue(archcraftsman.base.elevate())
+        archcraftsman.base.reset_privileges()
         with (
             unittest.mock.patch("archcraftsman.base.is_root", return_value=False),
             unittest.mock.patch("archcraftsman.base.sudo_exist", return_value=False),
         ):
             self.assertFalse(archcraftsman.base.elevate())
 
-    @unittest.mock.patch("archcraftsman.base.execute")
+    @unittest.mock.patch("archcraftsman.terminal.read_key")
     def test_pause(
         self,
-        _mock_execute,
+        _mock_read_key,
     ):
         """
         Test the pause function.
         """
-        with unittest.mock.patch("sys.stdout", new_callable=io.StringIO) as mock_stdout:
+        with unittest.mock.patch(
+            "sys.stdout", new_callable=TerminalStringIO
+        ) as mock_stdout:
             archcraftsman.base.pause()
             self.assertEqual(
                 mock_stdout.getvalue(),
                 f"{archcraftsman.base.PROMPT}Press any key to continue...{archcraftsman.base.RESET}\n",
             )
 
-        with unittest.mock.patch("sys.stdout", new_callable=io.StringIO) as mock_stdout:
+        with unittest.mock.patch(
+            "sys.stdout", new_callable=TerminalStringIO
+        ) as mock_stdout:
             archcraftsman.base.pause(start_newline=True)
             self.assertEqual(
                 mock_stdout.getvalue(),
                 f"\n{archcraftsman.base.PROMPT}Press any key to continue...{archcraftsman.base.RESET}\n",
             )
 
-        with unittest.mock.patch("sys.stdout", new_callable=io.StringIO) as mock_stdout:
+        with unittest.mock.patch(
+            "sys.stdout", new_callable=TerminalStringIO
+        ) as mock_stdout:
             archcraftsman.base.pause(end_newline=True)
             self.assertEqual(
                 mock_stdout.getvalue(),
@@ -199,7 +385,9 @@ class TestBase(unittest.TestCase):
         """
         Test the print_error function.
         """
-        with unittest.mock.patch("sys.stdout", new_callable=io.StringIO) as mock_stdout:
+        with unittest.mock.patch(
+            "sys.stdout", new_callable=TerminalStringIO
+        ) as mock_stdout:
             archcraftsman.base.print_error("Error")
             self.assertEqual(
                 mock_stdout.getvalue(),
@@ -211,31 +399,52 @@ class TestBase(unittest.TestCase):
         """
         Test the print_step function.
         """
-        with unittest.mock.patch("sys.stdout", new_callable=io.StringIO) as mock_stdout:
+        with unittest.mock.patch(
+            "sys.stdout", new_callable=TerminalStringIO
+        ) as mock_stdout:
             archcraftsman.base.print_step("Step")
             self.assertEqual(
                 mock_stdout.getvalue(),
-                f"\n{archcraftsman.base.STEP}Step{archcraftsman.base.RESET}\n",
+                f"{archcraftsman.terminal.CLEAR_SCREEN}\n{archcraftsman.base.STEP}Step{archcraftsman.base.RESET}\n",
             )
+        with unittest.mock.patch("sys.stdout", new_callable=io.StringIO) as mock_stdout:
+            archcraftsman.base.print_step("Step")
+            self.assertEqual(mock_stdout.getvalue(), "\nStep\n")
 
     @unittest.mock.patch("archcraftsman.base.execute")
     def test_print_sub_step(self, _mock_execute):
         """
         Test the print_sub_step function.
         """
-        with unittest.mock.patch("sys.stdout", new_callable=io.StringIO) as mock_stdout:
+        with unittest.mock.patch(
+            "sys.stdout", new_callable=TerminalStringIO
+        ) as mock_stdout:
             archcraftsman.base.print_sub_step("Sub step")
             self.assertEqual(
                 mock_stdout.getvalue(),
                 f"{archcraftsman.base.SUBSTEP}+ Sub step{archcraftsman.base.RESET}\n",
             )
 
+    def test_renderer_pipe(self):
+        """
+        Test that a renderer writing to a pipe strips the colors and flushes each line.
+        """
+        with unittest.mock.patch("sys.stdout", new_callable=io.StringIO) as mock_stdout:
+            with unittest.mock.patch.object(mock_stdout, "flush") as mock_flush:
+                archcraftsman.terminal.RENDERER.write("Sub ")
+                mock_flush.assert_not_called()
+                archcraftsman.base.print_sub_step("step")
+                mock_flush.assert_called_once()
+            self.assertEqual(mock_stdout.getvalue(), "Sub + step\n")
+
     @unittest.mock.patch("archcraftsman.arguments.test", return_value=True)
     def test_log(self, _mock_test):
         """
         Test the log function.
         """
-        with unittest.mock.patch("sys.stdout", new_callable=io.StringIO) as mock_stdout:
+        with unittest.mock.patch(
+            "sys.stdout", new_callable=TerminalStringIO
+        ) as mock_stdout:
             archcraftsman.base.log("Log")
             self.assertEqual(
                 mock_stdout.getvalue(),
@@ -247,7 +456,9 @@ class TestBase(unittest.TestCase):
         """
         Test the print_help function.
         """
-        with unittest.mock.patch("sys.stdout", new_callable=io.StringIO) as mock_stdout:
+        with unittest.mock.patch(
+            "sys.stdout", new_callable=TerminalStringIO
+        ) as mock_stdout:
             archcraftsman.base.print_help("Test message", do_pause=True)
             self.assertEqual(
                 mock_stdout.getvalue(),
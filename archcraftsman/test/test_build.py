@@ -0,0 +1,101 @@
+# ArchCraftsman, The careful yet very fast Arch Linux Craftsman.
+# Copyright (C) 2023 Rawleenc
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Tests for the build module.
+"""
+import gettext
+import importlib.util
+import io
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+import zipfile
+
+import archcraftsman.build
+import archcraftsman.i18n
+
+PO_FILE = r"""
+msgid ""
+msgstr ""
+"Language: fr_FR\n"
+"Content-Type: text/plain; charset=UTF-8\n"
+
+#: archcraftsman/autopart.py:37
+msgid "Automatic partitioning :"
+msgstr "Partitionnement automatique :"
+
+#, fuzzy
+msgid "Swap"
+msgstr "Échange"
+
+msgid ""
+"Multi "
+"line"
+msgstr "Plusieurs "
+"lignes \"citées\""
+
+msgid "Untranslated"
+msgstr ""
+"""
+
+
+class TestBuild(unittest.TestCase):
+    """
+    The build test class.
+    """
+
+    def test_compile_po(self):
+        """
+        The PO compilation test, the compiled catalog must be readable by gettext.
+        """
+        translation = gettext.GNUTranslations(
+            io.BytesIO(archcraftsman.i18n.compile_po(PO_FILE))
+        )
+        self.assertEqual(
+            "Partitionnement automatique :",
+            translation.gettext("Automatic partitioning :"),
+        )
+        self.assertEqual('Plusieurs lignes "citées"', translation.gettext("Multi line"))
+        self.assertEqual("Swap", translation.gettext("Swap"))
+        self.assertEqual("Untranslated", translation.gettext("Untranslated"))
+        self.assertEqual("fr_FR", translation.info()["language"])
+
+    def test_build(self):
+        """
+        The zipapp build test, it must only contain bytecode and compiled resources, and run.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            output = archcraftsman.build.build(os.path.join(directory, "test.pyz"))
+            with zipfile.ZipFile(output) as archive:
+                names = archive.namelist()
+                magic = archive.read(archcraftsman.build.MAGIC_FILE)
+            result = subprocess.run(
+                [sys.executable, output, "--help"],
+                capture_output=True,
+                check=False,
+            )
+        self.assertEqual(0, result.returncode, result.stderr)
+        self.assertEqual(
+            ["__main__.py"], [name for name in names if name.endswith(".py")]
+        )
+        self.assertIn("archcraftsman/bundles/manifest.pyc", names)
+        self.assertIn("archcraftsman/bundles/generic/catalog.json", names)
+        self.assertIn("archcraftsman/locales/french.mo", names)
+        self.assertFalse([name for name in names if "/test/" in name])
+        self.assertEqual(importlib.util.MAGIC_NUMBER, magic)
@@ -0,0 +1,174 @@
+# ArchCraftsman, The careful yet very fast Arch Linux Craftsman.
+# Copyright (C) 2023 Rawleenc
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Test the bundles utils module.
+"""
+import os
+import pathlib
+import tempfile
+import unittest
+import unittest.mock
+
+import archcraftsman.bundles.bundle
+import archcraftsman.bundles.genericbundle
+import archcraftsman.bundles.genericcatalog
+import archcraftsman.bundles.manifest
+import archcraftsman.bundles.utils
+
+
+class TestBundlesUtils(unittest.TestCase):
+    """
+    Test the bundles utils module.
+    """
+
+    @unittest.mock.patch("archcraftsman.base.execute")
+    def test_manifest_up_to_date(self, mock_execute):
+        """
+        Test that the static bundles manifest matches the available bundles, without instantiating them.
+        """
+        self.assertEqual(
+            archcraftsman.bundles.manifest.BUNDLES,
+            archcraftsman.bundles.utils.scan_manifest(),
+        )
+        mock_execute.assert_not_called()
+
+    @unittest.mock.patch("importlib.metadata.entry_points", return_value=[])
+    def test_entry_points_lookup(self, mock_entry_points):
+        """
+        Test that the third-party entry points are only read for a name missing from the static manifest.
+        """
+        archcraftsman.bundles.utils.entry_points_manifest.cache_clear()
+        try:
+            archcraftsman.bundles.utils.get_opt_bundle_type_by_name("grub")
+            mock_entry_points.assert_not_called()
+            self.assertIsNone(
+                archcraftsman.bundles.utils.get_opt_bundle_type_by_name("third-party")
+            )
+            mock_entry_points.assert_called_once()
+        finally:
+            archcraftsman.bundles.utils.entry_points_manifest.cache_clear()
+
+    def test_get_bundle_type_by_name(self):
+        """
+        Test the lazy bundle types lookup.
+        """
+        bundle_type = archcraftsman.bundles.utils.get_bundle_type_by_name("zram")
+        self.assertEqual(bundle_type.__name__, "Zram")
+        self.assertIs(
+            archcraftsman.bundles.utils.get_opt_bundle_type_by_name("zram"),
+            bundle_type,
+        )
+        self.assertIs(
+            archcraftsman.bundles.utils.get_bundle_type_by_name("unknown"),
+            archcraftsman.bundles.bundle.Bundle,
+        )
+
+    def test_list_simple_bundles(self):
+        """
+        Test the list_simple_bundles function.
+        """
+        self.assertEqual(
+            [
+                bundle_type.__module__
+                for bundle_type in archcraftsman.bundles.utils.list_simple_bundles()
+            ],
+            [
+                "archcraftsman.bundles.simple.architect",
+                "archcraftsman.bundles.simple.copyacm",
+                "archcraftsman.bundles.simple.grmlzsh",
+                "archcraftsman.bundles.simple.nvidia",
+                "archcraftsman.bundles.simple.terminus",
+                "archcraftsman.bundles.simple.zram",
+            ],
+        )
+
+
+class TestGenericCatalog(unittest.TestCase):
+    """
+    Test the generic bundles catalog module.
+    """
+
+    def tearDown(self):
+        archcraftsman.bundles.genericcatalog.reset()
+
+    def test_catalog(self):
+        """
+        Test the built-in generic bundles catalog.
+        """
+        archcraftsman.bundles.genericcatalog.reset()
+        catalog = archcraftsman.bundles.genericcatalog.catalog()
+        self.assertIn("cups", catalog)
+        self.assertIs(archcraftsman.bundles.genericcatalog.catalog(), catalog)
+        bundle = archcraftsman.bundles.genericbundle.GenericBundle("cups")
+        self.assertIn("cups", bundle.packages())
+        bundle.packages().append("emacs")
+        self.assertNotIn(
+            "emacs",
+            archcraftsman.bundles.genericbundle.GenericBundle("cups").packages(),
+        )
+        self.assertEqual(
+            archcraftsman.bundles.genericbundle.GenericBundle("unknown").packages(), []
+        )
+
+    def test_user_directory(self):
+        """
+        Test the cached loading of a user-supplied generic bundles directory.
+        """
+        with (
+            tempfile.TemporaryDirectory() as bundles_dir,
+            tempfile.TemporaryDirectory() as cache_dir,
+            unittest.mock.patch.dict(os.environ, {"XDG_CACHE_HOME": cache_dir}),
+            unittest.mock.patch(
+                "archcraftsman.arguments.bundles_dirs", return_value=[bundles_dir]
+            ),
+        ):
+            with open(
+                os.path.join(bundles_dir, "site.toml"), "w", encoding="UTF-8"
+            ) as toml_file:
+                toml_file.write('packages = ["htop"]\n')
+            archcraftsman.bundles.genericcatalog.reset()
+            self.assertEqual(
+                archcraftsman.bundles.genericcatalog.catalog()["site"].packages,
+                ["htop"],
+            )
+            cache_file = archcraftsman.bundles.genericcatalog.cache_file(
+                pathlib.Path(bundles_dir)
+            )
+            self.assertTrue(os.path.isfile(cache_file))
+
+            with unittest.mock.patch(
+                "archcraftsman.bundles.genericcatalog.parse_directory"
+            ) as mock_parse:
+                self.assertIn(
+                    "site",
+                    archcraftsman.bundles.genericcatalog.load_directory(
+                        pathlib.Path(bundles_dir)
+                    ),
+                )
+                mock_parse.assert_not_called()
+
+            with open(
+                os.path.join(bundles_dir, "site.toml"), "w", encoding="UTF-8"
+            ) as toml_file:
+                toml_file.write('packages = ["htop", "btop"]\n')
+            os.utime(os.path.join(bundles_dir, "site.toml"), ns=(0, 0))
+            self.assertEqual(
+                archcraftsman.bundles.genericcatalog.load_directory(
+                    pathlib.Path(bundles_dir)
+                )["site"].packages,
+                ["htop", "btop"],
+            )
@@ -0,0 +1,69 @@
+# ArchCraftsman, The careful yet very fast Arch Linux Craftsman.
+# Copyright (C) 2023 Rawleenc
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Tests for the completion module.
+"""
+import unittest
+import unittest.mock
+
+import archcraftsman.completion
+
+
+class TestCompletion(unittest.TestCase):
+    """
+    The completion test class.
+    """
+
+    def test_candidates(self):
+        """
+        The candidates prefix matches test.
+        """
+        candidates = archcraftsman.completion.Candidates(
+            ["vim", "vi", "btop", "vim-airline", "Vulkan", "", "vim"]
+        )
+        self.assertEqual(("vi", "vim", "vim-airline"), candidates.matches("vi"))
+        self.assertEqual(("vim", "vim-airline"), candidates.matches("vim"))
+        self.assertEqual((), candidates.matches("vz"))
+        self.assertEqual(5, len(candidates.matches("")))
+
+        folded = archcraftsman.completion.Candidates(
+            ["vim", "Vulkan", "btop"], ignore_case=True
+        )
+        self.assertEqual(("vim", "Vulkan"), folded.matches("V"))
+
+    def test_completer(self):
+        """
+        The completer test, matches are computed once per text and chained over candidate sets.
+        """
+        completer = archcraftsman.completion.Completer(
+            archcraftsman.completion.Candidates(["fr", "fr-latin9", "us"]),
+            archcraftsman.completion.Candidates(["help"]),
+        )
+        with unittest.mock.patch.object(
+            completer, "matches", wraps=completer.matches
+        ) as matches:
+            self.assertEqual(
+                ["fr", "fr-latin9", None],
+                [completer("f", state) for state in range(3)],
+            )
+            self.assertEqual("help", completer("h", 0))
+            self.assertEqual(2, matches.call_count)
+        self.assertEqual("help", completer("", 3))
+
+        empty = archcraftsman.completion.completer(["btop"], complete_empty=False)
+        self.assertIsNone(empty("", 0))
+        self.assertEqual("btop", empty("b", 0))
@@ -0,0 +1,122 @@
+# ArchCraftsman, The careful yet very fast Arch Linux Craftsman.
+# Copyright (C) 2023 Rawleenc
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Tests for the events and monitor modules.
+"""
+import io
+import json
+import os
+import tempfile
+import unittest
+import unittest.mock
+
+import archcraftsman.base
+import archcraftsman.events
+import archcraftsman.monitor
+
+
+class TestEvents(unittest.TestCase):
+    """
+    Tests for the events and monitor modules.
+    """
+
+    def tearDown(self):
+        archcraftsman.events.stop()
+
+    @unittest.mock.patch("archcraftsman.arguments.test", return_value=True)
+    @unittest.mock.patch("sys.stdout", new_callable=io.StringIO)
+    def test_events_file(self, _mock_stdout, _mock_test):
+        """
+        Test the events emitted to a JSON lines file and the monitor state built from them.
+        """
+        with tempfile.TemporaryDirectory() as events_dir:
+            events_file = os.path.join(events_dir, "events.jsonl")
+            archcraftsman.events.start(events_file, "lab-01")
+            archcraftsman.base.print_step("Partitioning", clear=False)
+            archcraftsman.base.execute("mkfs.ext4 /dev/sda2")
+            archcraftsman.base.print_warning("Slow disk", do_pause=False)
+            archcraftsman.base.print_step("Installation", clear=False)
+            archcraftsman.events.finish("success")
+            archcraftsman.events.finish("exited")
+            archcraftsman.events.stop()
+            with open(events_file, "r", encoding="UTF-8") as file:
+                events = [json.loads(line) for line in file]
+            monitor = archcraftsman.monitor.Monitor()
+            monitor.follow(events_file)
+            monitor.poll(0)
+        self.assertEqual(
+            [event["event"] for event in events],
+            [
+                "start",
+                "phase_start",
+                "command_start",
+                "command_end",
+                "warning",
+                "phase_end",
+                "phase_start",
+                "phase_end",
+                "status",
+            ],
+        )
+        self.assertTrue(events[3]["fake"])
+        self.assertEqual(events[4]["phase"], "Partitioning")
+        machine = monitor.machines["lab-01"]
+        self.assertEqual(
+            (machine.status, machine.phase, machine.commands, machine.warnings),
+            ("success", "Installation", 1, 1),
+        )
+
+    def test_monitor_socket(self):
+        """
+        Test the monitor receiving the events of several machines on a Unix domain socket.
+        """
+        with tempfile.TemporaryDirectory() as socket_dir:
+            socket_path = os.path.join(socket_dir, "events.sock")
+            monitor = archcraftsman.monitor.Monitor()
+            monitor.listen(socket_path)
+            streams = [
+                archcraftsman.events.EventStream(f"unix:{socket_path}", source)
+                for source in ("lab-01", "lab-02")
+            ]
+            streams[0].emit("phase_start", phase="Installation of the base...")
+            streams[0].emit("progress", percent=42.0, eta=60.0)
+            streams[1].emit("phase_start", phase="Generating fstab...")
+            streams[1].emit("status", status="failed")
+            for stream in streams:
+                stream.close()
+            for _ in range(6):
+                monitor.poll(0.1)
+        self.assertEqual(monitor.machines["lab-01"].percent, 42.0)
+        self.assertEqual(monitor.machines["lab-02"].status, "failed")
+        dashboard = archcraftsman.monitor.render(
+            monitor.machines, monitor.machines["lab-01"].last_event, colors=False
+        )
+        self.assertIn("1/2 finished", dashboard)
+        self.assertIn("42% 1m", dashboard)
+
+    @unittest.mock.patch("archcraftsman.base.print_warning")
+    def test_missing_socket(self, mock_warning):
+        """
+        Test that a stream to a socket without listener is disabled instead of failing the installation.
+        """
+        with tempfile.TemporaryDirectory() as socket_dir:
+            stream = archcraftsman.events.EventStream(
+                f"unix:{os.path.join(socket_dir, 'events.sock')}", "lab-01"
+            )
+            stream.emit("status", status="success")
+            stream.close()
+        mock_warning.assert_called_once()
@@ -0,0 +1,126 @@
+# ArchCraftsman, The careful yet very fast Arch Linux Craftsman.
+# Copyright (C) 2023 Rawleenc
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Tests for the geolocation module.
+"""
+import os
+import tempfile
+import threading
+import unittest
+import unittest.mock
+
+import archcraftsman.geolocation
+import archcraftsman.options
+import archcraftsman.prelaunchinfo
+import archcraftsman.timezones
+
+FRANCE = archcraftsman.geolocation.Location("fr-FR", "FR", "Europe/Paris", "geoip")
+
+
+class TestGeolocation(unittest.TestCase):
+    """
+    The geolocation test class.
+    """
+
+    def setUp(self):
+        self.cache = (
+            tempfile.TemporaryDirectory()
+        )  # pylint: disable=consider-using-with
+        self.environment = unittest.mock.patch.dict(
+            os.environ, {"XDG_CACHE_HOME": self.cache.name, "LANG": "C.UTF-8"}
+        )
+        self.environment.start()
+        archcraftsman.geolocation.reset()
+
+    def tearDown(self):
+        archcraftsman.geolocation.reset()
+        self.environment.stop()
+        self.cache.cleanup()
+
+    def test_local_location(self):
+        """
+        The local fallback test, the country code is derived from the live timezone,
+        or the timezone from the keymap country when the live system is in UTC.
+        """
+        timezones = archcraftsman.timezones.TimezoneIndex(
+            {"FR": ["Europe/Paris"], "DE": ["Europe/Berlin", "Europe/Busingen"]}
+        )
+        with unittest.mock.patch.object(
+            archcraftsman.timezones, "index", return_value=timezones
+        ), unittest.mock.patch.object(
+            archcraftsman.geolocation, "live_timezone", return_value="Europe/Paris"
+        ):
+            location = archcraftsman.geolocation.local_location()
+        self.assertEqual("Europe/Paris", location.timezone)
+        self.assertEqual("FR", location.country_code)
+        self.assertEqual("local", location.source)
+
+        with unittest.mock.patch.object(
+            archcraftsman.timezones, "index", return_value=timezones
+        ), unittest.mock.patch.object(
+            archcraftsman.geolocation, "live_timezone", return_value="Etc/UTC"
+        ), unittest.mock.patch.object(
+            archcraftsman.geolocation, "keymap_country", return_value="DE"
+        ):
+            location = archcraftsman.geolocation.local_location()
+        self.assertEqual("Europe/Berlin", location.timezone)
+        self.assertEqual("DE", location.country_code)
+
+    def test_lookup_cached(self):
+        """
+        The lookup test, a fetched location is cached and reused without fetching again.
+        """
+        with unittest.mock.patch.object(
+            archcraftsman.geolocation, "fetch", return_value=FRANCE
+        ) as fetch:
+            self.assertEqual(
+                "Europe/Paris", archcraftsman.geolocation.Lookup().result().timezone
+            )
+            location = archcraftsman.geolocation.Lookup().result(wait=False)
+        fetch.assert_called_once()
+        self.assertEqual("FR", location.country_code)
+        self.assertEqual("cache", location.source)
+
+    def test_late_answer(self):
+        """
+        The pre-launch information test, defaults first then refined by a late answer.
+        """
+        answered = threading.Event()
+
+        def slow_fetch(_timeout):
+            answered.wait(5)
+            return FRANCE
+
+        local = archcraftsman.geolocation.Location(timezone="Etc/UTC")
+        with unittest.mock.patch.object(
+            archcraftsman.geolocation, "fetch", side_effect=slow_fetch
+        ), unittest.mock.patch.object(
+            archcraftsman.geolocation, "local_location", return_value=local
+        ), unittest.mock.patch.object(
+            archcraftsman.geolocation, "TIMEOUT", 0.05
+        ):
+            info = archcraftsman.prelaunchinfo.PreLaunchInfo()
+            language, _ = info.init()
+            self.assertEqual(archcraftsman.options.Languages.ENGLISH, language)
+            self.assertEqual("/usr/share/zoneinfo/Etc/UTC", info.timezone_file())
+            answered.set()
+            for _ in range(100):
+                if archcraftsman.geolocation.start_lookup().result(wait=False):
+                    break
+                threading.Event().wait(0.01)
+            self.assertEqual("/usr/share/zoneinfo/Europe/Paris", info.timezone_file())
+            self.assertEqual("FR", info.country_code())
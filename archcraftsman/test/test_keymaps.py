@@ -0,0 +1,101 @@
+# ArchCraftsman, The careful yet very fast Arch Linux Craftsman.
+# Copyright (C) 2023 Rawleenc
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Tests for the keymaps module.
+"""
+import os
+import tempfile
+import unittest
+import unittest.mock
+
+import archcraftsman.keymaps
+
+KEYMAP_FILES = [
+    "i386/azerty/fr-latin1.map.gz",
+    "i386/azerty/fr-latin9.map.gz",
+    "i386/azerty/fr.map.gz",
+    "i386/qwerty/us.map.gz",
+    "i386/qwerty/de-latin1.map.gz",
+    "i386/dvorak/ANSI-dvorak.map",
+    "i386/include/euro.map.gz",
+    "i386/qwerty/README",
+]
+
+
+class TestKeymaps(unittest.TestCase):
+    """
+    The keymaps test class.
+    """
+
+    def setUp(self):
+        self.directory = (
+            tempfile.TemporaryDirectory()
+        )  # pylint: disable=consider-using-with
+        for path in KEYMAP_FILES:
+            file_path = os.path.join(self.directory.name, "keymaps", path)
+            os.makedirs(os.path.dirname(file_path), exist_ok=True)
+            with open(file_path, "wb"):
+                pass
+        self.keymaps = os.path.join(self.directory.name, "keymaps")
+        self.environment = unittest.mock.patch.dict(
+            os.environ, {"XDG_CACHE_HOME": os.path.join(self.directory.name, "cache")}
+        )
+        self.environment.start()
+
+    def tearDown(self):
+        self.environment.stop()
+        self.directory.cleanup()
+
+    def test_index(self):
+        """
+        The index validation, completion and country lookup test.
+        """
+        keymaps = archcraftsman.keymaps.load_directory(self.keymaps)
+        assert keymaps is not None
+        self.assertEqual(
+            ["ANSI-dvorak", "de-latin1", "fr", "fr-latin1", "fr-latin9", "us"],
+            keymaps.names,
+        )
+        self.assertIn("fr-latin9", keymaps)
+        self.assertNotIn("euro", keymaps)
+        self.assertEqual(["fr", "fr-latin1", "fr-latin9"], keymaps.complete("FR"))
+        self.assertEqual(["ANSI-dvorak"], keymaps.complete("ansi"))
+        self.assertEqual([], keymaps.complete("zz"))
+        self.assertEqual("fr-latin1", keymaps.for_country("FR"))
+        self.assertEqual("us", keymaps.for_country("US"))
+        self.assertIsNone(keymaps.for_country("JP"))
+
+    def test_cache(self):
+        """
+        The index cache test, the tree is only walked again when a directory changed.
+        """
+        archcraftsman.keymaps.load_directory(self.keymaps)
+        with unittest.mock.patch.object(
+            archcraftsman.keymaps, "scan", wraps=archcraftsman.keymaps.scan
+        ) as scan:
+            archcraftsman.keymaps.load_directory(self.keymaps)
+            scan.assert_not_called()
+            os.utime(
+                os.path.join(self.keymaps, "i386", "qwerty"), ns=(0, 1_000_000_000)
+            )
+            archcraftsman.keymaps.load_directory(self.keymaps)
+            scan.assert_called_once()
+        self.assertIsNone(
+            archcraftsman.keymaps.load_directory(
+                os.path.join(self.directory.name, "missing")
+            )
+        )
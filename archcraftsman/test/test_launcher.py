@@ -0,0 +1,267 @@
+# ArchCraftsman, The careful yet very fast Arch Linux Craftsman.
+# Copyright (C) 2023 Rawleenc
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Tests for the launcher, against a local HTTP stand-in for GitHub.
+"""
+import hashlib
+import importlib.util
+import http.server
+import io
+import json
+import os
+import tarfile
+import tempfile
+import threading
+import typing
+import unittest
+import unittest.mock
+import zipfile
+
+import launcher
+
+FILES = {
+    "archcraftsman/__init__.py": b"",
+    "archcraftsman/installer.py": b"print('installer')\n",
+    "configs/example.json": b"{}\n",
+}
+
+
+def tarball(files: dict[str, bytes]) -> bytes:
+    """
+    Build a GitHub like gzipped tarball, with a top level directory.
+    """
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w:gz") as archive:
+        for path, content in {
+            **files,
+            "README.md": b"readme",
+            "archcraftsman/../escape.py": b"",
+        }.items():
+            member = tarfile.TarInfo(f"ArchCraftsman-main/{path}")
+            member.size = len(content)
+            archive.addfile(member, io.BytesIO(content))
+    return buffer.getvalue()
+
+
+class StandIn(http.server.ThreadingHTTPServer):
+    """
+    A local HTTP server answering fixed routes.
+    """
+
+    def __init__(self, routes: dict[str, bytes]):
+        self.routes = routes
+        self.requests: list[str] = []
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            """
+            The routes handler.
+            """
+
+            def do_GET(self):  # pylint: disable=invalid-name
+                """
+                Answer a route, or 404.
+                """
+                server: StandIn = self.server  # type: ignore
+                server.requests.append(self.path)
+                body = server.routes.get(self.path)
+                if body is None:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *_args):  # pylint: disable=arguments-differ
+                pass
+
+        super().__init__(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server_address[1]}"
+        threading.Thread(target=self.serve_forever, args=(0.05,), daemon=True).start()
+
+
+class TestLauncher(unittest.TestCase):
+    """
+    The launcher test class.
+    """
+
+    def setUp(self):
+        self.directory = (
+            tempfile.TemporaryDirectory()
+        )  # pylint: disable=consider-using-with
+        self.archive = tarball(FILES)
+        self.server = StandIn({"/main.tar.gz": self.archive})
+        self.patches = [
+            unittest.mock.patch.object(
+                launcher, "ARCHIVE_URL", self.server.url + "/{ref}.tar.gz"
+            ),
+            unittest.mock.patch.object(
+                launcher, "CONTENTS_URL", self.server.url + "/contents/{path}"
+            ),
+            unittest.mock.patch.object(
+                launcher, "COMMIT_URL", self.server.url + "/commits/{ref}"
+            ),
+            unittest.mock.patch.object(
+                launcher, "TREE_URL", self.server.url + "/trees/{commit}"
+            ),
+            unittest.mock.patch.object(
+                launcher, "RAW_URL", self.server.url + "/raw/{commit}/{path}"
+            ),
+            unittest.mock.patch.object(launcher, "print_sub_step"),
+        ]
+        for active in self.patches:
+            active.start()
+
+    def tearDown(self):
+        for active in self.patches:
+            active.stop()
+        self.server.shutdown()
+        self.server.server_close()
+        self.directory.cleanup()
+
+    def assert_files(self, files: typing.Optional[dict[str, bytes]] = None):
+        """
+        Check that all module files have been downloaded, and only them.
+        """
+        found = {}
+        for directory in launcher.DIRECTORIES:
+            for root, _, names in os.walk(os.path.join(self.directory.name, directory)):
+                for name in names:
+                    path = os.path.join(root, name)
+                    with open(path, "rb") as file:
+                        found[os.path.relpath(path, self.directory.name)] = file.read()
+        self.assertEqual(files or FILES, found)
+
+    def publish(self, commit: str, files: dict[str, bytes]):
+        """
+        Publish a commit of the given files on the stand-in.
+        """
+        self.server.routes["/commits/main"] = commit.encode()
+        self.server.routes[f"/trees/{commit}"] = json.dumps(
+            {
+                "sha": hashlib.sha1(commit.encode()).hexdigest(),
+                "truncated": False,
+                "tree": [
+                    {"path": path, "type": "blob", "sha": launcher.blob_sha(data)}
+                    for path, data in files.items()
+                ]
+                + [{"path": "archcraftsman", "type": "tree", "sha": "0" * 40}],
+            }
+        ).encode()
+        self.server.routes[f"/{commit}.tar.gz"] = tarball(files)
+        for path, data in files.items():
+            self.server.routes[f"/raw/{commit}/{path}"] = data
+
+    def test_download_archive(self):
+        """
+        The single archive download test.
+        """
+        digest = hashlib.sha256(self.archive).hexdigest()
+        self.assertTrue(launcher.download_archive("main", digest, self.directory.name))
+        self.assert_files()
+        self.assertEqual(["/main.tar.gz"], self.server.requests)
+
+    def test_download_archive_hash_mismatch(self):
+        """
+        The archive download test with an unexpected hash, nothing must be put in place.
+        """
+        self.assertFalse(
+            launcher.download_archive("main", "0" * 64, self.directory.name)
+        )
+        self.assertEqual([], os.listdir(self.directory.name))
+
+    def test_sync_cache(self):
+        """
+        The launcher cache test, cold, unchanged then incremental.
+        """
+        with tempfile.TemporaryDirectory() as cache:
+            self.publish("a" * 40, FILES)
+            self.assertTrue(launcher.sync_cache("main", cache, self.directory.name))
+            self.assert_files()
+            self.assertIn(
+                "/aaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaa.tar.gz", self.server.requests
+            )
+
+            self.server.requests.clear()
+            self.assertTrue(launcher.sync_cache("a" * 40, cache, self.directory.name))
+            self.assertEqual([], self.server.requests)
+
+            changed = {**FILES, "archcraftsman/installer.py": b"print('changed')\n"}
+            del changed["configs/example.json"]
+            self.publish("b" * 40, changed)
+            self.assertTrue(launcher.sync_cache("main", cache, self.directory.name))
+            self.assert_files(changed)
+            self.assertEqual(
+                [
+                    "/commits/main",
+                    "/trees/" + "b" * 40,
+                    "/raw/" + "b" * 40 + "/archcraftsman/installer.py",
+                ],
+                self.server.requests,
+            )
+
+    def test_download_files(self):
+        """
+        The file by file fallback download test.
+        """
+
+        def listing(directory: str) -> bytes:
+            return json.dumps(
+                [
+                    {
+                        "type": "file",
+                        "path": path,
+                        "download_url": f"{self.server.url}/raw/{path}",
+                    }
+                    for path in FILES
+                    if path.startswith(directory)
+                ]
+            ).encode()
+
+        self.server.routes.update(
+            {
+                f"/contents/{directory}": listing(directory)
+                for directory in launcher.DIRECTORIES
+            }
+        )
+        self.server.routes.update(
+            {f"/raw/{path}": data for path, data in FILES.items()}
+        )
+        cwd = os.getcwd()
+        os.chdir(self.directory.name)
+        try:
+            launcher.download_files("main")
+        finally:
+            os.chdir(cwd)
+        self.assert_files()
+
+    def test_check_pyz(self):
+        """
+        A single file build is only run when its bytecode matches the running Python version.
+        """
+        path = os.path.join(self.directory.name, "archcraftsman.pyz")
+        for magic, expected in (
+            (importlib.util.MAGIC_NUMBER, True),
+            (b"\0\0\r\n", False),
+        ):
+            with zipfile.ZipFile(path, "w") as archive:
+                archive.writestr(launcher.PYZ_MAGIC_FILE, magic)
+            self.assertEqual(expected, launcher.check_pyz(path))
+        with open(path, "wb") as file:
+            file.write(b"not a zip")
+        self.assertFalse(launcher.check_pyz(path))
+        self.assertFalse(launcher.check_pyz(os.path.join(self.directory.name, "none")))
@@ -0,0 +1,158 @@
+# ArchCraftsman, The careful yet very fast Arch Linux Craftsman.
+# Copyright (C) 2023 Rawleenc
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Test the packages module.
+"""
+import io
+import os
+import subprocess
+import tarfile
+import tempfile
+import unittest
+import unittest.mock
+
+import archcraftsman.base
+import archcraftsman.packages
+
+
+def _add_desc(database: tarfile.TarFile, directory: str, content: str):
+    """
+    Add a desc file to a fake sync database.
+    """
+    data = content.encode("UTF-8")
+    info = tarfile.TarInfo(f"{directory}/desc")
+    info.size = len(data)
+    database.addfile(info, io.BytesIO(data))
+
+
+class TestPackages(unittest.TestCase):
+    """
+    Test the packages module.
+    """
+
+    def test_parse_desc(self):
+        """
+        Test the parse_desc function.
+        """
+        self.assertEqual(
+            archcraftsman.packages.parse_desc(
+                "%NAME%\nvim\n\n%PROVIDES%\nxxd\nvi=1.0\n\n"
+            ),
+            {"NAME": ["vim"], "PROVIDES": ["xxd", "vi=1.0"]},
+        )
+
+    def test_read_sync_databases(self):
+        """
+        Test the read_sync_databases function.
+        """
+        with tempfile.TemporaryDirectory() as sync_db_dir:
+            with tarfile.open(os.path.join(sync_db_dir, "core.db"), "w:gz") as db:
+                _add_desc(db, "vim-9.0-1", "%NAME%\nvim\n\n%PROVIDES%\nvi=1.0\n")
+                _add_desc(db, "cups-2.4-1", "%NAME%\ncups\n\n%GROUPS%\nprinting\n")
+            with open(os.path.join(sync_db_dir, "broken.db"), "wb") as broken_db:
+                broken_db.write(b"not a database")
+            (
+                names,
+                groups,
+                provides,
+                unreadable,
+            ) = archcraftsman.packages.read_sync_databases(sync_db_dir)
+        self.assertEqual(names, {"vim", "cups"})
+        self.assertEqual(groups, {"printing"})
+        self.assertEqual(provides, {"vi"})
+        self.assertEqual(unreadable, ["broken"])
+
+    @unittest.mock.patch(
+        "archcraftsman.packages.read_sync_databases",
+        return_value=({"vim", "cups"}, {"printing"}, {"vi"}, []),
+    )
+    @unittest.mock.patch("archcraftsman.arguments.test", return_value=False)
+    def test_missing(self, _mock_test, _mock_read):
+        """
+        Test the missing method.
+        """
+        archcraftsman.packages.PackagesMeta._instances.clear()
+        try:
+            packages = archcraftsman.packages.Packages()
+            self.assertEqual(packages.packages, ["cups", "vim"])
+            self.assertTrue(packages.exist("printing"))
+            self.assertTrue(packages.exist("vi"))
+            self.assertEqual(
+                packages.missing(["vim", "vi", "printing", "emacs", "nano", "emacs"]),
+                ["emacs", "nano"],
+            )
+        finally:
+            archcraftsman.packages.PackagesMeta._instances.clear()
+
+    @unittest.mock.patch("archcraftsman.arguments.test", return_value=True)
+    def test_missing_test_mode(self, _mock_test):
+        """
+        Test that the readable databases are checked in test mode, all packages existing when none can be read.
+        """
+        for databases, missing in (
+            (({"vim"}, set(), set(), []), ["emacs"]),
+            ((set(), set(), set(), ["core", "extra"]), []),
+        ):
+            archcraftsman.packages.PackagesMeta._instances.clear()
+            try:
+                with unittest.mock.patch(
+                    "archcraftsman.packages.read_sync_databases",
+                    return_value=databases,
+                ):
+                    packages = archcraftsman.packages.Packages()
+                self.assertEqual(packages.missing(["vim", "emacs"]), missing)
+            finally:
+                archcraftsman.packages.PackagesMeta._instances.clear()
+
+    @unittest.mock.patch(
+        "archcraftsman.packages.read_sync_databases",
+        return_value=({"vim"}, set(), set(), ["extra"]),
+    )
+    @unittest.mock.patch("archcraftsman.arguments.test", return_value=False)
+    @unittest.mock.patch("archcraftsman.base.print_warning")
+    def test_unreadable_database(self, mock_warning, _mock_test, _mock_read):
+        """
+        Test that the packages of an unreadable database are listed with pacman, and their provides resolved by pacman.
+        """
+
+        def execute(command: str, **_kwargs) -> archcraftsman.base.ExecutionResult:
+            outputs = {
+                "pacman -Sl extra | awk '{print $2}'": (0, b"nano\n"),
+                "pacman -Sg | awk '{print $1}'": (0, b"printing\n"),
+                "pacman -Sp --noconfirm --print-format %n sh &>/dev/null": (0, b""),
+            }
+            returncode, stdout = outputs.get(command, (1, b""))
+            return archcraftsman.base.ExecutionResult(
+                command, subprocess.CompletedProcess(command, returncode, stdout)
+            )
+
+        archcraftsman.packages.PackagesMeta._instances.clear()
+        try:
+            with unittest.mock.patch("archcraftsman.base.execute", side_effect=execute):
+                packages = archcraftsman.packages.Packages()
+                self.assertEqual(packages.packages, ["nano", "vim"])
+                self.assertEqual(
+                    packages.missing(["vim", "nano", "printing", "sh", "emacs"]),
+                    ["emacs"],
+                )
+            mock_warning.assert_not_called()
+            packages.warn_unreadable()
+            packages.warn_unreadable()
+            mock_warning.assert_called_once()
+            self.assertIn("extra", mock_warning.call_args.args[0])
+        finally:
+            archcraftsman.packages.PackagesMeta._instances.clear()
@@ -0,0 +1,157 @@
+# ArchCraftsman, The careful yet very fast Arch Linux Craftsman.
+# Copyright (C) 2023 Rawleenc
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Tests for the pipeline module.
+"""
+import os
+import subprocess
+import tempfile
+import threading
+import unittest
+import unittest.mock
+
+import archcraftsman.base
+import archcraftsman.basesetup
+import archcraftsman.info
+import archcraftsman.installer
+import archcraftsman.partition
+import archcraftsman.partitioninginfo
+import archcraftsman.pipeline
+
+
+class TestPipeline(unittest.TestCase):
+    """
+    The pipeline test class.
+    """
+
+    def setUp(self):
+        self.directory = (
+            tempfile.TemporaryDirectory()
+        )  # pylint: disable=consider-using-with
+        self.log_path = os.path.join(self.directory.name, "pipeline.log")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def read_log(self) -> str:
+        """
+        Read the pipeline log.
+        """
+        with open(self.log_path, "r", encoding="UTF-8") as log_file:
+            return log_file.read()
+
+    def test_steps(self):
+        """
+        The steps are run in order, their output diverted to the log.
+        """
+        steps = []
+        scheduler = archcraftsman.pipeline.StepScheduler(self.log_path)
+        scheduler.submit("first", lambda: steps.append("first"))
+        scheduler.submit(
+            "second", lambda: archcraftsman.base.print_sub_step("Formatting...")
+        )
+        scheduler.submit(
+            "third", lambda: archcraftsman.base.execute("echo pacstrap output")
+        )
+        scheduler.wait()
+        self.assertEqual(["first"], steps)
+        self.assertEqual(["first", "second", "third"], scheduler.done)
+        self.assertEqual("+ Formatting...\npacstrap output\n", self.read_log())
+
+    def test_failure(self):
+        """
+        The steps after a failed one are skipped, and its error is raised when waiting.
+        """
+        steps = []
+        scheduler = archcraftsman.pipeline.StepScheduler(self.log_path)
+        scheduler.submit("format", lambda: archcraftsman.base.execute("exit 3"))
+        scheduler.submit("base", lambda: steps.append("base"))
+        with self.assertRaises(subprocess.CalledProcessError):
+            scheduler.wait()
+        self.assertTrue(scheduler.failed())
+        self.assertEqual([], steps)
+        self.assertEqual([], scheduler.done)
+
+    def test_stop(self):
+        """
+        Stopping waits for the current step, skips the next ones and doesn't raise.
+        """
+        steps = []
+        started = threading.Event()
+        release = threading.Event()
+        scheduler = archcraftsman.pipeline.StepScheduler(self.log_path)
+        scheduler.submit("format", lambda: (started.set(), release.wait()))
+        scheduler.submit("base", lambda: steps.append("base"))
+        started.wait()
+        threading.Timer(0.1, release.set).start()
+        scheduler.stop()
+        self.assertEqual(["format"], scheduler.done)
+        self.assertEqual([], steps)
+
+    def test_abort_if_failed(self):
+        """
+        The error of a failed step is raised between the setup prompts.
+        """
+        scheduler = archcraftsman.pipeline.StepScheduler(self.log_path)
+        archcraftsman.basesetup.abort_if_failed(scheduler)
+        scheduler.submit("format", lambda: archcraftsman.base.execute("exit 3"))
+        while scheduler.current or not scheduler.failed():
+            threading.Event().wait(0.01)
+        with self.assertRaises(subprocess.CalledProcessError):
+            archcraftsman.basesetup.abort_if_failed(scheduler)
+        archcraftsman.basesetup.abort_if_failed(None)
+
+    def start_base_installation(self, encrypted: bool) -> tuple[str, list[str]]:
+        """
+        Start the base installation, returning the thread formatting the partitions and the background steps.
+        """
+        formatting_threads = []
+        partitioning_info = archcraftsman.partitioninginfo.PartitioningInfo()
+        partitioning_info.partitions.append(
+            archcraftsman.partition.Partition(path="/dev/sda1", encrypted=encrypted)
+        )
+        partitioning_info.format_and_mount_partitions = (
+            lambda: formatting_threads.append(threading.current_thread().name)
+        )
+        with unittest.mock.patch.object(
+            archcraftsman.info.ai, "partitioning_info", partitioning_info
+        ), unittest.mock.patch.object(
+            archcraftsman.installer, "PIPELINE_LOG", self.log_path
+        ), unittest.mock.patch.object(
+            archcraftsman.installer, "update_mirrorlist"
+        ), unittest.mock.patch.object(
+            archcraftsman.installer, "install_base"
+        ):
+            scheduler = archcraftsman.installer.start_base_installation({"base"})
+            scheduler.wait()
+        return formatting_threads[0], scheduler.done
+
+    def test_base_installation(self):
+        """
+        The partitions are formatted in the background with the other steps.
+        """
+        thread, done = self.start_base_installation(encrypted=False)
+        self.assertEqual("pipeline", thread)
+        self.assertEqual(["format", "mirrors", "base"], done)
+
+    def test_base_installation_encrypted(self):
+        """
+        The encrypted partitions are formatted in the foreground, cryptsetup asking for their passphrase.
+        """
+        thread, done = self.start_base_installation(encrypted=True)
+        self.assertEqual(threading.current_thread().name, thread)
+        self.assertEqual(["mirrors", "base"], done)
@@ -0,0 +1,107 @@
+# ArchCraftsman, The careful yet very fast Arch Linux Craftsman.
+# Copyright (C) 2023 Rawleenc
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Tests for the privileges module.
+"""
+import io
+import os
+import subprocess
+import unittest
+import unittest.mock
+
+import archcraftsman.base
+import archcraftsman.privileges
+import archcraftsman.terminal
+
+
+class TestPrivileges(unittest.TestCase):
+    """
+    Tests for the privileges module.
+    """
+
+    def setUp(self):
+        self.broker = archcraftsman.privileges.Broker(launcher=[])
+
+    def tearDown(self):
+        self.broker.stop()
+        archcraftsman.base.set_sudo_executor()
+        archcraftsman.base.reset_privileges()
+
+    def test_broker(self):
+        """
+        Test that the broker helper runs successive commands and sends their outputs back.
+        """
+        process = self.broker("echo out; echo err >&2; exit 3", True)
+        self.assertEqual(
+            (process.returncode, process.stdout, process.stderr),
+            (3, b"out\n", b"err\n"),
+        )
+        with unittest.mock.patch("sys.stdout", new_callable=io.StringIO) as stdout:
+            process = self.broker("echo streamed", False)
+        self.assertEqual(stdout.getvalue(), "streamed\n")
+        self.assertIsNone(process.stdout)
+        diversion = io.BytesIO()
+        with archcraftsman.terminal.RENDERER.divert(diversion):
+            self.broker("echo diverted", False)
+        self.assertEqual(diversion.getvalue(), b"diverted\n")
+
+    def test_sudo_execution(self):
+        """
+        Test that sudo executions go through the broker instead of being prefixed with sudo.
+        """
+        archcraftsman.base.set_sudo_executor(self.broker)
+        with unittest.mock.patch(
+            "archcraftsman.base.privileges", return_value=(False, True)
+        ):
+            result = archcraftsman.base.execute(
+                "echo brokered", force=True, sudo=True, capture_output=True
+            )
+        self.assertEqual(result.command, "echo brokered")
+        self.assertEqual(result.output, "brokered\n")
+
+    def test_broker_stdin(self):
+        """
+        Test that the brokered commands read the client stdin.
+        """
+        read_fd, write_fd = os.pipe()
+        os.write(write_fd, b"answer\n")
+        os.close(write_fd)
+        with open(read_fd, "r", encoding="UTF-8") as stdin, unittest.mock.patch(
+            "sys.stdin", stdin
+        ):
+            process = self.broker("read value; echo got $value", True)
+        self.assertEqual((process.returncode, process.stdout), (0, b"got answer\n"))
+
+    def test_interactive_sudo_execution(self):
+        """
+        Test that interactive sudo executions keep the terminal instead of going through the broker.
+        """
+        archcraftsman.base.set_sudo_executor(self.broker)
+        run_process = unittest.mock.Mock(
+            return_value=subprocess.CompletedProcess("", 0, b"")
+        )
+        with unittest.mock.patch(
+            "archcraftsman.base.privileges", return_value=(False, True)
+        ), unittest.mock.patch(
+            "archcraftsman.base.run_process", run_process
+        ), unittest.mock.patch(
+            "archcraftsman.base._EXECUTOR", run_process
+        ):
+            archcraftsman.base.execute(
+                "nano /etc/pacman.conf", force=True, sudo=True, interactive=True
+            )
+        run_process.assert_called_once_with("sudo nano /etc/pacman.conf", False)
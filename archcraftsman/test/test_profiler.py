@@ -0,0 +1,96 @@
+# ArchCraftsman, The careful yet very fast Arch Linux Craftsman.
+# Copyright (C) 2023 Rawleenc
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Tests for the profiler module.
+"""
+import os
+import tempfile
+import time
+import unittest
+import unittest.mock
+
+import archcraftsman.profiler
+
+
+def busy(duration: float):
+    """
+    Run Python code for a duration.
+    """
+    end = time.monotonic() + duration
+    while time.monotonic() < end:
+        sum(range(100))
+
+
+def wait_for_user(duration: float):
+    """
+    Wait for a duration like a prompt would.
+    """
+    time.sleep(duration)
+
+
+class TestProfiler(unittest.TestCase):
+    """
+    The profiler test class.
+    """
+
+    def test_collapse(self):
+        """
+        The collapse method test.
+        """
+        category, stack = archcraftsman.profiler.collapse(
+            archcraftsman.profiler.sys._getframe()  # pylint: disable=protected-access
+        )
+        self.assertEqual("cpu", category)
+        self.assertEqual(f"{__name__}:test_collapse", stack[-1])
+
+    def test_sampling(self):
+        """
+        The sampling and collapsed stacks writing test.
+        """
+        profiler = archcraftsman.profiler.SamplingProfiler(0.002)
+        with unittest.mock.patch.dict(
+            archcraftsman.profiler.WAIT_FRAMES,
+            {f"{__name__}:wait_for_user": "interactive"},
+        ):
+            profiler.start()
+            try:
+                busy(0.1)
+                wait_for_user(0.1)
+            finally:
+                profiler.stop()
+        self.assertGreater(profiler.categories["cpu"], 0)
+        self.assertGreater(profiler.categories["interactive"], 0)
+        self.assertIn("interactive", profiler.summary())
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "profile.folded")
+            profiler.write(path)
+            with open(path, encoding="UTF-8") as profile_file:
+                lines = profile_file.read().splitlines()
+        self.assertTrue(
+            any(
+                line.startswith("interactive;") and f"{__name__}:wait_for_user " in line
+                for line in lines
+            )
+        )
+        self.assertTrue(
+            any(
+                line.startswith("cpu;") and f"{__name__}:busy" in line for line in lines
+            )
+        )
+        for line in lines:
+            self.assertTrue(line.rsplit(" ", 1)[1].isdigit())
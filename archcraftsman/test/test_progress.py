@@ -0,0 +1,98 @@
+# ArchCraftsman, The careful yet very fast Arch Linux Craftsman.
+# Copyright (C) 2023 Rawleenc
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Tests for the progress module.
+"""
+import unittest
+
+import archcraftsman.progress
+
+TRANSCRIPT = """resolving dependencies...
+looking for conflicting packages...
+
+Packages (4) bash-5.2-1  glibc-2.38-1  linux-6.5-1  vim-9.0-1
+
+Total Download Size:    200.00 MiB
+Total Installed Size:   400.00 MiB
+
+:: Proceed with installation? [Y/n]
+:: Retrieving packages...
+ bash-5.2-1-x86_64 downloading...
+ glibc-2.38-1-x86_64 downloading...
+ linux-6.5-1-x86_64 downloading...
+ vim-9.0-1-x86_64 downloading...
+checking keyring...
+checking package integrity...
+:: Processing package changes...
+installing bash...
+installing glibc...
+installing linux...
+installing vim...
+:: Running post-transaction hooks...
+(1/2) Arming ConditionNeedsUpdate...
+(2/2) Updating linux initcpios..."""
+
+
+class TestProgress(unittest.TestCase):
+    """
+    Tests for the progress module.
+    """
+
+    def test_transaction_progress(self):
+        """
+        Test the aggregation of a pacman transaction output, with a fake clock.
+        """
+        now = [0.0]
+        progress = archcraftsman.progress.TransactionProgress(
+            "Packages", clock=lambda: now[0]
+        )
+        snapshots = []
+        archcraftsman.progress.add_progress_listener(
+            lambda updated: snapshots.append(updated.to_dict())
+        )
+        try:
+            for line in TRANSCRIPT.splitlines():
+                now[0] += 1.0
+                progress.feed(line)
+                if line == "installing glibc...":
+                    self.assertEqual(progress.phase, "install")
+                    self.assertAlmostEqual(progress.fraction(), 0.45 + 0.45 / 2)
+                    self.assertGreater(progress.eta() or 0, 0)
+            progress.finish()
+        finally:
+            archcraftsman.progress._PROGRESS_LISTENERS.clear()
+        self.assertEqual(progress.total_packages, 4)
+        self.assertEqual(progress.download_total, 200 * 1024**2)
+        self.assertEqual((progress.hooks_run, progress.hooks_total), (2, 2))
+        percents = [snapshot["percent"] for snapshot in snapshots]
+        self.assertEqual(percents, sorted(percents))
+        self.assertEqual(snapshots[-1]["percent"], 100.0)
+        self.assertEqual(snapshots[-2]["current"], "Updating linux initcpios")
+
+    def test_download_bars(self):
+        """
+        Test the download fraction computed from pacman progress bars.
+        """
+        progress = archcraftsman.progress.TransactionProgress("Base")
+        progress.feed("Total Download Size:    10.00 MiB")
+        progress.feed(
+            " linux-6.5-1-x86_64    8.0 MiB  2.00 MiB/s 00:02 [####----]  50%"
+        )
+        progress.feed(
+            " vim-9.0-1-x86_64      2.0 MiB  1.00 MiB/s 00:00 [########] 100%"
+        )
+        self.assertAlmostEqual(progress.download_fraction(), 0.6)
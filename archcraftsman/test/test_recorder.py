@@ -0,0 +1,155 @@
+# ArchCraftsman, The careful yet very fast Arch Linux Craftsman.
+# Copyright (C) 2023 Rawleenc
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Tests for the recorder module.
+"""
+import os
+import tempfile
+import unittest
+import unittest.mock
+
+import archcraftsman.base
+import archcraftsman.disk
+import archcraftsman.recorder
+
+
+class TestRecorder(unittest.TestCase):
+    """
+    Tests for the recorder module.
+    """
+
+    def setUp(self):
+        archcraftsman.base.EXECUTION_CACHE.clear()
+
+    def tearDown(self):
+        archcraftsman.base.set_executor()
+
+    def test_record_and_replay(self):
+        """
+        Test that recorded executions are replayed in order without running anything.
+        """
+        recorder = archcraftsman.recorder.Recorder()
+        archcraftsman.base.set_executor(recorder)
+        archcraftsman.base.execute("echo first", force=True, capture_output=True)
+        archcraftsman.base.execute("echo é", force=True, capture_output=True)
+        archcraftsman.base.execute("exit 3", force=True, check=False)
+        with tempfile.TemporaryDirectory() as fixture_dir:
+            fixture = os.path.join(fixture_dir, "fixture.json.gz")
+            recorder.save(fixture)
+            replayer = archcraftsman.recorder.Replayer(
+                archcraftsman.recorder.load_fixture(fixture)
+            )
+        archcraftsman.base.set_executor(replayer)
+        with unittest.mock.patch("subprocess.run") as mock_subprocess_run:
+            self.assertEqual(
+                archcraftsman.base.execute(
+                    "echo é", force=True, capture_output=True
+                ).output,
+                "é\n",
+            )
+            self.assertEqual(
+                archcraftsman.base.execute(
+                    "exit 3", force=True, check=False
+                ).returncode,
+                3,
+            )
+            with self.assertRaises(archcraftsman.recorder.ReplayError):
+                archcraftsman.base.execute("echo unknown", force=True)
+            with self.assertRaises(archcraftsman.recorder.ReplayError):
+                archcraftsman.base.execute(
+                    "exit 3", force=True, check=False, capture_output=True
+                )
+            mock_subprocess_run.assert_not_called()
+
+    def test_replay_successive_results(self):
+        """
+        Test that successive executions of a command get the successive recorded results.
+        """
+        replayer = archcraftsman.recorder.Replayer(
+            {
+                "lsblk": [
+                    {
+                        "capture_output": True,
+                        "stdout": "before",
+                        "stderr": "",
+                        "returncode": 0,
+                        "duration": 0,
+                    },
+                    {
+                        "capture_output": True,
+                        "stdout": "after",
+                        "stderr": "",
+                        "returncode": 0,
+                        "duration": 0,
+                    },
+                ]
+            },
+            allow_missing=True,
+        )
+        archcraftsman.base.set_executor(replayer)
+        outputs = [
+            archcraftsman.base.execute("lsblk", force=True, capture_output=True).output
+            for _ in range(3)
+        ]
+        self.assertEqual(outputs, ["before", "after", "after"])
+        archcraftsman.base.execute("true", force=True)
+        # A command recorded captured isn't replayed uncaptured.
+        archcraftsman.base.execute("lsblk", force=True)
+        self.assertEqual(replayer.misses, ["true", "lsblk"])
+
+    def test_replay_disk(self):
+        """
+        Test a disk probe replayed from a recorded machine.
+        """
+
+        def execution(stdout: str, returncode: int = 0) -> list[dict]:
+            return [
+                {
+                    "capture_output": True,
+                    "stdout": stdout,
+                    "stderr": "",
+                    "returncode": returncode,
+                    "duration": 0,
+                }
+            ]
+
+        archcraftsman.base.set_executor(
+            archcraftsman.recorder.Replayer(
+                {
+                    'lsblk -nl "/dev/sdb" -o PATH,TYPE,PARTTYPENAME | grep part | grep -iE "linux|efi|swap"': execution(
+                        "/dev/sdb1 part EFI System\n/dev/sdb2 part Linux filesystem\n"
+                    ),
+                    'lsblk -b --output SIZE -n -d "/dev/sdb"': execution(
+                        "1000204886016\n"
+                    ),
+                    "lsblk /dev/sdb -o PATH,TYPE,PHY-SEC | grep disk | awk '{print $3}'": execution(
+                        "512\n"
+                    ),
+                    "which sudo": execution("", 1),
+                    "whoami": execution("root\n"),
+                    "fdisk -l | grep /dev/sdb2 | awk '{print $3}'": execution(
+                        "976773119\n"
+                    ),
+                },
+            )
+        )
+        disk = archcraftsman.disk.Disk("/dev/sdb")
+        self.assertEqual(
+            [partition.path for partition in disk.partitions],
+            ["/dev/sdb1", "/dev/sdb2"],
+        )
+        self.assertEqual(disk.free_space, 1000204886016 - 976773119 * 512)
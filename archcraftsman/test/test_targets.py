@@ -0,0 +1,128 @@
+# ArchCraftsman, The careful yet very fast Arch Linux Craftsman.
+# Copyright (C) 2023 Rawleenc
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Tests for the targets module.
+"""
+import os
+import sys
+import tempfile
+import unittest
+import unittest.mock
+
+import archcraftsman.partition
+import archcraftsman.partitioninginfo
+import archcraftsman.targets
+
+
+class TestTargets(unittest.TestCase):
+    """
+    The targets test class.
+    """
+
+    def setUp(self):
+        self.directory = (
+            tempfile.TemporaryDirectory()
+        )  # pylint: disable=consider-using-with
+        patcher = unittest.mock.patch.object(
+            archcraftsman.targets, "LOG_DIRECTORY", self.directory.name
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.directory.cleanup)
+
+    def test_move_to_disk(self):
+        """
+        The partitions are moved to the same numbers on the target disk.
+        """
+        partitioning_info = archcraftsman.partitioninginfo.PartitioningInfo(
+            main_disk="/dev/nvme0n1"
+        )
+        for path in ["/dev/nvme0n1p1", "/dev/nvme0n1p2"]:
+            partitioning_info.partitions.append(
+                archcraftsman.partition.Partition(path=path)
+            )
+        partitioning_info.move_to_disk("/dev/sdb")
+        self.assertEqual("/dev/sdb", partitioning_info.main_disk)
+        self.assertEqual(
+            ["/dev/sdb1", "/dev/sdb2"],
+            [partition.path for partition in partitioning_info.partitions],
+        )
+        partitioning_info.move_to_disk("/dev/mmcblk0")
+        self.assertEqual(
+            ["/dev/mmcblk0p1", "/dev/mmcblk0p2"],
+            [partition.path for partition in partitioning_info.partitions],
+        )
+
+    def test_move_to_disk_other_disk(self):
+        """
+        A partition outside of the main disk can't be moved, and nothing is moved.
+        """
+        partitioning_info = archcraftsman.partitioninginfo.PartitioningInfo(
+            main_disk="/dev/sda"
+        )
+        for path in ["/dev/sda1", "/dev/sdab1"]:
+            partitioning_info.partitions.append(
+                archcraftsman.partition.Partition(path=path)
+            )
+        with self.assertRaises(ValueError):
+            partitioning_info.move_to_disk("/dev/sdc")
+        self.assertEqual("/dev/sda", partitioning_info.main_disk)
+        self.assertEqual("/dev/sda1", partitioning_info.partitions[0].path)
+
+    def test_for_disks(self):
+        """
+        Each target is mounted in its own directory and has its own log.
+        """
+        targets = archcraftsman.targets.for_disks(["/dev/sdb", "/dev/sdc"], "/mnt")
+        self.assertEqual(["/mnt/sdb", "/mnt/sdc"], [target.root for target in targets])
+        self.assertEqual(
+            [
+                os.path.join(self.directory.name, "archcraftsman-sdb.log"),
+                os.path.join(self.directory.name, "archcraftsman-sdc.log"),
+            ],
+            [target.log_path for target in targets],
+        )
+
+    def test_run(self):
+        """
+        The targets are installed by child processes, and their results are summarized.
+        """
+        targets = archcraftsman.targets.for_disks(["/dev/sdb", "/dev/sdc"], "/mnt")
+        command = [
+            sys.executable,
+            "-c",
+            "import sys; print(' '.join(sys.argv[1:])); "
+            "sys.exit(3 if sys.argv[-1] == '/dev/sdc' else 0)",
+        ]
+        self.assertFalse(archcraftsman.targets.run(targets, command, interval=0.01))
+        self.assertEqual([0, 3], [target.returncode for target in targets])
+        with open(targets[0].log_path, "r", encoding="UTF-8") as log_file:
+            self.assertEqual(
+                "--target-root /mnt/sdb --target-disk /dev/sdb\n", log_file.read()
+            )
+        with open(
+            os.path.join(self.directory.name, archcraftsman.targets.SUMMARY_NAME),
+            "r",
+            encoding="UTF-8",
+        ) as summary_file:
+            summary = summary_file.read().splitlines()
+        self.assertEqual(2, len(summary))
+        self.assertTrue(summary[0].startswith("/dev/sdb : installed in 0m00s"))
+        self.assertTrue(summary[1].startswith("/dev/sdc : failed with code 3"))
+        self.assertTrue(
+            summary[1].endswith("--target-root /mnt/sdc --target-disk /dev/sdc")
+        )
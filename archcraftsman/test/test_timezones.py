@@ -0,0 +1,139 @@
+# ArchCraftsman, The careful yet very fast Arch Linux Craftsman.
+# Copyright (C) 2023 Rawleenc
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Tests for the timezones module.
+"""
+import os
+import tempfile
+import unittest
+import unittest.mock
+
+import archcraftsman.timezones
+
+ZONE1970 = """# tzdb timezone descriptions
+AD\t+4230+00131\tEurope/Andorra
+BE,LU,NL\t+5050+00420\tEurope/Brussels
+FR,MC\t+4852+00220\tEurope/Paris
+CH,DE,LI\t+4723+00832\tEurope/Zurich\tBüsingen
+CI,BF,GH,GM,GN,IS,ML,MR,SH,SL,SN,TG\t+0519-00402\tAfrica/Abidjan
+DE,DK,NO,SE,SJ\t+5230+01322\tEurope/Berlin\tmost of Germany
+US\t+404251-0740023\tAmerica/New_York\tEastern (most areas)
+US\t+415100-0873900\tAmerica/Chicago\tCentral (most areas)
+"""
+
+ZONE = """# tzdb timezone descriptions
+BE\t+5050+00420\tEurope/Brussels
+CH\t+4723+00832\tEurope/Zurich
+DE\t+5230+01322\tEurope/Berlin\tmost of Germany
+DE\t+4742+00841\tEurope/Busingen\tBusingen
+DK\t+5540+01235\tEurope/Copenhagen
+IS\t+6409-02151\tAtlantic/Reykjavik
+LU\t+4936+00609\tEurope/Luxembourg
+FR\t+4852+00220\tEurope/Paris
+NL\t+5222+00454\tEurope/Amsterdam
+NO\t+5955+01045\tEurope/Oslo
+SE\t+5920+01803\tEurope/Stockholm
+"""
+
+
+class TestTimezones(unittest.TestCase):
+    """
+    The timezones test class.
+    """
+
+    def setUp(self):
+        self.directory = (
+            tempfile.TemporaryDirectory()
+        )  # pylint: disable=consider-using-with
+        self.zoneinfo = os.path.join(self.directory.name, "zoneinfo")
+        os.makedirs(os.path.join(self.zoneinfo, "Asia"))
+        for name, content in {
+            "zone1970.tab": ZONE1970,
+            "zone.tab": ZONE,
+            "Asia/Calcutta": "",
+        }.items():
+            with open(
+                os.path.join(self.zoneinfo, name), "w", encoding="UTF-8"
+            ) as zone_file:
+                zone_file.write(content)
+        self.environment = unittest.mock.patch.dict(
+            os.environ, {"XDG_CACHE_HOME": os.path.join(self.directory.name, "cache")}
+        )
+        self.environment.start()
+
+    def tearDown(self):
+        self.environment.stop()
+        self.directory.cleanup()
+
+    def test_index(self):
+        """
+        The index validation, completion and country defaults test.
+        """
+        timezones = archcraftsman.timezones.load_directory(self.zoneinfo)
+        self.assertEqual("America/New_York", timezones.for_country("us"))
+        self.assertEqual("Europe/Luxembourg", timezones.for_country("LU"))
+        for country, timezone in {
+            "DE": "Europe/Berlin",
+            "NO": "Europe/Oslo",
+            "SE": "Europe/Stockholm",
+            "DK": "Europe/Copenhagen",
+            "NL": "Europe/Amsterdam",
+            "IS": "Atlantic/Reykjavik",
+            "CH": "Europe/Zurich",
+        }.items():
+            self.assertEqual(timezone, timezones.for_country(country))
+        self.assertEqual("DE", timezones.country_of("Europe/Berlin"))
+        self.assertEqual("CH", timezones.country_of("Europe/Zurich"))
+        self.assertEqual("CI", timezones.country_of("Africa/Abidjan"))
+        self.assertIsNone(timezones.for_country("JP"))
+        self.assertEqual("FR", timezones.country_of("Europe/Paris"))
+        self.assertEqual(
+            ["Europe/Amsterdam", "Europe/Andorra"], timezones.complete("europe/")[:2]
+        )
+        self.assertEqual(
+            os.path.join(self.zoneinfo, "Europe/Paris"),
+            timezones.timezone_file("Europe/Paris"),
+        )
+        self.assertEqual(
+            os.path.join(self.zoneinfo, "Europe/Paris"),
+            timezones.timezone_file(os.path.join(self.zoneinfo, "Europe/Paris")),
+        )
+        self.assertEqual("Asia/Calcutta", timezones.zone_name("Asia/Calcutta"))
+        self.assertEqual("Etc/UTC", timezones.zone_name("Etc/UTC"))
+        self.assertIsNone(timezones.zone_name("Europe/Pari"))
+        self.assertIsNone(timezones.zone_name("../zone.tab"))
+
+    def test_cache(self):
+        """
+        The index cache test, the tables are only parsed again when they changed.
+        """
+        archcraftsman.timezones.load_directory(self.zoneinfo)
+        with unittest.mock.patch.object(
+            archcraftsman.timezones,
+            "parse_table",
+            wraps=archcraftsman.timezones.parse_table,
+        ) as parse_table:
+            cached = archcraftsman.timezones.load_directory(self.zoneinfo)
+            parse_table.assert_not_called()
+            with open(
+                os.path.join(self.zoneinfo, "zone.tab"), "a", encoding="UTF-8"
+            ) as zone_file:
+                zone_file.write("JP\t+353916+1394441\tAsia/Tokyo\n")
+            updated = archcraftsman.timezones.load_directory(self.zoneinfo)
+            self.assertEqual(2, parse_table.call_count)
+        self.assertIsNone(cached.for_country("JP"))
+        self.assertEqual("Asia/Tokyo", updated.for_country("JP"))
@@ -0,0 +1,78 @@
+# ArchCraftsman, The careful yet very fast Arch Linux Craftsman.
+# Copyright (C) 2023 Rawleenc
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Tests for the warmup module.
+"""
+import threading
+import unittest
+import unittest.mock
+
+import archcraftsman.warmup
+
+
+class TestWarmup(unittest.TestCase):
+    """
+    The warmup test class.
+    """
+
+    def tearDown(self):
+        archcraftsman.warmup.reset()
+
+    def test_result_not_started(self):
+        """
+        A lookup not started in the background is run when its result is needed.
+        """
+        function = unittest.mock.MagicMock(return_value=["/dev/sda"])
+        self.assertFalse(archcraftsman.warmup.started("drives"))
+        self.assertEqual(["/dev/sda"], archcraftsman.warmup.result("drives", function))
+        function.assert_called_once()
+
+    def test_result_started(self):
+        """
+        A lookup started in the background is run once and its result is waited for.
+        """
+        release = threading.Event()
+        calls = []
+
+        def lookup():
+            calls.append(threading.current_thread().name)
+            release.wait(5)
+            return ["fr-latin9"]
+
+        future = archcraftsman.warmup.submit("keymaps", lookup)
+        self.assertIs(future, archcraftsman.warmup.submit("keymaps", lookup))
+        self.assertFalse(future.done())
+        release.set()
+        fallback = unittest.mock.MagicMock()
+        self.assertEqual(
+            ["fr-latin9"], archcraftsman.warmup.result("keymaps", fallback)
+        )
+        fallback.assert_not_called()
+        self.assertEqual(1, len(calls))
+        self.assertTrue(calls[0].startswith("warmup"))
+
+    def test_result_error(self):
+        """
+        A failed background lookup raises its error when its result is needed.
+        """
+
+        def lookup():
+            raise OSError("lsblk failed")
+
+        archcraftsman.warmup.submit("drives", lookup)
+        with self.assertRaises(OSError):
+            archcraftsman.warmup.result("drives", lookup)
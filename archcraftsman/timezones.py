@@ -0,0 +1,189 @@
+# ArchCraftsman, The careful yet very fast Arch Linux Craftsman.
+# Copyright (C) 2023 Rawleenc
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+The timezones index module, listing the timezones once from the tzdata country tables.
+"""
+import json
+import os
+import threading
+import typing
+
+import archcraftsman.base
+import archcraftsman.completion
+
+ZONEINFO = "/usr/share/zoneinfo"
+# zone.tab comes first, its rows having a single country they are the main timezones of.
+# The zone1970.tab rows are shared between countries and sorted by their first one.
+ZONE_TABLES = ("zone.tab", "zone1970.tab")
+EXTRA_ZONES = ("UTC", "Etc/UTC")
+
+
+class TimezoneIndex:
+    """
+    The index of all timezones, for validation, completion and per country defaults.
+    """
+
+    def __init__(
+        self, countries: dict[str, list[str]], zoneinfo: str = ZONEINFO
+    ) -> None:
+        self.countries = countries
+        self.zoneinfo = zoneinfo
+        self.names = sorted(
+            {zone for zones in countries.values() for zone in zones}.union(EXTRA_ZONES)
+        )
+        self._names = frozenset(self.names)
+        self.candidates = archcraftsman.completion.Candidates(self.names, True)
+        # A shared timezone belongs to the country listing it first among its own timezones.
+        ranks: dict[str, tuple[int, str]] = {}
+        for country, zones in countries.items():
+            for rank, zone in enumerate(zones):
+                if zone not in ranks or rank < ranks[zone][0]:
+                    ranks[zone] = (rank, country)
+        self._country_of = {zone: country for zone, (_, country) in ranks.items()}
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._names
+
+    def complete(self, prefix: str) -> list[str]:
+        """
+        Get the timezones starting with a case-insensitive prefix.
+        """
+        return list(self.candidates.matches(prefix))
+
+    def for_country(self, country_code: str) -> typing.Optional[str]:
+        """
+        Get the main timezone of a country.
+        """
+        zones = self.countries.get(country_code.upper())
+        return zones[0] if zones else None
+
+    def country_of(self, timezone: str) -> typing.Optional[str]:
+        """
+        Get the country code of a timezone.
+        """
+        return self._country_of.get(timezone)
+
+    def zone_name(self, value: str) -> typing.Optional[str]:
+        """
+        Get the timezone name of a timezone name or zoneinfo file path, None if it does not exist.
+        Aliases missing from the tables are accepted if their zoneinfo file exists.
+        """
+        name = value.strip().removeprefix(self.zoneinfo + "/")
+        if not name or name.startswith("/") or ".." in name.split("/"):
+            return None
+        if name in self or os.path.isfile(os.path.join(self.zoneinfo, name)):
+            return name
+        return None
+
+    def timezone_file(self, value: str) -> typing.Optional[str]:
+        """
+        Get the zoneinfo file path of a timezone name or file path, None if it does not exist.
+        """
+        name = self.zone_name(value)
+        return os.path.join(self.zoneinfo, name) if name else None
+
+
+def parse_table(table_file: typing.TextIO) -> dict[str, list[str]]:
+    """
+    Parse a tzdata country table, mapping each country code to its timezones.
+    """
+    countries: dict[str, list[str]] = {}
+    for line in table_file:
+        if line.startswith("#"):
+            continue
+        fields = line.rstrip("\n").split("\t")
+        if len(fields) < 3:
+            continue
+        for country in fields[0].split(","):
+            countries.setdefault(country, []).append(fields[2])
+    return countries
+
+
+def table_signature(zoneinfo: str) -> list[list]:
+    """
+    Compute the signature of the country tables from their names, sizes and mtimes.
+    """
+    signature = []
+    for table in ZONE_TABLES:
+        try:
+            stat = os.stat(os.path.join(zoneinfo, table))
+        except FileNotFoundError:
+            continue
+        signature.append([table, stat.st_mtime_ns, stat.st_size])
+    return signature
+
+
+def cache_file() -> str:
+    """
+    Get the index cache file path.
+    """
+    cache_dir = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return os.path.join(cache_dir, "archcraftsman", "timezones.json")
+
+
+def load_directory(zoneinfo: str = ZONEINFO) -> TimezoneIndex:
+    """
+    Load the timezones of a zoneinfo directory, from the cached index when up to date.
+    """
+    signature = table_signature(zoneinfo)
+    try:
+        with open(cache_file(), "r", encoding="UTF-8") as index_file:
+            data = json.load(index_file)
+        if data.get("zoneinfo") == zoneinfo and data.get("signature") == signature:
+            return TimezoneIndex(dict(data.get("countries", {})), zoneinfo)
+    except (OSError, ValueError):
+        pass
+    countries: dict[str, list[str]] = {}
+    for table, _mtime, _size in signature:
+        with open(os.path.join(zoneinfo, table), "r", encoding="UTF-8") as table_file:
+            for country, zones in parse_table(table_file).items():
+                known = countries.setdefault(country, [])
+                known.extend(zone for zone in zones if zone not in known)
+    try:
+        os.makedirs(os.path.dirname(cache_file()), exist_ok=True)
+        with open(cache_file(), "w", encoding="UTF-8") as index_file:
+            json.dump(
+                {"zoneinfo": zoneinfo, "signature": signature, "countries": countries},
+                index_file,
+            )
+    except OSError as exception:
+        archcraftsman.base.log(f"Unable to cache the timezones index: {exception}")
+    return TimezoneIndex(countries, zoneinfo)
+
+
+_INDEX: typing.Optional[TimezoneIndex] = None
+_INDEX_LOCK = threading.Lock()
+
+
+def index() -> TimezoneIndex:
+    """
+    Get the shared timezones index, loaded on the first call.
+    """
+    global _INDEX
+    with _INDEX_LOCK:
+        if _INDEX is None:
+            _INDEX = load_directory()
+        return _INDEX
+
+
+def reset():
+    """
+    Reset the shared timezones index so it is reloaded on the next call.
+    """
+    global _INDEX
+    with _INDEX_LOCK:
+        _INDEX = None
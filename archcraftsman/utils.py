@@ -24,8 +24,12 @@ import subprocess
 import typing
 
 import archcraftsman.base
+import archcraftsman.completion
 import archcraftsman.i18n
+import archcraftsman.keymaps
 import archcraftsman.options
+import archcraftsman.timezones
+import archcraftsman.warmup
 
 _ = archcraftsman.i18n.translate
 
@@ -33,7 +37,10 @@ _ = archcraftsman.i18n.translate
 def generate_translations(global_language: str):
     """
     Generate translations for ArchCraftsman.
+    Nothing to do when the package ships its catalogs precompiled.
     """
+    if archcraftsman.i18n.compiled_catalog(global_language) is not None:
+        return
     locale_file_path = importlib.resources.files("archcraftsman.locales").joinpath(
         f"{global_language}.po"
     )
@@ -56,6 +63,7 @@ def to_iec(size: int) -> str:
             f'printf "{size}" | numfmt --to=iec --format="%.0f"',
             capture_output=True,
             force=True,
+            cache={archcraftsman.base.CACHE_SYSTEM},
         ).output,
     )
 
@@ -72,6 +80,7 @@ def from_iec(size: str) -> int:
                 f'printf "{size}" | numfmt --from=iec',
                 capture_output=True,
                 force=True,
+                cache={archcraftsman.base.CACHE_SYSTEM},
             ).output,
         )
         return int(value) if value else 0
@@ -104,17 +113,12 @@ def prompt_option(
     """
     A method to prompt for a bundle.
     """
+    supported_options = [option for option in list(options) if option not in ignores]
     readline.set_completer(
-        lambda text, state: (
-            [
-                option
-                for option in list(options)
-                if (not text or option.value.startswith(text)) and option not in ignores
-            ]
-            + [None]
-        )[state]
+        archcraftsman.completion.completer(
+            [option.value for option in supported_options], ignore_case=True
+        )
     )
-    supported_options = [option for option in list(options) if option not in ignores]
     if supported_msg:
         print_supported(supported_msg, list(options), *ignores)
     option_ok = False
@@ -144,24 +148,11 @@ def ask_keymap(default: str) -> str:
     """
     A method to prompt for a keymap.
     """
-    keymaps = (
-        archcraftsman.base.execute(
-            "localectl list-keymaps",
-            capture_output=True,
-            force=True,
-        )
-        .output.strip()
-        .split("\n")
-    )
+    keymaps = archcraftsman.warmup.result("keymaps", archcraftsman.keymaps.index)
     readline.set_completer(
-        lambda text, state: (
-            [
-                option
-                for option in keymaps + ["help"]
-                if (not text or option.lower().startswith(text.lower()))
-            ]
-            + [None]
-        )[state]
+        archcraftsman.completion.Completer(
+            keymaps.candidates, archcraftsman.completion.Candidates(["help"], True)
+        )
     )
     keymap_ok = False
     keymap = ""
@@ -174,7 +165,7 @@ def ask_keymap(default: str) -> str:
         )
         keymap = archcraftsman.base.prompt_ln(prompt_message, default=default).lower()
         if keymap == "help":
-            archcraftsman.base.print_help(" ".join(keymaps))
+            archcraftsman.base.print_help(" ".join(keymaps.names))
             continue
         if keymap in keymaps:
             keymap_ok = True
@@ -186,6 +177,26 @@ def ask_keymap(default: str) -> str:
     return keymap
 
 
+def ask_timezone(default: str) -> str:
+    """
+    A method to prompt for a timezone, returning its zoneinfo file path.
+    """
+    timezones = archcraftsman.warmup.result("timezones", archcraftsman.timezones.index)
+    readline.set_completer(archcraftsman.completion.Completer(timezones.candidates))
+    timezone_file = None
+    while not timezone_file:
+        timezone = archcraftsman.base.prompt_ln(
+            _("Your timezone (%s) : ") % default, default=default
+        )
+        timezone_file = timezones.timezone_file(timezone)
+        if not timezone_file:
+            archcraftsman.base.print_error(
+                _("Timezone '%s' doesn't exist.") % timezone, do_pause=False
+            )
+    readline.set_completer(archcraftsman.base.glob_completer)
+    return timezone_file
+
+
 def ask_format_type(
     part_type: archcraftsman.options.PartTypes = archcraftsman.options.PartTypes.OTHER,
 ) -> archcraftsman.options.FSFormats:
@@ -259,25 +270,28 @@ def ask_password(prompt_message: str, required: bool = False) -> str:
     return password
 
 
-def ask_drive() -> str:
+def list_drives() -> list[str]:
     """
-    A method to prompt for a drive to partition.
+    A method to list the drives.
     """
-    drives = (
+    return (
         archcraftsman.base.execute(
             "lsblk -lpdno NAME,TYPE | grep disk | awk '{print $1}'",
             capture_output=True,
             force=True,
+            cache={archcraftsman.base.CACHE_BLOCK},
         )
         .output.strip()
         .split("\n")
     )
-    readline.set_completer(
-        lambda text, state: (
-            [option for option in drives if (not text or option.startswith(text))]
-            + [None]
-        )[state]
-    )
+
+
+def ask_drive() -> str:
+    """
+    A method to prompt for a drive to partition.
+    """
+    drives = archcraftsman.warmup.result("drives", list_drives)
+    readline.set_completer(archcraftsman.completion.completer(drives))
     print_supported(_("Detected drives :"), drives)
     drive_ok = False
     drive = ""
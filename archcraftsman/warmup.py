@@ -0,0 +1,79 @@
+# ArchCraftsman, The careful yet very fast Arch Linux Craftsman.
+# Copyright (C) 2023 Rawleenc
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+The warm-up module, running expensive lookups in the background while the user answers the first prompts.
+"""
+import concurrent.futures
+import threading
+import typing
+
+MAX_WORKERS = 4
+
+T = typing.TypeVar("T")
+
+_EXECUTOR: typing.Optional[concurrent.futures.ThreadPoolExecutor] = None
+_TASKS: dict[str, concurrent.futures.Future] = {}
+_LOCK = threading.Lock()
+
+
+def submit(
+    name: str, function: typing.Callable[[], T]
+) -> "concurrent.futures.Future[T]":
+    """
+    Start a named lookup in the background, unless it is already started.
+    """
+    global _EXECUTOR
+    with _LOCK:
+        if name not in _TASKS:
+            if _EXECUTOR is None:
+                _EXECUTOR = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=MAX_WORKERS, thread_name_prefix="warmup"
+                )
+            _TASKS[name] = _EXECUTOR.submit(function)
+        return _TASKS[name]
+
+
+def result(name: str, function: typing.Callable[[], T]) -> T:
+    """
+    Get the result of a named lookup, waiting for it if it is not ready yet.
+    The lookup is run right away if it has not been started in the background.
+    """
+    with _LOCK:
+        future = _TASKS.get(name)
+    if future is None:
+        return function()
+    return future.result()
+
+
+def started(name: str) -> bool:
+    """
+    Check if a named lookup has been started.
+    """
+    with _LOCK:
+        return name in _TASKS
+
+
+def reset():
+    """
+    Forget all the lookups, cancelling those not started yet.
+    """
+    global _EXECUTOR
+    with _LOCK:
+        if _EXECUTOR is not None:
+            _EXECUTOR.shutdown(wait=False, cancel_futures=True)
+        _EXECUTOR = None
+        _TASKS.clear()
@@ -0,0 +1,222 @@
+# ArchCraftsman, The careful yet very fast Arch Linux Craftsman.
+# Copyright (C) 2023 Rawleenc
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+The command plan benchmark module, running a full test installation for each sample config
+and comparing its command plan, subprocess count and CPU time against a stored baseline.
+
+Usage : python -m benchmarks.commandplan [--update-baseline] [--baseline FILE] [configs...]
+"""
+import argparse
+import difflib
+import glob
+import json
+import os
+import sys
+import tempfile
+
+import benchmarks.harness
+
+DEFAULT_BASELINE = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "commandplan_baseline.json"
+)
+DEFAULT_CONFIGS = os.path.join(benchmarks.harness.REPO_ROOT, "configs", "*.json")
+
+COMMAND_PLAN_CODE = """
+import importlib.resources
+import resource
+import threading
+
+import archcraftsman.i18n
+
+# Pin the probes of the machine running the benchmark, so the baseline doesn't depend on it:
+# an UEFI firmware like in the sample configs, an Intel CPU and the catalogs compiled from the sources.
+archcraftsman.base.is_bios = lambda: False
+_CPU_INFO = 'grep </proc/cpuinfo "vendor" | uniq'
+archcraftsman.base.EXECUTION_CACHE.put(
+    archcraftsman.base.ExecutionResult(
+        _CPU_INFO, subprocess.CompletedProcess(_CPU_INFO, 0, b"vendor_id\\t: GenuineIntel\\n")
+    ),
+    True,
+    {archcraftsman.base.CACHE_SYSTEM},
+)
+
+
+def _compiled_catalog(global_language):
+    source = importlib.resources.files(archcraftsman.i18n.LOCALES_PACKAGE).joinpath(f"{global_language}.po")
+    return archcraftsman.i18n.compile_po(source.read_text(encoding="UTF-8")) if source.is_file() else None
+
+
+archcraftsman.i18n.compiled_catalog = _compiled_catalog
+_PLAN = []
+_BACKGROUND_PLAN = []
+
+
+def _record(result):
+    plan = _PLAN if threading.current_thread() is threading.main_thread() else _BACKGROUND_PLAN
+    plan.append(
+        ("(chroot) " if result.chroot else "")
+        + ("(sudo) " if result.sudo else "")
+        + ("(cached) " if result.cached else "" if result.fake else "(run) ")
+        + result.plain_command
+    )
+
+
+archcraftsman.base.add_execution_listener(_record)
+_START_USAGE = resource.getrusage(resource.RUSAGE_SELF)
+status = "exited"
+try:
+    status = _run_installer()
+finally:
+    _END_USAGE = resource.getrusage(resource.RUSAGE_SELF)
+    _finish(
+        status,
+        # Background commands interleave nondeterministically, they are listed sorted after the others.
+        plan=_PLAN + ["(background) " + command for command in sorted(_BACKGROUND_PLAN)],
+        cache=archcraftsman.base.EXECUTION_CACHE.stats(),
+        cpu_seconds=(_END_USAGE.ru_utime - _START_USAGE.ru_utime)
+        + (_END_USAGE.ru_stime - _START_USAGE.ru_stime),
+    )
+"""
+
+
+def run_config(config_file: str) -> dict:
+    """
+    Run a full test installation with a config file and collect its command plan.
+    """
+    with tempfile.TemporaryDirectory() as work_dir:
+        data, _start, _stderr = benchmarks.harness.run(
+            COMMAND_PLAN_CODE,
+            ["--install", "--test", "--config", os.path.abspath(config_file)],
+            cwd=work_dir,
+        )
+    plan = [
+        command.replace(benchmarks.harness.REPO_ROOT, "<repo>")
+        for command in data.get("plan", [])
+    ]
+    return {
+        "status": data["status"],
+        "planned_commands": len(plan),
+        "subprocesses": len(data.get("commands", [])),
+        "chroot_entries": len(
+            [command for command in plan if command.startswith("(chroot) ")]
+        ),
+        "cache_hits": data.get("cache", {}).get("hits", 0),
+        "cache_misses": data.get("cache", {}).get("misses", 0),
+        "cpu_ms": round(data.get("cpu_seconds", 0.0) * 1000, 1),
+        "plan": plan,
+    }
+
+
+def compare(name: str, result: dict, baseline: dict, cpu_tolerance: float) -> list[str]:
+    """
+    Compare a result against its baseline and return all differences.
+    """
+    if not baseline:
+        return [f"{name}: no baseline"]
+    differences = []
+    if result["status"] != baseline["status"]:
+        differences.append(f"{name}: status {baseline['status']} -> {result['status']}")
+    for metric in (
+        "planned_commands",
+        "subprocesses",
+        "chroot_entries",
+        "cache_hits",
+        "cache_misses",
+    ):
+        if result[metric] != baseline.get(metric, 0):
+            differences.append(
+                f"{name}: {metric} {baseline.get(metric, 0)} -> {result[metric]}"
+            )
+    if result["plan"] != baseline["plan"]:
+        differences.append(
+            "\n".join(
+                difflib.unified_diff(
+                    baseline["plan"],
+                    result["plan"],
+                    fromfile=f"{name} (baseline)",
+                    tofile=f"{name} (current)",
+                    lineterm="",
+                )
+            )
+        )
+    if baseline["cpu_ms"] and result["cpu_ms"] > baseline["cpu_ms"] * cpu_tolerance:
+        differences.append(f"{name}: cpu_ms {baseline['cpu_ms']} -> {result['cpu_ms']}")
+    return differences
+
+
+def main() -> int:
+    """
+    The command plan benchmark entry point.
+    """
+    parser = argparse.ArgumentParser(
+        description="ArchCraftsman command plan benchmark."
+    )
+    parser.add_argument(
+        "configs", nargs="*", help="Config files, all sample configs by default."
+    )
+    parser.add_argument(
+        "--baseline", default=DEFAULT_BASELINE, help="Baseline JSON file."
+    )
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="Store the results as the new baseline.",
+    )
+    parser.add_argument(
+        "--cpu-tolerance",
+        type=float,
+        default=2.0,
+        help="Allowed CPU time factor over the baseline before reporting it.",
+    )
+    args = parser.parse_args()
+
+    results = {
+        os.path.basename(config_file): run_config(config_file)
+        for config_file in args.configs or sorted(glob.glob(DEFAULT_CONFIGS))
+    }
+    for name, result in results.items():
+        print(
+            f"{name:<50} {result['status']:<8} commands={result['planned_commands']:<4} "
+            f"subprocesses={result['subprocesses']:<4} chroots={result['chroot_entries']:<4} "
+            f"cache={result['cache_hits']}/{result['cache_hits'] + result['cache_misses']} "
+            f"cpu={result['cpu_ms']}ms"
+        )
+
+    if args.update_baseline:
+        with open(args.baseline, "w", encoding="UTF-8") as baseline_file:
+            json.dump(results, baseline_file, indent=2, sort_keys=True)
+            baseline_file.write("\n")
+        return 0
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, "r", encoding="UTF-8") as baseline_file:
+            baseline = json.load(baseline_file)
+    differences = [
+        difference
+        for name, result in results.items()
+        for difference in compare(
+            name, result, baseline.get(name, {}), args.cpu_tolerance
+        )
+    ]
+    for difference in differences:
+        print(difference, file=sys.stderr)
+    return 1 if differences else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,214 @@
+# ArchCraftsman, The careful yet very fast Arch Linux Craftsman.
+# Copyright (C) 2023 Rawleenc
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+The download pipeline benchmark module. It serves a local repository of synthetic packages through local mirrors
+with various network profiles, and measures the end to end pacman download throughput for each of them.
+Must be run as root on a host with pacman, doesn't need any network access.
+
+Usage : python -m benchmarks.downloads [--scenario NAME] [--packages COUNT] [--size KIB] [--json]
+"""
+import argparse
+import contextlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import typing
+
+import benchmarks.localrepo
+
+MIB = 1024 * 1024
+
+# Each scenario is a list of mirror profiles keyword arguments, in mirrorlist order.
+SCENARIOS: dict[str, list[dict]] = {
+    "unlimited": [{}],
+    "throttled": [{"bandwidth": 4 * MIB, "latency": 0.02}],
+    "high-latency": [{"bandwidth": 16 * MIB, "latency": 0.2}],
+    "failover": [{"failure_rate": 1.0}, {"bandwidth": 4 * MIB, "latency": 0.02}],
+    "flaky": [
+        {"failure_rate": 0.2, "truncate_rate": 0.1, "bandwidth": 4 * MIB},
+        {"failure_rate": 0.2, "truncate_rate": 0.1, "bandwidth": 4 * MIB},
+    ],
+}
+
+# The installer enables 5 parallel downloads, 1 is pacman's default.
+PARALLEL_DOWNLOADS = [1, 5]
+
+
+def missing_prerequisites() -> list[str]:
+    """
+    Get all the missing prerequisites to run the downloads benchmark.
+    """
+    missing = [] if shutil.which("pacman") else ["pacman"]
+    if os.geteuid() != 0:
+        missing.append("root privileges")
+    return missing
+
+
+def rank_mirrors(mirrorlist: str) -> typing.Optional[dict]:
+    """
+    Time the ranking of the mirrorlist with rankmirrors, when available.
+    """
+    if not shutil.which("rankmirrors"):
+        return None
+    start = time.monotonic()
+    process = subprocess.run(
+        ["rankmirrors", "-n", "0", "-r", "core", mirrorlist],
+        capture_output=True,
+        check=False,
+        text=True,
+    )
+    return {
+        "seconds": time.monotonic() - start,
+        "order": [
+            line.split("=", 1)[1].strip()
+            for line in process.stdout.splitlines()
+            if line.startswith("Server")
+        ],
+    }
+
+
+def run_scenario(
+    name: str,
+    repository_root: str,
+    packages: list[benchmarks.localrepo.SyntheticPackage],
+    repository_bytes: int,
+    parallel_downloads: int,
+) -> dict:
+    """
+    Download all the packages of the repository through the scenario mirrors and measure it.
+    """
+    with contextlib.ExitStack() as stack, tempfile.TemporaryDirectory(
+        prefix="archcraftsman-downloads-"
+    ) as work_dir:
+        mirrors = [
+            stack.enter_context(
+                benchmarks.localrepo.MirrorServer(
+                    repository_root, benchmarks.localrepo.MirrorProfile(**profile)
+                )
+            )
+            for profile in SCENARIOS[name]
+        ]
+        mirrorlist = os.path.join(work_dir, "mirrorlist")
+        pacman_conf = os.path.join(work_dir, "pacman.conf")
+        benchmarks.localrepo.write_mirrorlist(mirrorlist, mirrors)
+        benchmarks.localrepo.write_pacman_conf(
+            pacman_conf, work_dir, mirrorlist, parallel_downloads=parallel_downloads
+        )
+        ranking = rank_mirrors(mirrorlist)
+        start = time.monotonic()
+        process = subprocess.run(
+            ["pacman", "--config", pacman_conf, "-Syw", "--noconfirm"]
+            + [package.name for package in packages],
+            capture_output=True,
+            check=False,
+            text=True,
+        )
+        seconds = time.monotonic() - start
+        cached = len(
+            [
+                file_name
+                for file_name in os.listdir(os.path.join(work_dir, "cache"))
+                if file_name.endswith(".pkg.tar.gz")
+            ]
+        )
+    return {
+        "scenario": name,
+        "parallel_downloads": parallel_downloads,
+        "status": "ok"
+        if process.returncode == 0 and cached == len(packages)
+        else f"failed {process.returncode}: {process.stderr.strip()[-200:]}",
+        "seconds": seconds,
+        "throughput_mib_s": repository_bytes / MIB / seconds if seconds else 0.0,
+        "downloaded_packages": cached,
+        "ranking": ranking,
+        "mirrors": [mirror.stats.to_dict() for mirror in mirrors],
+    }
+
+
+def print_results(results: list[dict]):
+    """
+    Print the benchmark results in a human-readable form.
+    """
+    for result in results:
+        mirrors = ", ".join(
+            f"{mirror['requests']} req/{mirror['failures']} fail/{mirror['truncations']} cut"
+            for mirror in result["mirrors"]
+        )
+        print(
+            f"{result['scenario']:<14} x{result['parallel_downloads']:<3}"
+            f"{result['seconds']:>7.2f}s {result['throughput_mib_s']:>8.2f} MiB/s  "
+            f"[{mirrors}] {result['status']}"
+        )
+        if result["ranking"]:
+            print(
+                f"{'':<18}ranked in {result['ranking']['seconds']:.2f}s : "
+                + " > ".join(result["ranking"]["order"])
+            )
+
+
+def main(arguments: typing.Optional[list[str]] = None) -> int:
+    """
+    The downloads benchmark entry point.
+    """
+    parser = argparse.ArgumentParser(description="ArchCraftsman downloads benchmark.")
+    parser.add_argument(
+        "--scenario",
+        action="append",
+        choices=list(SCENARIOS),
+        help="Scenario to run, all by default. Can be used multiple times.",
+    )
+    parser.add_argument(
+        "--packages", type=int, default=20, help="Number of synthetic packages."
+    )
+    parser.add_argument(
+        "--size", type=int, default=1024, help="Size of each package, in KiB."
+    )
+    parser.add_argument("--json", action="store_true", help="Print results as JSON.")
+    args = parser.parse_args(arguments)
+
+    missing = missing_prerequisites()
+    if missing:
+        print(f"Missing prerequisites: {', '.join(missing)}", file=sys.stderr)
+        return 2
+
+    packages = benchmarks.localrepo.synthetic_packages(args.packages, args.size * 1024)
+    with tempfile.TemporaryDirectory(prefix="archcraftsman-repo-") as repository_root:
+        directory = benchmarks.localrepo.build_repository(repository_root, packages)
+        repository_bytes = sum(
+            os.path.getsize(os.path.join(directory, package.file_name))
+            for package in packages
+        )
+        results = [
+            run_scenario(
+                name, repository_root, packages, repository_bytes, parallel_downloads
+            )
+            for name in args.scenario or SCENARIOS
+            for parallel_downloads in PARALLEL_DOWNLOADS
+        ]
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print_results(results)
+    return 0 if all(result["status"] == "ok" for result in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,152 @@
+# ArchCraftsman, The careful yet very fast Arch Linux Craftsman.
+# Copyright (C) 2023 Rawleenc
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+The shared benchmark harness module, running an ArchCraftsman entry point in a fresh instrumented interpreter.
+"""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# The bootstrap code prepended to each benchmark code. It counts the spawned subprocesses and HTTP requests,
+# stops the entry point at its first prompt or pause, and provides _run_installer() and _finish() helpers.
+# argv : result file, "offline" or "online", then the entry point arguments.
+BOOTSTRAP = """
+import builtins
+import getpass
+import io
+import json
+import subprocess
+import sys
+import time
+import urllib.request
+
+_RESULT_FILE = sys.argv[1]
+_OFFLINE = sys.argv[2] == "offline"
+_ARGUMENTS = sys.argv[3:]
+_COMMANDS = []
+_REQUESTS = []
+
+
+class _FirstPrompt(BaseException):
+    pass
+
+
+_execute_child = subprocess.Popen._execute_child
+
+
+def _counting_execute_child(self, args, *other_args, **kwargs):
+    _COMMANDS.append(args if isinstance(args, str) else " ".join(str(arg) for arg in args))
+    return _execute_child(self, args, *other_args, **kwargs)
+
+
+subprocess.Popen._execute_child = _counting_execute_child
+
+_urlopen = urllib.request.urlopen
+
+
+def _counting_urlopen(url, *args, **kwargs):
+    _REQUESTS.append(str(getattr(url, "full_url", url)))
+    if _OFFLINE:
+        return io.BytesIO(b'{"languages": "en-US", "country_code": "US", "timezone": "Etc/UTC"}')
+    return _urlopen(url, *args, **kwargs)
+
+
+urllib.request.urlopen = _counting_urlopen
+
+
+def _first_prompt(*args, **kwargs):
+    raise _FirstPrompt()
+
+
+builtins.input = _first_prompt
+getpass.getpass = _first_prompt
+
+import archcraftsman.base
+
+archcraftsman.base.input_char = _first_prompt
+archcraftsman.base.pause = _first_prompt
+
+
+def _run_installer():
+    sys.argv = ["archcraftsman"] + _ARGUMENTS
+    try:
+        import archcraftsman.installer
+
+        archcraftsman.installer.main()
+    except _FirstPrompt:
+        return "prompt"
+    except SystemExit as exception:
+        return f"exit {exception.code}"
+    return "exit 0"
+
+
+def _finish(status, **extra):
+    with open(_RESULT_FILE, "w", encoding="UTF-8") as result_file:
+        json.dump(
+            dict(time=time.time(), status=status, commands=_COMMANDS, requests=_REQUESTS, **extra),
+            result_file,
+        )
+"""
+
+
+def run(
+    code: str,
+    arguments: list[str],
+    cwd: str = REPO_ROOT,
+    offline: bool = True,
+    python_options: tuple[str, ...] = (),
+) -> tuple[dict, float, str]:
+    """
+    Run the bootstrap followed by the given code in a fresh interpreter.
+    Return the result dict written by _finish(), the wall clock start time and the stderr output.
+    """
+    with tempfile.NamedTemporaryFile(suffix=".json") as result_file:
+        start = time.time()
+        process = subprocess.run(
+            [
+                sys.executable,
+                *python_options,
+                "-c",
+                BOOTSTRAP + code,
+                result_file.name,
+                "offline" if offline else "online",
+                *arguments,
+            ],
+            cwd=cwd,
+            env=dict(
+                os.environ,
+                PYTHONPATH=os.pathsep.join(
+                    filter(None, [REPO_ROOT, os.environ.get("PYTHONPATH")])
+                ),
+            ),
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            check=False,
+        )
+        stderr = process.stderr.decode("UTF-8", errors="replace")
+        try:
+            with open(result_file.name, "r", encoding="UTF-8") as file:
+                data = json.load(file)
+        except ValueError:
+            data = {"time": time.time(), "status": f"crash {process.returncode}"}
+    return data, start, stderr
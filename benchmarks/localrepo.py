@@ -0,0 +1,373 @@
+# ArchCraftsman, The careful yet very fast Arch Linux Craftsman.
+# Copyright (C) 2023 Rawleenc
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+The local pacman repository module. It builds a small repository of synthetic packages and serves it over
+local HTTP mirrors with configurable bandwidth, latency and failure injection, as a reproducible stand-in
+for the real Arch Linux mirrors in download tests and benchmarks.
+"""
+import hashlib
+import http.server
+import io
+import os
+import random
+import shutil
+import subprocess
+import tarfile
+import threading
+import time
+import typing
+
+ARCH = "x86_64"
+CHUNK_SIZE = 16 * 1024
+
+
+class SyntheticPackage:
+    """
+    A synthetic package description.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        size: int,
+        version: str = "1.0-1",
+        depends: typing.Optional[list[str]] = None,
+        groups: typing.Optional[list[str]] = None,
+    ) -> None:
+        self.name = name
+        self.size = size
+        self.version = version
+        self.depends = depends or []
+        self.groups = groups or []
+
+    @property
+    def file_name(self) -> str:
+        """
+        The package archive file name.
+        """
+        return f"{self.name}-{self.version}-{ARCH}.pkg.tar.gz"
+
+
+def _add_file(archive: tarfile.TarFile, name: str, data: bytes, mode: int = 0o644):
+    """
+    Add an in-memory file to a tar archive.
+    """
+    info = tarfile.TarInfo(name)
+    info.size = len(data)
+    info.mode = mode
+    info.mtime = 0
+    archive.addfile(info, io.BytesIO(data))
+
+
+def build_package(directory: str, package: SyntheticPackage, seed: int = 0) -> str:
+    """
+    Build a synthetic package archive with an incompressible payload and return its path.
+    """
+    lines = [
+        f"pkgname = {package.name}",
+        f"pkgbase = {package.name}",
+        f"pkgver = {package.version}",
+        f"pkgdesc = Synthetic {package.name} package",
+        "builddate = 0",
+        "packager = ArchCraftsman benchmarks",
+        f"size = {package.size}",
+        f"arch = {ARCH}",
+        "license = GPL3",
+    ]
+    lines += [f"group = {group}" for group in package.groups]
+    lines += [f"depend = {depend}" for depend in package.depends]
+    payload = random.Random(f"{seed}-{package.name}").randbytes(package.size)
+    path = os.path.join(directory, package.file_name)
+    with tarfile.open(path, "w:gz", compresslevel=1) as archive:
+        _add_file(archive, ".PKGINFO", ("\n".join(lines) + "\n").encode("UTF-8"))
+        _add_file(archive, f"usr/share/{package.name}/payload", payload)
+    return path
+
+
+def _desc(package: SyntheticPackage, path: str) -> str:
+    """
+    Build the sync database desc file content of a package.
+    """
+    with open(path, "rb") as package_file:
+        sha256sum = hashlib.sha256(package_file.read()).hexdigest()
+    sections = {
+        "FILENAME": [package.file_name],
+        "NAME": [package.name],
+        "BASE": [package.name],
+        "VERSION": [package.version],
+        "DESC": [f"Synthetic {package.name} package"],
+        "GROUPS": package.groups,
+        "CSIZE": [str(os.path.getsize(path))],
+        "ISIZE": [str(package.size)],
+        "SHA256SUM": [sha256sum],
+        "ARCH": [ARCH],
+        "BUILDDATE": ["0"],
+        "PACKAGER": ["ArchCraftsman benchmarks"],
+        "DEPENDS": package.depends,
+    }
+    return "".join(
+        f"%{section}%\n" + "".join(f"{value}\n" for value in values) + "\n"
+        for section, values in sections.items()
+        if values
+    )
+
+
+def write_database(
+    directory: str, repo: str, packages: dict[SyntheticPackage, str]
+) -> str:
+    """
+    Write a sync database the way repo-add does, for hosts without it, and return its path.
+    """
+    database_path = os.path.join(directory, f"{repo}.db.tar.gz")
+    with tarfile.open(database_path, "w:gz") as database:
+        for package, path in packages.items():
+            _add_file(
+                database,
+                f"{package.name}-{package.version}/desc",
+                _desc(package, path).encode("UTF-8"),
+            )
+    shutil.copyfile(database_path, os.path.join(directory, f"{repo}.db"))
+    return database_path
+
+
+def build_repository(
+    root: str, packages: list[SyntheticPackage], repo: str = "core", seed: int = 0
+) -> str:
+    """
+    Build a repository of synthetic packages under root/repo/os/arch and return its directory.
+    repo-add is used when available, otherwise the database is written directly.
+    """
+    directory = os.path.join(root, repo, "os", ARCH)
+    os.makedirs(directory, exist_ok=True)
+    paths = {package: build_package(directory, package, seed) for package in packages}
+    if shutil.which("repo-add"):
+        subprocess.run(
+            ["repo-add", "-q", os.path.join(directory, f"{repo}.db.tar.gz")]
+            + list(paths.values()),
+            check=True,
+            stdout=subprocess.DEVNULL,
+        )
+    else:
+        write_database(directory, repo, paths)
+    return directory
+
+
+def synthetic_packages(
+    count: int, size: int, prefix: str = "synthetic"
+) -> list[SyntheticPackage]:
+    """
+    Describe a set of synthetic packages of the same size, each one depending on the previous one.
+    """
+    return [
+        SyntheticPackage(
+            f"{prefix}{index:03}",
+            size,
+            depends=[f"{prefix}{index - 1:03}"] if index else [],
+            groups=[f"{prefix}-group"],
+        )
+        for index in range(count)
+    ]
+
+
+class MirrorProfile:
+    """
+    The network behaviour of a local mirror.
+    bandwidth is in bytes per second for each connection, 0 for unlimited, latency in seconds before each answer,
+    failure_rate the probability to answer 503, truncate_rate the probability to drop a connection mid-transfer,
+    fail_paths the path suffixes always answered 404.
+    """
+
+    def __init__(
+        self,
+        bandwidth: int = 0,
+        latency: float = 0.0,
+        failure_rate: float = 0.0,
+        truncate_rate: float = 0.0,
+        fail_paths: tuple[str, ...] = (),
+        seed: int = 0,
+    ) -> None:
+        self.bandwidth = bandwidth
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.truncate_rate = truncate_rate
+        self.fail_paths = fail_paths
+        self.random = random.Random(seed)
+
+
+class MirrorStats:
+    """
+    The counters of a local mirror.
+    """
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.failures = 0
+        self.truncations = 0
+        self.bytes_sent = 0
+
+    def to_dict(self) -> dict[str, int]:
+        """
+        The counters as a dict.
+        """
+        with self.lock:
+            return {
+                "requests": self.requests,
+                "failures": self.failures,
+                "truncations": self.truncations,
+                "bytes_sent": self.bytes_sent,
+            }
+
+
+class _MirrorRequestHandler(http.server.SimpleHTTPRequestHandler):
+    """
+    A static file handler applying the mirror profile.
+    """
+
+    profile: MirrorProfile
+    stats: MirrorStats
+    truncating = False
+
+    def log_message(self, *args) -> None:  # pylint: disable=arguments-differ
+        pass
+
+    def send_head(self):
+        with self.stats.lock:
+            self.stats.requests += 1
+            failing = self.profile.random.random() < self.profile.failure_rate
+            self.truncating = self.profile.random.random() < self.profile.truncate_rate
+        if self.profile.latency:
+            time.sleep(self.profile.latency)
+        if self.path.split("?")[0].endswith(self.profile.fail_paths or ("\0",)):
+            failing = True
+            error = http.HTTPStatus.NOT_FOUND
+        else:
+            error = http.HTTPStatus.SERVICE_UNAVAILABLE
+        if failing:
+            with self.stats.lock:
+                self.stats.failures += 1
+            self.send_error(error)
+            return None
+        return super().send_head()
+
+    def copyfile(self, source, outputfile) -> None:
+        remaining = os.fstat(source.fileno()).st_size
+        if self.truncating:
+            remaining //= 2
+            with self.stats.lock:
+                self.stats.truncations += 1
+        while remaining > 0:
+            chunk = source.read(min(CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            start = time.monotonic()
+            outputfile.write(chunk)
+            remaining -= len(chunk)
+            with self.stats.lock:
+                self.stats.bytes_sent += len(chunk)
+            if self.profile.bandwidth:
+                delay = len(chunk) / self.profile.bandwidth - (time.monotonic() - start)
+                if delay > 0:
+                    time.sleep(delay)
+        if self.truncating:
+            self.close_connection = True
+
+
+class MirrorServer:
+    """
+    A local HTTP mirror serving a directory in a background thread, to use as a context manager.
+    """
+
+    def __init__(
+        self, root: str, profile: typing.Optional[MirrorProfile] = None
+    ) -> None:
+        self.root = root
+        self.profile = profile or MirrorProfile()
+        self.stats = MirrorStats()
+        handler = type(
+            "MirrorRequestHandler",
+            (_MirrorRequestHandler,),
+            {"profile": self.profile, "stats": self.stats},
+        )
+        self._server = http.server.ThreadingHTTPServer(
+            ("127.0.0.1", 0),
+            lambda *args: handler(*args, directory=self.root),
+        )
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, args=(0.05,), daemon=True
+        )
+
+    @property
+    def url(self) -> str:
+        """
+        The mirror base URL.
+        """
+        return f"http://127.0.0.1:{self._server.server_address[1]}"
+
+    @property
+    def server_line(self) -> str:
+        """
+        The mirrorlist line of this mirror.
+        """
+        return f"Server = {self.url}/$repo/os/$arch"
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+
+
+def write_mirrorlist(path: str, mirrors: list[MirrorServer]):
+    """
+    Write a mirrorlist of the given mirrors, in order.
+    """
+    with open(path, "w", encoding="UTF-8") as mirrorlist:
+        mirrorlist.write("".join(f"{mirror.server_line}\n" for mirror in mirrors))
+
+
+def write_pacman_conf(
+    path: str,
+    work_dir: str,
+    mirrorlist: str,
+    repo: str = "core",
+    parallel_downloads: int = 5,
+):
+    """
+    Write a pacman configuration isolated in a working directory and using the given mirrorlist.
+    """
+    for directory in ("root", "db", "cache", "gnupg", "hooks"):
+        os.makedirs(os.path.join(work_dir, directory), exist_ok=True)
+    with open(path, "w", encoding="UTF-8") as pacman_conf:
+        pacman_conf.write(
+            "[options]\n"
+            f"RootDir = {work_dir}/root\n"
+            f"DBPath = {work_dir}/db\n"
+            f"CacheDir = {work_dir}/cache\n"
+            f"LogFile = {work_dir}/pacman.log\n"
+            f"GPGDir = {work_dir}/gnupg\n"
+            f"HookDir = {work_dir}/hooks\n"
+            f"Architecture = {ARCH}\n"
+            "SigLevel = Never\n"
+            f"ParallelDownloads = {parallel_downloads}\n"
+            f"\n[{repo}]\n"
+            f"Include = {mirrorlist}\n"
+        )
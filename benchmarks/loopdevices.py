@@ -0,0 +1,336 @@
+# ArchCraftsman, The careful yet very fast Arch Linux Craftsman.
+# Copyright (C) 2023 Rawleenc
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+The loop devices integration benchmark module. It attaches sparse image files as loop devices, then really partitions,
+formats, encrypts, mounts and unmounts them through the installer code paths, with a local target directory
+instead of /mnt, and times each phase. Must be run as root, doesn't need any network access.
+
+Usage : python -m benchmarks.loopdevices [--scenario NAME] [--size SIZE] [--json]
+"""
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import typing
+
+import archcraftsman.arguments
+import archcraftsman.autopart
+import archcraftsman.base
+import archcraftsman.disk
+import archcraftsman.options
+import archcraftsman.partitioninginfo
+
+REQUIRED_TOOLS = [
+    "losetup",
+    "fdisk",
+    "lsblk",
+    "mkfs.ext4",
+    "mkfs.btrfs",
+    "mkfs.vfat",
+    "mkswap",
+    "btrfs",
+    "cryptsetup",
+]
+
+# A cryptsetup wrapper feeding the passphrase from a key file, the installer itself asks for it interactively.
+CRYPTSETUP_SHIM = """#!/bin/sh
+for argument in "$@"; do
+    case "$argument" in
+        luksFormat|open) exec {cryptsetup} --batch-mode --key-file "{key_file}" "$@" ;;
+    esac
+done
+exec {cryptsetup} "$@"
+"""
+
+
+class Scenario:
+    """
+    A loop device partitioning scenario.
+    """
+
+    def __init__(
+        self,
+        bios: bool,
+        format_type: archcraftsman.options.FSFormats,
+        swap_type: archcraftsman.options.SwapTypes = archcraftsman.options.SwapTypes.NONE,
+        want_home: bool = False,
+        encrypt_root: bool = False,
+        encrypt_home: bool = False,
+    ) -> None:
+        self.bios = bios
+        self.format_type = format_type
+        self.swap_type = swap_type
+        self.want_home = want_home
+        self.encrypt_root = encrypt_root
+        self.encrypt_home = encrypt_home
+
+
+SCENARIOS: dict[str, Scenario] = {
+    "gpt-ext4": Scenario(False, archcraftsman.options.FSFormats.EXT4),
+    "gpt-btrfs": Scenario(False, archcraftsman.options.FSFormats.BTRFS),
+    "dos-ext4": Scenario(True, archcraftsman.options.FSFormats.EXT4),
+    "dos-btrfs": Scenario(True, archcraftsman.options.FSFormats.BTRFS),
+    "gpt-ext4-home-swap": Scenario(
+        False,
+        archcraftsman.options.FSFormats.EXT4,
+        swap_type=archcraftsman.options.SwapTypes.PARTITION,
+        want_home=True,
+    ),
+    "gpt-ext4-encrypted": Scenario(
+        False,
+        archcraftsman.options.FSFormats.EXT4,
+        want_home=True,
+        encrypt_root=True,
+        encrypt_home=True,
+    ),
+    "gpt-btrfs-encrypted": Scenario(
+        False,
+        archcraftsman.options.FSFormats.BTRFS,
+        want_home=True,
+        encrypt_root=True,
+        encrypt_home=True,
+    ),
+    "dos-btrfs-encrypted-root": Scenario(
+        True, archcraftsman.options.FSFormats.BTRFS, encrypt_root=True
+    ),
+}
+
+
+class PhaseTimer:
+    """
+    A context manager timing a phase, and the time spent in the commands executed during it.
+    """
+
+    def __init__(self, phases: list[dict], name: str) -> None:
+        self.phase = {
+            "phase": name,
+            "seconds": 0.0,
+            "commands": 0,
+            "command_seconds": 0.0,
+        }
+        phases.append(self.phase)
+        self._start = 0.0
+
+    def _record(self, result: archcraftsman.base.ExecutionResult):
+        self.phase["commands"] += 1
+        self.phase["command_seconds"] += result.duration
+
+    def __enter__(self):
+        archcraftsman.base.add_execution_listener(self._record)
+        self._start = time.monotonic()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.phase["seconds"] = time.monotonic() - self._start
+        archcraftsman.base.remove_execution_listener(self._record)
+
+
+def missing_prerequisites() -> list[str]:
+    """
+    Get all the missing prerequisites to run the loop devices benchmark.
+    """
+    missing = [tool for tool in REQUIRED_TOOLS if shutil.which(tool) is None]
+    if os.geteuid() != 0:
+        missing.append("root privileges")
+    if not os.path.exists("/dev/loop-control"):
+        missing.append("/dev/loop-control")
+    return missing
+
+
+def run_scenario(name: str, scenario: Scenario, size: int, work_dir: str) -> dict:
+    """
+    Run a scenario against a fresh sparse image and tear everything down.
+    """
+    phases: list[dict] = []
+    image = os.path.join(work_dir, f"{name}.img")
+    target_root = os.path.join(work_dir, f"{name}-root")
+    block_prefix = f"acmbench{os.getpid()}"
+    loop_device = ""
+    info = archcraftsman.partitioninginfo.PartitioningInfo()
+    archcraftsman.arguments.init(
+        argparse.Namespace(install=True, target_root=target_root)
+    )
+    status = "ok"
+    try:
+        with PhaseTimer(phases, "attach"):
+            with open(image, "wb") as image_file:
+                image_file.truncate(size)
+            loop_device = archcraftsman.base.execute(
+                f"losetup -P -f --show {image}", force=True, capture_output=True
+            ).output.strip()
+        with PhaseTimer(phases, "probe"):
+            disk = archcraftsman.disk.Disk(loop_device)
+        with PhaseTimer(phases, "partitioning"):
+            (
+                auto_part_str,
+                info.partitions,
+                info.swapfile_size,
+            ) = archcraftsman.autopart.build_auto_partitioning(
+                disk,
+                scenario.format_type,
+                scenario.swap_type,
+                scenario.want_home,
+                root_block_name=f"{block_prefix}root"
+                if scenario.encrypt_root
+                else None,
+                home_block_name=f"{block_prefix}home"
+                if scenario.encrypt_home
+                else None,
+                bios=scenario.bios,
+            )
+            archcraftsman.autopart.apply_auto_partitioning(
+                loop_device, auto_part_str, info.partitions
+            )
+            info.main_disk = loop_device
+        part_mount_points = [
+            partition.part_mount_point
+            for partition in info.partitions
+            if partition.part_mount_point
+        ]
+        for partition in info.partitions:
+            with PhaseTimer(phases, f"format {partition.part_type}"):
+                partition.formatting(part_mount_points)
+        mountable_partitions = sorted(
+            (
+                partition
+                for partition in info.partitions
+                if partition.part_type != archcraftsman.options.PartTypes.SWAP
+            ),
+            key=lambda partition: len(partition.part_mount_point),
+        )
+        for partition in mountable_partitions:
+            with PhaseTimer(phases, f"mount {partition.part_type}"):
+                partition.mount(part_mount_points)
+        with PhaseTimer(phases, "umount"):
+            info.umount_partitions()
+    except subprocess.CalledProcessError as exception:
+        status = f"failed: {exception.cmd}"
+    finally:
+        with PhaseTimer(phases, "teardown"):
+            teardown(info, loop_device, image, target_root)
+    return {"scenario": name, "status": status, "phases": phases}
+
+
+def teardown(
+    info: archcraftsman.partitioninginfo.PartitioningInfo,
+    loop_device: str,
+    image: str,
+    target_root: str,
+):
+    """
+    Release everything a scenario may have left behind, even after a failure.
+    """
+    if os.path.isdir(target_root):
+        archcraftsman.base.execute(
+            f'umount -R "{target_root}" &>/dev/null', check=False, force=True
+        )
+    for partition in info.partitions:
+        if partition.part_type == archcraftsman.options.PartTypes.SWAP:
+            archcraftsman.base.execute(
+                f"swapoff {partition.path} &>/dev/null", check=False, force=True
+            )
+        if partition.encrypted:
+            archcraftsman.base.execute(
+                f"cryptsetup close {partition.block_name} &>/dev/null",
+                check=False,
+                force=True,
+            )
+    if loop_device:
+        archcraftsman.base.execute(f"losetup -d {loop_device}", check=False, force=True)
+    if os.path.exists(image):
+        os.remove(image)
+    shutil.rmtree(target_root, ignore_errors=True)
+
+
+def install_cryptsetup_shim(work_dir: str) -> str:
+    """
+    Install the cryptsetup wrapper in front of the PATH and return the passphrase file.
+    """
+    key_file = os.path.join(work_dir, "passphrase")
+    with open(key_file, "w", encoding="UTF-8") as passphrase_file:
+        passphrase_file.write("archcraftsman")
+    shim_dir = os.path.join(work_dir, "bin")
+    os.makedirs(shim_dir, exist_ok=True)
+    shim = os.path.join(shim_dir, "cryptsetup")
+    with open(shim, "w", encoding="UTF-8") as shim_file:
+        shim_file.write(
+            CRYPTSETUP_SHIM.format(
+                cryptsetup=shutil.which("cryptsetup"), key_file=key_file
+            )
+        )
+    os.chmod(shim, 0o755)
+    os.environ["PATH"] = f"{shim_dir}{os.pathsep}{os.environ.get('PATH', '')}"
+    return key_file
+
+
+def print_results(results: list[dict]):
+    """
+    Print the benchmark results in a human-readable form.
+    """
+    for result in results:
+        total = sum(phase["seconds"] for phase in result["phases"])
+        print(f"\n== {result['scenario']} ({result['status']}) {total:.2f}s")
+        for phase in result["phases"]:
+            print(
+                f"  {phase['phase']:<20} {phase['seconds']:>7.2f}s "
+                f"{phase['commands']:>4} commands {phase['command_seconds']:>7.2f}s"
+            )
+
+
+def main(arguments: typing.Optional[list[str]] = None) -> int:
+    """
+    The loop devices benchmark entry point.
+    """
+    parser = argparse.ArgumentParser(
+        description="ArchCraftsman loop devices benchmark."
+    )
+    parser.add_argument(
+        "--scenario",
+        action="append",
+        choices=list(SCENARIOS),
+        help="Scenario to run, all by default. Can be used multiple times.",
+    )
+    parser.add_argument(
+        "--size", type=int, default=8, help="Size of the sparse images, in GiB."
+    )
+    parser.add_argument("--json", action="store_true", help="Print results as JSON.")
+    args = parser.parse_args(arguments)
+
+    missing = missing_prerequisites()
+    if missing:
+        print(f"Missing prerequisites: {', '.join(missing)}", file=sys.stderr)
+        return 2
+
+    with tempfile.TemporaryDirectory(prefix="archcraftsman-loop-") as work_dir:
+        install_cryptsetup_shim(work_dir)
+        results = [
+            run_scenario(name, SCENARIOS[name], args.size * 1024**3, work_dir)
+            for name in args.scenario or SCENARIOS
+        ]
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print_results(results)
+    return 0 if all(result["status"] == "ok" for result in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
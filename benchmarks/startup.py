@@ -0,0 +1,276 @@
+# ArchCraftsman, The careful yet very fast Arch Linux Craftsman.
+# Copyright (C) 2023 Rawleenc
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+The startup benchmark module, measuring the time to first prompt of the installer and shell entry points.
+
+Usage : python -m benchmarks.startup [--runs N] [--offline] [--importtime-dir DIR] [--budgets FILE]
+"""
+import argparse
+import json
+import os
+import re
+import shutil
+import statistics
+import sys
+import tempfile
+import typing
+
+import benchmarks.harness
+
+DEFAULT_BUDGETS = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "budgets.json"
+)
+
+SCENARIOS: dict[str, list[str]] = {
+    "install": ["--install", "--test"],
+    "shell": ["--shell", "--test"],
+}
+
+STARTUP_CODE = """
+status = "exited"
+try:
+    status = _run_installer()
+finally:
+    _finish(status)
+"""
+
+IMPORT_TIME_PATTERN = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)$")
+
+
+class StartupResult:
+    """
+    The result of a single measured startup.
+    """
+
+    def __init__(
+        self,
+        seconds: float,
+        status: str,
+        commands: list[str],
+        requests: list[str],
+        import_times: list[tuple[str, int, int, int]],
+    ) -> None:
+        self.seconds = seconds
+        self.status = status
+        self.commands = commands
+        self.requests = requests
+        self.import_times = import_times
+
+    def archcraftsman_import_us(self) -> int:
+        """
+        The cumulative import time of all top-level archcraftsman modules, in microseconds.
+        """
+        return sum(
+            cumulative
+            for module, _self_us, cumulative, depth in self.import_times
+            if depth == 0 and module.startswith("archcraftsman")
+        )
+
+    def slowest_imports(self, count: int = 10) -> list[tuple[str, int]]:
+        """
+        The slowest imported modules by self time, in microseconds.
+        """
+        return [
+            (module, self_us)
+            for module, self_us, _cumulative, _depth in sorted(
+                self.import_times, key=lambda item: item[1], reverse=True
+            )[:count]
+        ]
+
+
+def parse_import_times(stderr: str) -> list[tuple[str, int, int, int]]:
+    """
+    Parse the -X importtime output into (module, self us, cumulative us, depth) tuples.
+    """
+    import_times = []
+    for line in stderr.splitlines():
+        match = IMPORT_TIME_PATTERN.match(line)
+        if match:
+            import_times.append(
+                (
+                    match.group(4),
+                    int(match.group(1)),
+                    int(match.group(2)),
+                    (len(match.group(3)) - 1) // 2,
+                )
+            )
+    return import_times
+
+
+def measure(
+    arguments: list[str],
+    sources_dir: str,
+    offline: bool,
+    importtime_file: typing.Optional[str] = None,
+) -> StartupResult:
+    """
+    Run an entry point in a fresh interpreter until its first prompt and measure it.
+    """
+    data, start, stderr = benchmarks.harness.run(
+        STARTUP_CODE,
+        arguments,
+        cwd=sources_dir,
+        offline=offline,
+        python_options=("-X", "importtime"),
+    )
+    if importtime_file:
+        with open(importtime_file, "w", encoding="UTF-8") as file:
+            file.write(stderr)
+    return StartupResult(
+        data["time"] - start,
+        data["status"],
+        data.get("commands", []),
+        data.get("requests", []),
+        parse_import_times(stderr),
+    )
+
+
+def run_scenario(
+    name: str,
+    runs: int,
+    offline: bool,
+    importtime_dir: typing.Optional[str],
+) -> dict:
+    """
+    Measure a cold startup, from freshly copied sources without any compiled bytecode, then several warm startups.
+    """
+    with tempfile.TemporaryDirectory() as sources_dir:
+        shutil.copytree(
+            os.path.join(benchmarks.harness.REPO_ROOT, "archcraftsman"),
+            os.path.join(sources_dir, "archcraftsman"),
+            ignore=shutil.ignore_patterns("__pycache__", "test"),
+        )
+        cold = measure(
+            SCENARIOS[name],
+            sources_dir,
+            offline,
+            os.path.join(importtime_dir, f"{name}-cold.log")
+            if importtime_dir
+            else None,
+        )
+        warm = [
+            measure(
+                SCENARIOS[name],
+                sources_dir,
+                offline,
+                os.path.join(importtime_dir, f"{name}-warm.log")
+                if importtime_dir and run == 0
+                else None,
+            )
+            for run in range(runs)
+        ]
+    reference = warm[0] if warm else cold
+    return {
+        "status": reference.status,
+        "cold_ms": round(cold.seconds * 1000, 1),
+        "warm_ms": round(statistics.median(r.seconds for r in warm) * 1000, 1)
+        if warm
+        else None,
+        "import_ms": round(reference.archcraftsman_import_us() / 1000, 1),
+        "subprocesses": len(reference.commands),
+        "http_requests": len(reference.requests),
+        "commands": reference.commands,
+        "slowest_imports": reference.slowest_imports(),
+    }
+
+
+def check_budgets(results: dict[str, dict], budgets: dict[str, dict]) -> list[str]:
+    """
+    Compare the results against the configured budgets and return all exceeded ones.
+    """
+    failures = []
+    for name, result in results.items():
+        if result["status"] != "prompt":
+            failures.append(f"{name}: no prompt reached ({result['status']})")
+        for metric, budget in budgets.get(name, {}).items():
+            value = result.get(metric)
+            if value is not None and value > budget:
+                failures.append(f"{name}: {metric} = {value} > {budget}")
+    return failures
+
+
+def print_results(results: dict[str, dict]):
+    """
+    Print the benchmark results in a human-readable form.
+    """
+    for name, result in results.items():
+        print(f"\n== {name} ({result['status']})")
+        for metric in (
+            "cold_ms",
+            "warm_ms",
+            "import_ms",
+            "subprocesses",
+            "http_requests",
+        ):
+            print(f"  {metric:<14} {result[metric]}")
+        print("  commands before first prompt :")
+        for command in result["commands"]:
+            print(f"    $ {command}")
+        print("  slowest imports (self us) :")
+        for module, self_us in result["slowest_imports"]:
+            print(f"    {self_us:>8} {module}")
+
+
+def main() -> int:
+    """
+    The startup benchmark entry point.
+    """
+    parser = argparse.ArgumentParser(description="ArchCraftsman startup benchmark.")
+    parser.add_argument("--runs", type=int, default=5, help="Number of warm runs.")
+    parser.add_argument(
+        "--scenario",
+        action="append",
+        choices=list(SCENARIOS),
+        help="Scenario to run, all by default. Can be used multiple times.",
+    )
+    parser.add_argument(
+        "--offline",
+        action="store_true",
+        help="Answer HTTP requests with a fixed geolocation instead of reaching the network.",
+    )
+    parser.add_argument(
+        "--importtime-dir", help="Directory where to save the raw -X importtime output."
+    )
+    parser.add_argument(
+        "--budgets", default=DEFAULT_BUDGETS, help="JSON file of per scenario budgets."
+    )
+    parser.add_argument("--json", action="store_true", help="Print results as JSON.")
+    args = parser.parse_args()
+
+    if args.importtime_dir:
+        os.makedirs(args.importtime_dir, exist_ok=True)
+    results = {
+        name: run_scenario(name, args.runs, args.offline, args.importtime_dir)
+        for name in args.scenario or SCENARIOS
+    }
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print_results(results)
+
+    budgets = {}
+    if args.budgets and os.path.exists(args.budgets):
+        with open(args.budgets, "r", encoding="UTF-8") as budgets_file:
+            budgets = json.load(budgets_file)
+    failures = check_budgets(results, budgets)
+    for failure in failures:
+        print(f"BUDGET EXCEEDED: {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
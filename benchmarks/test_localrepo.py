@@ -0,0 +1,79 @@
+# ArchCraftsman, The careful yet very fast Arch Linux Craftsman.
+# Copyright (C) 2023 Rawleenc
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Tests for the local pacman repository of the benchmarks.
+"""
+import http.client
+import os
+import tempfile
+import unittest
+import urllib.error
+import urllib.request
+
+import archcraftsman.packages
+import benchmarks.localrepo
+
+
+class TestLocalRepo(unittest.TestCase):
+    """
+    Tests for the local pacman repository of the benchmarks.
+    """
+
+    def test_read_served_sync_database(self):
+        """
+        Test the read_sync_databases function against a database served by a local mirror.
+        """
+        packages = benchmarks.localrepo.synthetic_packages(3, 1024)
+        with tempfile.TemporaryDirectory() as root, tempfile.TemporaryDirectory() as sync_db_dir:
+            benchmarks.localrepo.build_repository(root, packages)
+            with benchmarks.localrepo.MirrorServer(root) as mirror:
+                with urllib.request.urlopen(
+                    f"{mirror.url}/core/os/x86_64/core.db"
+                ) as response, open(
+                    os.path.join(sync_db_dir, "core.db"), "wb"
+                ) as database:
+                    database.write(response.read())
+                names, groups, _, _ = archcraftsman.packages.read_sync_databases(
+                    sync_db_dir
+                )
+        self.assertEqual(names, {"synthetic000", "synthetic001", "synthetic002"})
+        self.assertEqual(groups, {"synthetic-group"})
+
+    def test_mirror_failure_injection(self):
+        """
+        Test the local mirror failure injection.
+        """
+        packages = benchmarks.localrepo.synthetic_packages(1, 64 * 1024)
+        with tempfile.TemporaryDirectory() as root:
+            benchmarks.localrepo.build_repository(root, packages)
+            url = f"/core/os/x86_64/{packages[0].file_name}"
+            profile = benchmarks.localrepo.MirrorProfile(fail_paths=(".db",))
+            with benchmarks.localrepo.MirrorServer(root, profile) as mirror:
+                with self.assertRaises(urllib.error.HTTPError):
+                    urllib.request.urlopen(  # pylint: disable=consider-using-with
+                        f"{mirror.url}/core/os/x86_64/core.db"
+                    )
+                with urllib.request.urlopen(mirror.url + url) as response:
+                    self.assertEqual(
+                        len(response.read()), int(response.headers["Content-Length"])
+                    )
+            profile = benchmarks.localrepo.MirrorProfile(truncate_rate=1.0)
+            with benchmarks.localrepo.MirrorServer(root, profile) as mirror:
+                with self.assertRaises(http.client.IncompleteRead):
+                    with urllib.request.urlopen(mirror.url + url) as response:
+                        response.read()
+        self.assertEqual(mirror.stats.to_dict()["truncations"], 1)
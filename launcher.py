@@ -17,22 +17,43 @@
 """
 The ArchCraftsman entry point. A launcher to download all ArchCraftsman's modules and run it.
 """
+import argparse
 import concurrent.futures
 import glob
+import hashlib
+import importlib.util
 import json
 import multiprocessing
 import os
 import re
 import readline
+import shutil
 import subprocess
 import sys
+import tarfile
+import tempfile
+import typing
 import urllib.error
 import urllib.request
+import zipfile
 
 OWNER = "Rawleenc"
 REPO = "ArchCraftsman"
 BRANCH = "main"
+ARCHIVE_URL = "https://codeload.github.com/{owner}/{repo}/tar.gz/{ref}"
+CONTENTS_URL = "https://api.github.com/repos/{owner}/{repo}/contents/{path}?ref={ref}"
+COMMIT_URL = "https://api.github.com/repos/{owner}/{repo}/commits/{ref}"
+TREE_URL = "https://api.github.com/repos/{owner}/{repo}/git/trees/{commit}?recursive=1"
+RAW_URL = "https://raw.githubusercontent.com/{owner}/{repo}/{commit}/{path}"
+DIRECTORIES = ("archcraftsman", "configs")
+DEFAULT_CACHE = os.path.join(
+    os.environ.get("XDG_CACHE_HOME", os.path.expanduser("~/.cache")), "archcraftsman"
+)
+TREE_MARKER = ".archcraftsman-tree"
 CMD = "python -m archcraftsman.installer --install"
+PYZ_FILE = "archcraftsman.pyz"
+PYZ_CMD = f"python {PYZ_FILE} --install"
+PYZ_MAGIC_FILE = "archcraftsman/bytecode.magic"
 STEP = "\033[94m"
 SUBSTEP = "\033[96m"
 PROMPT = "\033[1m"
@@ -113,25 +134,378 @@ def download(url: str, destination: str, replace: bool = False) -> bool:
     return True
 
 
-def get_all_files(directory: str) -> list:
+def get_all_files(directory: str, ref: str = BRANCH) -> list:
     """
     A method to download all files of a given directory.
     """
     with urllib.request.urlopen(
-        f"https://api.github.com/repos/{OWNER}/{REPO}/contents/{directory}?ref={BRANCH}"
+        CONTENTS_URL.format(owner=OWNER, repo=REPO, path=directory, ref=ref)
     ) as response:
         components = json.loads(response.read())
     files = []
     if components:
         for component in components:
             if component["type"] == "dir":
-                for file in get_all_files(component["path"]):
+                for file in get_all_files(component["path"], ref):
                     files.append(file)
             elif component["type"] == "file":
                 files.append(component)
     return files
 
 
+def download_files(ref: str = BRANCH):
+    """
+    A method to download all modules file by file, walking the GitHub contents API.
+    """
+    files = []
+    for directory in DIRECTORIES:
+        files.extend(get_all_files(directory, ref))
+
+    cpus = multiprocessing.cpu_count()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=cpus) as exe:
+        futures = []
+        for module_file in files:
+            futures.append(
+                exe.submit(
+                    download, module_file["download_url"], module_file["path"], True
+                )
+            )
+        for future in concurrent.futures.as_completed(futures):
+            future.result()
+
+
+class HashingReader:
+    """
+    A class wrapping a stream to hash everything read from it.
+    """
+
+    def __init__(self, stream: typing.BinaryIO):
+        self.stream = stream
+        self.digest = hashlib.sha256()
+        self.size = 0
+
+    def read(self, size: int = -1) -> bytes:
+        """
+        Read from the wrapped stream, hashing the data.
+        """
+        data = self.stream.read(size)
+        self.digest.update(data)
+        self.size += len(data)
+        return data
+
+    def drain(self):
+        """
+        Read the stream to its end, to hash the trailing data the consumer did not need.
+        """
+        while self.read(65536):
+            pass
+
+
+def archive_path(name: str) -> typing.Optional[str]:
+    """
+    A method to get the local path of an archive member, None if it is not a module file.
+    """
+    parts = name.split("/")[1:]
+    if (
+        len(parts) < 2
+        or parts[0] not in DIRECTORIES
+        or any(part in ("", ".", "..") for part in parts)
+    ):
+        return None
+    return os.path.join(*parts)
+
+
+def extract_archive(stream: typing.BinaryIO, staging: str) -> int:
+    """
+    A method to stream extract the module files of a gzipped tarball into a staging directory.
+    """
+    count = 0
+    with tarfile.open(fileobj=stream, mode="r|gz") as archive:
+        for member in archive:
+            path = archive_path(member.name)
+            if path is None or not member.isfile():
+                continue
+            target = os.path.join(staging, path)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            source = archive.extractfile(member)
+            if source is None:
+                continue
+            with source, open(target, "wb") as file:
+                shutil.copyfileobj(source, file)
+            count += 1
+    return count
+
+
+def install_staging(staging: str, destination: str):
+    """
+    A method to replace the module directories of the destination by the staged ones.
+    """
+    for directory in DIRECTORIES:
+        target = os.path.join(destination, directory)
+        if os.path.exists(target):
+            shutil.rmtree(target)
+        if os.path.exists(os.path.join(staging, directory)):
+            os.replace(os.path.join(staging, directory), target)
+
+
+def check_pyz(path: str) -> bool:
+    """
+    Check that a single file build holds bytecode for the running Python version.
+    """
+    try:
+        with zipfile.ZipFile(path) as archive:
+            return archive.read(PYZ_MAGIC_FILE) == importlib.util.MAGIC_NUMBER
+    except (OSError, KeyError, zipfile.BadZipFile):
+        return False
+
+
+def download_archive(
+    ref: str = BRANCH, sha256: str = "", destination: str = "."
+) -> bool:
+    """
+    A method to download all modules as a single tarball of the given branch or commit.
+    The tarball is extracted while downloaded, the modules are put in place only if it matches the expected hash.
+    """
+    url = ARCHIVE_URL.format(owner=OWNER, repo=REPO, ref=ref)
+    print_sub_step(f"Downloading '{url}'...")
+    staging = tempfile.mkdtemp(prefix=".archcraftsman-", dir=destination)
+    try:
+        with urllib.request.urlopen(url) as response:
+            reader = HashingReader(response)
+            count = extract_archive(typing.cast(typing.BinaryIO, reader), staging)
+            reader.drain()
+        digest = reader.digest.hexdigest()
+        if sha256 and digest != sha256.lower():
+            raise ValueError(
+                f"Archive hash mismatch, expected {sha256} but got {digest}."
+            )
+        if not count:
+            raise ValueError("No module found in the archive.")
+        install_staging(staging, destination)
+        print_sub_step(f"{count} files extracted, sha256 {digest}.")
+        return True
+    except (urllib.error.URLError, OSError, tarfile.TarError, ValueError) as exception:
+        print_sub_step(f"Archive download failed : {exception}")
+        return False
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+
+
+def blob_sha(data: bytes) -> str:
+    """
+    A method to get the git blob SHA of a file content.
+    """
+    return hashlib.sha1(b"blob %d\0" % len(data) + data).hexdigest()
+
+
+class LauncherCache:
+    """
+    A class representing the launcher cache, git blobs stored by SHA and tree manifests stored by commit.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def _path(self, *parts: str) -> str:
+        return os.path.join(self.path, *parts)
+
+    def _write(self, path: str, data: bytes):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, "wb") as file:
+            file.write(data)
+        os.replace(temporary, path)
+
+    def _read(self, path: str) -> typing.Optional[bytes]:
+        try:
+            with open(path, "rb") as file:
+                return file.read()
+        except OSError:
+            return None
+
+    def object_path(self, sha: str) -> str:
+        """
+        The path of a cached blob.
+        """
+        return self._path("objects", sha[:2], sha[2:])
+
+    def has(self, sha: str) -> bool:
+        """
+        Check if a blob is cached.
+        """
+        return os.path.exists(self.object_path(sha))
+
+    def store(self, data: bytes) -> str:
+        """
+        Cache a blob and return its SHA.
+        """
+        sha = blob_sha(data)
+        if not self.has(sha):
+            self._write(self.object_path(sha), data)
+        return sha
+
+    def resolved(self, ref: str) -> typing.Optional[str]:
+        """
+        The commit a ref was last resolved to.
+        """
+        data = self._read(self._path("refs", ref.replace("/", "%2F")))
+        return data.decode().strip() if data else None
+
+    def save_resolved(self, ref: str, commit: str):
+        """
+        Remember the commit a ref has been resolved to.
+        """
+        self._write(self._path("refs", ref.replace("/", "%2F")), commit.encode())
+
+    def manifest(self, commit: str) -> typing.Optional[dict]:
+        """
+        The cached tree manifest of a commit.
+        """
+        data = self._read(self._path("commits", f"{commit}.json"))
+        return json.loads(data) if data else None
+
+    def save_manifest(self, manifest: dict):
+        """
+        Cache the tree manifest of a commit.
+        """
+        self._write(
+            self._path("commits", f"{manifest['commit']}.json"),
+            json.dumps(manifest).encode(),
+        )
+
+
+def resolve_ref(ref: str, cache: LauncherCache) -> typing.Optional[str]:
+    """
+    A method to resolve a ref to a commit SHA, without network I/O for a full commit SHA.
+    The last resolved commit is used when offline.
+    """
+    if re.fullmatch(r"[0-9a-f]{40}", ref):
+        return ref
+    request = urllib.request.Request(
+        COMMIT_URL.format(owner=OWNER, repo=REPO, ref=ref),
+        headers={"Accept": "application/vnd.github.sha"},
+    )
+    try:
+        with urllib.request.urlopen(request) as response:
+            commit = response.read().decode().strip()
+    except urllib.error.URLError:
+        return cache.resolved(ref)
+    cache.save_resolved(ref, commit)
+    return commit
+
+
+def fetch_manifest(commit: str, cache: LauncherCache) -> dict:
+    """
+    A method to get the tree manifest of a commit, the blob SHA of each module file.
+    """
+    manifest = cache.manifest(commit)
+    if manifest:
+        return manifest
+    with urllib.request.urlopen(
+        TREE_URL.format(owner=OWNER, repo=REPO, commit=commit)
+    ) as response:
+        tree = json.loads(response.read())
+    if tree.get("truncated"):
+        raise ValueError("The repository tree listing is truncated.")
+    manifest = {
+        "commit": commit,
+        "tree": tree["sha"],
+        "files": {
+            entry["path"]: entry["sha"]
+            for entry in tree["tree"]
+            if entry["type"] == "blob" and entry["path"].split("/", 1)[0] in DIRECTORIES
+        },
+    }
+    cache.save_manifest(manifest)
+    return manifest
+
+
+def fetch_blob(commit: str, path: str, sha: str, cache: LauncherCache):
+    """
+    A method to download a single file of a commit into the cache.
+    """
+    with urllib.request.urlopen(
+        RAW_URL.format(owner=OWNER, repo=REPO, commit=commit, path=path)
+    ) as response:
+        data = response.read()
+    if blob_sha(data) != sha:
+        raise ValueError(f"Unexpected content for '{path}'.")
+    cache.store(data)
+
+
+def ingest(destination: str, manifest: dict, cache: LauncherCache):
+    """
+    A method to cache the files of the destination matching the manifest.
+    """
+    for path, sha in manifest["files"].items():
+        if cache.has(sha):
+            continue
+        try:
+            with open(os.path.join(destination, path), "rb") as file:
+                data = file.read()
+        except OSError:
+            continue
+        if blob_sha(data) == sha:
+            cache.store(data)
+
+
+def sync_cache(ref: str, cache_path: str, destination: str = ".") -> bool:
+    """
+    A method to put the modules of a ref in place from the launcher cache, downloading only the missing blobs.
+    A cold cache is filled from the single archive.
+    """
+    cache = LauncherCache(cache_path)
+    try:
+        commit = resolve_ref(ref, cache)
+        if not commit:
+            return False
+        manifest = fetch_manifest(commit, cache)
+        marker = os.path.join(destination, TREE_MARKER)
+        if os.path.exists(marker) and all(
+            os.path.exists(os.path.join(destination, path))
+            for path in manifest["files"]
+        ):
+            with open(marker, encoding="UTF-8") as file:
+                if file.read().strip() == manifest["tree"]:
+                    print_sub_step(f"Modules of {commit[:12]} already in place.")
+                    return True
+
+        missing = [
+            (path, sha) for path, sha in manifest["files"].items() if not cache.has(sha)
+        ]
+        if missing and len(missing) == len(manifest["files"]):
+            if download_archive(commit, "", destination):
+                ingest(destination, manifest, cache)
+                missing = [(path, sha) for path, sha in missing if not cache.has(sha)]
+        if missing:
+            print_sub_step(f"Downloading {len(missing)} changed files...")
+            cpus = multiprocessing.cpu_count()
+            with concurrent.futures.ThreadPoolExecutor(max_workers=cpus) as exe:
+                futures = [
+                    exe.submit(fetch_blob, commit, path, sha, cache)
+                    for path, sha in missing
+                ]
+                for future in concurrent.futures.as_completed(futures):
+                    future.result()
+
+        staging = tempfile.mkdtemp(prefix=".archcraftsman-", dir=destination)
+        try:
+            for path, sha in manifest["files"].items():
+                target = os.path.join(staging, path)
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                shutil.copyfile(cache.object_path(sha), target)
+            install_staging(staging, destination)
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+        with open(marker, "w", encoding="UTF-8") as file:
+            file.write(manifest["tree"])
+        print_sub_step(f"Modules of {commit[:12]} put in place from the cache.")
+        return True
+    except (urllib.error.URLError, OSError, ValueError, KeyError) as exception:
+        print_sub_step(f"Cache update failed : {exception}")
+        return False
+
+
 def set_config_file(cmd: str, config_file: str) -> tuple[str, str]:
     """
     A recursive method to set the config file.
@@ -147,29 +521,71 @@ def set_config_file(cmd: str, config_file: str) -> tuple[str, str]:
     return cmd, config_file
 
 
-def main(cmd: str):
+def main(cmd: str, argv: typing.Optional[list[str]] = None):
     """
     Main launcher function.
     """
+    parser = argparse.ArgumentParser(description="The ArchCraftsman launcher.")
+    parser.add_argument(
+        "--ref",
+        default=BRANCH,
+        help="The branch, tag or commit to download.",
+    )
+    parser.add_argument(
+        "--sha256",
+        default="",
+        help="The expected SHA-256 of the downloaded archive.",
+    )
+    parser.add_argument(
+        "--cache",
+        default=DEFAULT_CACHE,
+        metavar="DIR",
+        help="The launcher cache directory, ideally on a writable partition of the install media.",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Do not use the launcher cache.",
+    )
+    parser.add_argument(
+        "--pyz",
+        default="",
+        metavar="URL",
+        help="Download and run this single file build of the installer instead of its modules.",
+    )
+    parser.add_argument(
+        "--per-file",
+        action="store_true",
+        help="Download the modules file by file instead of as a single archive.",
+    )
+    args = parser.parse_args(argv)
+
     print_step("Downloading all ArchCraftsman's modules...", clear=False)
     readline.set_completer_delims(" \t\n;")
     readline.parse_and_bind("tab: complete")
     readline.set_completer(glob_completer)
 
-    files = []
-    for file in get_all_files("archcraftsman"):
-        files.append(file)
-
-    for file in get_all_files("configs"):
-        files.append(file)
-
-    cpus = multiprocessing.cpu_count()
-    with concurrent.futures.ThreadPoolExecutor(max_workers=cpus) as exe:
-        futures = []
-        for module_file in files:
-            exe.submit(download, module_file["download_url"], module_file["path"], True)
-        for future in concurrent.futures.as_completed(futures):
-            future.result()
+    change_user_agent()
+    if args.pyz:
+        if not download(args.pyz, PYZ_FILE, True):
+            print_sub_step(f"Unable to download '{args.pyz}', aborting.")
+            sys.exit(1)
+        if not check_pyz(PYZ_FILE):
+            print_sub_step(
+                f"'{args.pyz}' wasn't built for this Python version, falling back to the modules download..."
+            )
+            args.pyz = ""
+    if args.pyz:
+        cmd = PYZ_CMD
+    elif args.per_file:
+        download_files(args.ref)
+    elif args.sha256 or args.no_cache or not sync_cache(args.ref, args.cache):
+        if not download_archive(args.ref, args.sha256):
+            if args.sha256:
+                print_sub_step("The archive could not be verified, aborting.")
+                sys.exit(1)
+            print_sub_step("Falling back to the file by file download...")
+            download_files(args.ref)
 
     config_file = input_str(
         "Enter a config file path or url if you want to use one (leave empty to run interactive mode) : \n> "